@@ -5,13 +5,15 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import ClassVar
 
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
 
-@dataclass
-class PaginationRequest:
+
+@dataclass(slots=True)
+class PaginationRequest(ProtoMessage):
     """Request parameters for paginated list endpoints."""
 
     page: int = 1
@@ -19,19 +21,17 @@ class PaginationRequest:
     sort_by: str = ""
     sort_order: str = ""
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        return json.dumps(self.__dict__).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "PaginationRequest":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.api.v1.PaginationRequest"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "page", FieldKind.INT32),
+        ProtoField(2, "page_size", FieldKind.INT32),
+        ProtoField(3, "sort_by", FieldKind.STRING),
+        ProtoField(4, "sort_order", FieldKind.STRING),
+    )
 
 
-@dataclass
-class PaginationResponse:
+@dataclass(slots=True)
+class PaginationResponse(ProtoMessage):
     """Pagination metadata returned alongside list results."""
 
     total: int = 0
@@ -41,19 +41,19 @@ class PaginationResponse:
     has_next: bool = False
     has_prev: bool = False
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        return json.dumps(self.__dict__).encode("utf-8")
+    _proto_name: ClassVar[str] = "aumos.api.v1.PaginationResponse"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "total", FieldKind.INT32),
+        ProtoField(2, "page", FieldKind.INT32),
+        ProtoField(3, "page_size", FieldKind.INT32),
+        ProtoField(4, "pages", FieldKind.INT32),
+        ProtoField(5, "has_next", FieldKind.BOOL),
+        ProtoField(6, "has_prev", FieldKind.BOOL),
+    )
 
-    @classmethod
-    def FromString(cls, data: bytes) -> "PaginationResponse":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        return cls(**parsed)
 
-
-@dataclass
-class ErrorResponse:
+@dataclass(slots=True)
+class ErrorResponse(ProtoMessage):
     """Structured error response for all API endpoints."""
 
     code: str = ""
@@ -62,18 +62,11 @@ class ErrorResponse:
     request_id: str = ""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "ErrorResponse":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.api.v1.ErrorResponse"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "code", FieldKind.STRING),
+        ProtoField(2, "message", FieldKind.STRING),
+        ProtoField(3, "details", FieldKind.MAP, value_kind=FieldKind.STRING),
+        ProtoField(4, "request_id", FieldKind.STRING),
+        ProtoField(5, "timestamp", FieldKind.TIMESTAMP),
+    )
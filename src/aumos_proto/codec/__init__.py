@@ -0,0 +1,25 @@
+"""Proto3 binary wire codec for the aumos-proto stub classes.
+
+Every stub message class derives from :class:`ProtoMessage` and declares its
+field numbers and types with :class:`ProtoField`, mirroring the definitions in
+``proto/aumos/**/*.proto``. ``SerializeToString()`` / ``FromString()`` produce
+and consume standard proto3 wire bytes, including the
+``google.protobuf.Timestamp`` and ``google.protobuf.Struct`` well-known types.
+``FromString(data, lazy=True)`` returns a :class:`LazyMessage` view that
+decodes fields only when they are read, and :class:`Timestamp` is a compact
+seconds + nanos alternative to ``datetime`` for Timestamp fields.
+"""
+from aumos_proto.codec.fields import FieldKind, ProtoField
+from aumos_proto.codec.lazy import LazyMessage
+from aumos_proto.codec.message import ProtoMessage
+from aumos_proto.codec.wellknown import Timestamp
+from aumos_proto.codec.wire import DecodeError
+
+__all__ = [
+    "DecodeError",
+    "FieldKind",
+    "LazyMessage",
+    "ProtoField",
+    "ProtoMessage",
+    "Timestamp",
+]
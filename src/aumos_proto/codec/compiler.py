@@ -0,0 +1,419 @@
+"""Compile specialized encoder and decoder functions from a message schema.
+
+Rather than walking ``_proto_fields`` and dispatching on the field kind for
+every value of every message, each stub class gets a pair of functions built
+once, on first use, from its schema. The generated source is a straight-line
+sequence of field writes with the tag bytes inlined as constants, and a
+decoder that dispatches on the raw tag value with one branch per field.
+This mirrors how ``dataclasses`` generates ``__init__``.
+
+The generated functions are installed on the class as ``_proto_encode`` and
+``_proto_decode`` by :class:`aumos_proto.codec.message.ProtoMessage`.
+"""
+from __future__ import annotations
+
+import dataclasses
+import struct
+from collections.abc import Callable
+from typing import Any
+
+from aumos_proto.codec.fields import PACKABLE_KINDS, FieldKind, ProtoField
+from aumos_proto.codec.wellknown import (
+    decode_struct,
+    decode_timestamp,
+    decode_timestamp_compact,
+    encode_struct,
+    encode_timestamp,
+)
+from aumos_proto.codec.wire import (
+    WIRETYPE_FIXED32,
+    WIRETYPE_FIXED64,
+    WIRETYPE_LENGTH_DELIMITED,
+    WIRETYPE_VARINT,
+    DecodeError,
+    decode_varint,
+    encode_varint,
+    make_tag,
+    skip_field,
+    to_signed32,
+    zigzag_decode,
+    zigzag_encode,
+)
+
+Encoder = Callable[[Any, bytearray], None]
+Decoder = Callable[[Any, int, int], Any]
+FieldReader = Callable[[Any, list[tuple[int, int]], int], Any]
+
+_VARINT_KINDS = frozenset({
+    FieldKind.BOOL,
+    FieldKind.INT32,
+    FieldKind.INT64,
+    FieldKind.UINT32,
+    FieldKind.UINT64,
+    FieldKind.SINT32,
+    FieldKind.SINT64,
+    FieldKind.ENUM,
+})
+
+# Helpers referenced by name from the generated source.
+_RUNTIME: dict[str, Any] = {
+    "_varint": encode_varint,
+    "_read_varint": decode_varint,
+    "_skip": skip_field,
+    "_to_signed32": to_signed32,
+    "_zigzag_encode": zigzag_encode,
+    "_zigzag_decode": zigzag_decode,
+    "_pack_float": struct.Struct("<f").pack,
+    "_pack_double": struct.Struct("<d").pack,
+    "_unpack_float": struct.Struct("<f").unpack_from,
+    "_unpack_double": struct.Struct("<d").unpack_from,
+    "_encode_struct": encode_struct,
+    "_decode_struct": decode_struct,
+    "_encode_timestamp": encode_timestamp,
+    "_decode_timestamp": decode_timestamp,
+    "DecodeError": DecodeError,
+    "StructError": struct.error,
+}
+
+
+def wire_type_of(kind: FieldKind) -> int:
+    """Return the wire type used for a single (unpacked) value of ``kind``."""
+    if kind is FieldKind.FLOAT:
+        return WIRETYPE_FIXED32
+    if kind is FieldKind.DOUBLE:
+        return WIRETYPE_FIXED64
+    if kind in _VARINT_KINDS:
+        return WIRETYPE_VARINT
+    return WIRETYPE_LENGTH_DELIMITED
+
+
+def _tag_bytes(number: int, wire_type: int) -> bytes:
+    out = bytearray()
+    encode_varint(make_tag(number, wire_type), out)
+    return bytes(out)
+
+
+# Map entries are encoded as a nested message with key = 1 and value = 2.
+_MAP_VALUE_NUMBER = 2
+
+
+# ---------------------------------------------------------------------------
+# Encoder generation
+# ---------------------------------------------------------------------------
+
+
+def compile_encoder(cls: type[Any]) -> Encoder:
+    """Build ``encode(message, out)`` for ``cls`` that appends its wire bytes to ``out``."""
+    lines = ["def encode(msg, out):"]
+    for spec in cls._proto_fields:
+        lines.extend(_encode_lines(spec))
+    if len(lines) == 1:
+        lines.append("    pass")
+    return _build(cls, "encode", lines, dict(_RUNTIME))
+
+
+def _write_len(var: str, indent: str, buf: str) -> list[str]:
+    return [
+        f"{indent}_n = len({var})",
+        f"{indent}if _n < 128:",
+        f"{indent}    {buf}.append(_n)",
+        f"{indent}else:",
+        f"{indent}    _varint(_n, {buf})",
+        f"{indent}{buf} += {var}",
+    ]
+
+
+def _write_value(kind: FieldKind, var: str, indent: str, tag: bytes, buf: str) -> list[str]:
+    """Lines appending ``tag`` followed by the single value held in ``var`` to ``buf``."""
+    lines = [f"{indent}{buf} += {tag!r}"]
+    if kind is FieldKind.STRING:
+        lines.append(f"{indent}_b = {var}.encode('utf-8')")
+        lines.extend(_write_len("_b", indent, buf))
+    elif kind is FieldKind.BYTES:
+        lines.extend(_write_len(var, indent, buf))
+    elif kind in (FieldKind.MESSAGE, FieldKind.TIMESTAMP, FieldKind.STRUCT):
+        lines.append(f"{indent}_body = bytearray()")
+        if kind is FieldKind.MESSAGE:
+            lines.append(f"{indent}{var}._proto_encode(_body)")
+        elif kind is FieldKind.TIMESTAMP:
+            lines.append(f"{indent}_encode_timestamp({var}, _body)")
+        else:
+            lines.append(f"{indent}_encode_struct({var}, _body)")
+        lines.extend(_write_len("_body", indent, buf))
+    else:
+        lines.extend(_write_scalar(kind, var, indent, buf))
+    return lines
+
+
+def _write_scalar(kind: FieldKind, var: str, indent: str, buf: str) -> list[str]:
+    """Lines appending an untagged numeric value to ``buf``."""
+    if kind is FieldKind.FLOAT:
+        return [f"{indent}{buf} += _pack_float({var})"]
+    if kind is FieldKind.DOUBLE:
+        return [f"{indent}{buf} += _pack_double({var})"]
+    if kind is FieldKind.BOOL:
+        return [f"{indent}{buf}.append(1 if {var} else 0)"]
+    if kind in (FieldKind.SINT32, FieldKind.SINT64):
+        return [f"{indent}_varint(_zigzag_encode({var}), {buf})"]
+    return [
+        f"{indent}if 0 <= {var} < 128:",
+        f"{indent}    {buf}.append({var})",
+        f"{indent}else:",
+        f"{indent}    _varint({var}, {buf})",
+    ]
+
+
+def _encode_lines(spec: ProtoField) -> list[str]:
+    var = f"v{spec.number}"
+    lines = [f"    {var} = msg.{spec.name}"]
+    if spec.kind is FieldKind.MAP:
+        value_kind = spec.value_kind or FieldKind.STRING
+        lines.append(f"    for _k, _v in {var}.items():")
+        lines.append("        _entry = bytearray()")
+        lines.extend(_write_value(FieldKind.STRING, "_k", "        ", _tag_bytes(1, WIRETYPE_LENGTH_DELIMITED), "_entry"))
+        lines.extend(_write_value(value_kind, "_v", "        ", _tag_bytes(2, wire_type_of(value_kind)), "_entry"))
+        lines.append(f"        out += {_tag_bytes(spec.number, WIRETYPE_LENGTH_DELIMITED)!r}")
+        lines.extend(_write_len("_entry", "        ", "out"))
+    elif spec.repeated and spec.kind in PACKABLE_KINDS:
+        lines.append(f"    if {var}:")
+        lines.append("        _packed = bytearray()")
+        lines.append(f"        for _item in {var}:")
+        lines.extend(_write_scalar(spec.kind, "_item", "            ", "_packed"))
+        lines.append(f"        out += {_tag_bytes(spec.number, WIRETYPE_LENGTH_DELIMITED)!r}")
+        lines.extend(_write_len("_packed", "        ", "out"))
+    elif spec.repeated:
+        lines.append(f"    for _item in {var}:")
+        lines.extend(_write_value(spec.kind, "_item", "        ", _tag_bytes(spec.number, wire_type_of(spec.kind)), "out"))
+    else:
+        if spec.kind in (FieldKind.MESSAGE, FieldKind.TIMESTAMP) or spec.oneof is not None:
+            lines.append(f"    if {var} is not None:")
+        else:
+            lines.append(f"    if {var}:")
+        lines.extend(_write_value(spec.kind, var, "        ", _tag_bytes(spec.number, wire_type_of(spec.kind)), "out"))
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# Decoder generation
+# ---------------------------------------------------------------------------
+
+
+def compile_decoder(cls: type[Any], compact_timestamps: bool = False) -> Decoder:
+    """Build ``decode(buffer, pos, end)`` returning a new ``cls`` instance from ``buffer[pos:end]``.
+
+    With ``compact_timestamps`` the decoder (and the sub-message decoders it
+    calls) returns :class:`Timestamp` values instead of ``datetime`` objects.
+    """
+    namespace = _decoder_namespace(compact_timestamps)
+    body, construct = _decode_body(cls, namespace, compact_timestamps)
+    lines = ["def decode(buf, pos, end):", *_indent(body), f"    return {construct}"]
+    return _build(cls, "decode", lines, namespace)
+
+
+def _decoder_namespace(compact_timestamps: bool) -> dict[str, Any]:
+    namespace = dict(_RUNTIME)
+    if compact_timestamps:
+        namespace["_decode_timestamp"] = decode_timestamp_compact
+    return namespace
+
+
+def _decode_body(cls: type[Any], namespace: dict[str, Any], compact: bool) -> tuple[list[str], str]:
+    """Return the unindented lines decoding ``buf[pos:end]`` and the constructor expression."""
+    namespace["_cls"] = cls
+    specs = {spec.name: spec for spec in cls._proto_fields}
+    init_names = [f.name for f in dataclasses.fields(cls) if f.init]
+    if set(init_names) != set(specs):
+        raise TypeError(f"{cls.__name__} dataclass fields do not match its _proto_fields declaration")
+
+    lines = [f"f_{spec.name} = {_zero_literal(spec, namespace)}" for spec in cls._proto_fields]
+    lines.append("try:")
+    lines.append("    while pos < end:")
+    lines.extend(_indent(_read_varint_lines("_tag"), 2))
+    first = True
+    for spec in cls._proto_fields:
+        for tag, body in _decode_branches(spec, cls._proto_fields, namespace, compact):
+            keyword = "if" if first else "elif"
+            first = False
+            lines.append(f"        {keyword} _tag == {tag}:")
+            lines.extend(_indent(body, 3))
+    if first:
+        lines.append("        if False:")
+        lines.append("            pass")
+    lines.append("        else:")
+    lines.append("            pos = _skip(buf, pos, _tag & 7)")
+    lines.append("except (IndexError, StructError) as error:")
+    lines.append("    raise DecodeError('Truncated message') from error")
+    lines.append("except UnicodeDecodeError as error:")
+    lines.append("    raise DecodeError('String field is not valid UTF-8') from error")
+    lines.append("if pos > end:")
+    lines.append("    raise DecodeError('Message body overran its declared length')")
+    return lines, f"_cls({', '.join('f_' + name for name in init_names)})"
+
+
+def compile_field_reader(cls: type[Any], spec: ProtoField, compact_timestamps: bool = False) -> FieldReader:
+    """Build ``read(buffer, occurrences, end)`` decoding only ``spec`` for lazy views.
+
+    ``occurrences`` lists ``(tag, value_pos)`` pairs for every wire occurrence
+    of the field's number, in wire order, as recorded by a tag scan of the
+    message. The generated function reuses the decoder's branch for that field,
+    so repeated values accumulate, map entries merge and the last singular
+    value wins exactly as in a full decode.
+    """
+    namespace = _decoder_namespace(compact_timestamps)
+    name = f"read_{spec.name}"
+    lines = [
+        f"def {name}(buf, occurrences, end):",
+        f"    f_{spec.name} = {_zero_literal(spec, namespace)}",
+        "    try:",
+        "        for _tag, pos in occurrences:",
+    ]
+    first = True
+    for tag, body in _decode_branches(spec, cls._proto_fields, namespace, compact_timestamps):
+        lines.append(f"            {'if' if first else 'elif'} _tag == {tag}:")
+        lines.extend(_indent(body, 4))
+        first = False
+    lines.append("    except (IndexError, StructError) as error:")
+    lines.append("        raise DecodeError('Truncated message') from error")
+    lines.append("    except UnicodeDecodeError as error:")
+    lines.append("        raise DecodeError('String field is not valid UTF-8') from error")
+    lines.append(f"    return f_{spec.name}")
+    return _build(cls, name, lines, namespace)
+
+
+def _zero_literal(spec: ProtoField, ns: dict[str, Any], map_value: bool = False) -> str:
+    if spec.kind in (FieldKind.MAP, FieldKind.STRUCT):
+        return "{}"
+    if spec.repeated:
+        return "[]"
+    if map_value and spec.kind is FieldKind.MESSAGE and spec.message_type is not None:
+        # Map values are never None: an entry without a value holds an empty message.
+        ns[f"_msg_{spec.name}"] = spec.message_type
+        return f"_msg_{spec.name}()"
+    if spec.kind is FieldKind.ENUM and spec.enum_type is not None:
+        ns[f"_zero_{spec.name}"] = spec.enum_type(0)
+        return f"_zero_{spec.name}"
+    return repr(spec.zero_value())
+
+
+def _read_varint_lines(var: str) -> list[str]:
+    return [
+        f"{var} = buf[pos]",
+        f"if {var} < 128:",
+        "    pos += 1",
+        "else:",
+        f"    {var}, pos = _read_varint(buf, pos)",
+    ]
+
+
+def _read_length_lines(limit: str) -> list[str]:
+    """Lines leaving the value span in ``pos`` .. ``_e``, checked against ``limit``."""
+    return [
+        *_read_varint_lines("_len"),
+        "_e = pos + _len",
+        f"if _e > {limit}:",
+        "    raise DecodeError('Length-delimited field runs past end of message')",
+    ]
+
+
+def _read_value_lines(spec: ProtoField, target: str, limit: str, ns: dict[str, Any], compact: bool) -> list[str]:
+    """Lines decoding one (unpacked) value of ``spec`` into ``target`` and advancing ``pos``."""
+    kind = spec.kind
+    if kind is FieldKind.FLOAT:
+        return [f"{target} = _unpack_float(buf, pos)[0]", "pos += 4"]
+    if kind is FieldKind.DOUBLE:
+        return [f"{target} = _unpack_double(buf, pos)[0]", "pos += 8"]
+    if kind in _VARINT_KINDS:
+        lines = _read_varint_lines(target)
+        if kind is FieldKind.BOOL:
+            lines.append(f"{target} = {target} != 0")
+        elif kind is FieldKind.INT32 or kind is FieldKind.ENUM:
+            lines += [f"if {target} > 0x7FFFFFFF:", f"    {target} = _to_signed32({target})"]
+        elif kind is FieldKind.INT64:
+            lines += [f"if {target} > 0x7FFFFFFFFFFFFFFF:", f"    {target} -= 0x10000000000000000"]
+        elif kind is FieldKind.UINT32:
+            lines.append(f"{target} &= 0xFFFFFFFF")
+        elif kind in (FieldKind.SINT32, FieldKind.SINT64):
+            lines.append(f"{target} = _zigzag_decode({target})")
+        if kind is FieldKind.ENUM and spec.enum_type is not None:
+            # Unknown enum numbers stay plain ints (proto3 enums are open).
+            ns[f"_members_{spec.name}"] = spec.enum_type._value2member_map_
+            lines.append(f"{target} = _members_{spec.name}.get({target}, {target})")
+        return lines
+    lines = _read_length_lines(limit)
+    if kind is FieldKind.STRING:
+        lines.append(f"{target} = str(buf[pos:_e], 'utf-8')")
+    elif kind is FieldKind.BYTES:
+        lines.append(f"{target} = bytes(buf[pos:_e])")
+    elif kind is FieldKind.MESSAGE:
+        ns[f"_msg_{spec.name}"] = spec.message_type
+        method = "_proto_decode_compact" if compact else "_proto_decode"
+        lines.append(f"{target} = _msg_{spec.name}.{method}(buf, pos, _e)")
+    elif kind is FieldKind.TIMESTAMP:
+        lines.append(f"{target} = _decode_timestamp(buf, pos, _e)")
+    else:
+        lines.append(f"{target} = _decode_struct(buf, pos, _e)")
+    lines.append("pos = _e")
+    return lines
+
+
+def _indent(lines: list[str], depth: int = 1) -> list[str]:
+    prefix = "    " * depth
+    return [prefix + line for line in lines]
+
+
+def _decode_branches(
+    spec: ProtoField,
+    all_fields: tuple[ProtoField, ...],
+    ns: dict[str, Any],
+    compact: bool,
+) -> list[tuple[int, list[str]]]:
+    """Return (tag_value, body_lines) pairs handling every accepted encoding of ``spec``."""
+    if spec.kind is FieldKind.MAP:
+        value_kind = spec.value_kind or FieldKind.STRING
+        key_spec = ProtoField(1, f"{spec.name}_key", FieldKind.STRING)
+        value_spec = dataclasses.replace(spec, number=_MAP_VALUE_NUMBER, kind=value_kind, value_kind=None)
+        body = [
+            *_read_length_lines("end"),
+            "_entry_end = _e",
+            "_k = ''",
+            f"_v = {_zero_literal(value_spec, ns, map_value=True)}",
+            "while pos < _entry_end:",
+            *_indent(_read_varint_lines("_etag")),
+            "    if _etag == 10:",
+            *_indent(_read_value_lines(key_spec, "_k", "_entry_end", ns, compact), 2),
+            f"    elif _etag == {make_tag(_MAP_VALUE_NUMBER, wire_type_of(value_kind))}:",
+            *_indent(_read_value_lines(value_spec, "_v", "_entry_end", ns, compact), 2),
+            "    else:",
+            "        pos = _skip(buf, pos, _etag & 7)",
+            f"f_{spec.name}[_k] = _v",
+        ]
+        return [(make_tag(spec.number, WIRETYPE_LENGTH_DELIMITED), body)]
+
+    value_lines = _read_value_lines(spec, "_value", "end", ns, compact)
+    if spec.repeated:
+        branches = [(make_tag(spec.number, wire_type_of(spec.kind)), [*value_lines, f"f_{spec.name}.append(_value)"])]
+        if spec.kind in PACKABLE_KINDS:
+            packed = [
+                *_read_length_lines("end"),
+                "_packed_end = _e",
+                "while pos < _packed_end:",
+                *_indent(value_lines),
+                f"    f_{spec.name}.append(_value)",
+            ]
+            branches.append((make_tag(spec.number, WIRETYPE_LENGTH_DELIMITED), packed))
+        return branches
+
+    body = [*value_lines, f"f_{spec.name} = _value"]
+    if spec.oneof is not None:
+        # Setting one member of a oneof clears the others; the last one on the wire wins.
+        body += [f"f_{other.name} = None" for other in all_fields if other.oneof == spec.oneof and other is not spec]
+    return [(make_tag(spec.number, wire_type_of(spec.kind)), body)]
+
+
+def _build(cls: type[Any], name: str, lines: list[str], namespace: dict[str, Any]) -> Callable[..., Any]:
+    source = "\n".join(lines)
+    code = compile(source, f"<aumos_proto codec {cls.__qualname__}.{name}>", "exec")
+    exec(code, namespace)
+    function: Callable[..., Any] = namespace[name]
+    function.__qualname__ = f"{cls.__qualname__}._proto_{name}"
+    return function
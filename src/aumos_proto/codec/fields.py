@@ -0,0 +1,103 @@
+"""Field schema declarations used by the stub message classes.
+
+Each stub declares a ``_proto_fields`` tuple of :class:`ProtoField` entries that
+mirror the field numbers and types in ``proto/aumos/**/*.proto``. The codec
+uses these declarations to produce wire-compatible bytes.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+
+class FieldKind(Enum):
+    """Protobuf field types supported by the codec."""
+
+    STRING = "string"
+    BYTES = "bytes"
+    BOOL = "bool"
+    INT32 = "int32"
+    INT64 = "int64"
+    UINT32 = "uint32"
+    UINT64 = "uint64"
+    SINT32 = "sint32"
+    SINT64 = "sint64"
+    FLOAT = "float"
+    DOUBLE = "double"
+    ENUM = "enum"
+    MESSAGE = "message"
+    MAP = "map"
+    TIMESTAMP = "google.protobuf.Timestamp"
+    STRUCT = "google.protobuf.Struct"
+
+
+# Scalar kinds that proto3 packs into a single length-delimited field when repeated.
+PACKABLE_KINDS: frozenset[FieldKind] = frozenset({
+    FieldKind.BOOL,
+    FieldKind.INT32,
+    FieldKind.INT64,
+    FieldKind.UINT32,
+    FieldKind.UINT64,
+    FieldKind.SINT32,
+    FieldKind.SINT64,
+    FieldKind.FLOAT,
+    FieldKind.DOUBLE,
+    FieldKind.ENUM,
+})
+
+# Kinds whose absence on the wire is represented as None rather than a zero value.
+PRESENCE_KINDS: frozenset[FieldKind] = frozenset({FieldKind.MESSAGE, FieldKind.TIMESTAMP})
+
+
+@dataclass(frozen=True)
+class ProtoField:
+    """Schema entry for a single message field.
+
+    Attributes:
+        number:       Field number from the .proto definition.
+        name:         Python attribute name on the stub class.
+        kind:         Wire type family of the field (or of map values for MAP).
+        message_type: Stub class for MESSAGE fields and message-valued maps.
+        enum_type:    IntEnum class for ENUM fields and enum-valued maps.
+        repeated:     True for ``repeated`` fields.
+        value_kind:   Value kind for MAP fields (keys are always strings).
+        oneof:        Name of the enclosing ``oneof`` group, if any.
+    """
+
+    number: int
+    name: str
+    kind: FieldKind
+    message_type: type[Any] | None = None
+    enum_type: type[Any] | None = None
+    repeated: bool = False
+    value_kind: FieldKind | None = None
+    oneof: str | None = None
+
+    def zero_value(self) -> Any:
+        """Return the proto3 default for this field when it is absent on the wire."""
+        if self.kind is FieldKind.MAP or self.kind is FieldKind.STRUCT:
+            return {}
+        if self.repeated:
+            return []
+        if self.kind in PRESENCE_KINDS:
+            return None
+        if self.kind is FieldKind.ENUM and self.enum_type is not None:
+            return self.enum_type(0)
+        return _SCALAR_ZERO_VALUES[self.kind]
+
+
+_SCALAR_ZERO_VALUES: dict[FieldKind, Any] = {
+    FieldKind.STRING: "",
+    FieldKind.BYTES: b"",
+    FieldKind.BOOL: False,
+    FieldKind.INT32: 0,
+    FieldKind.INT64: 0,
+    FieldKind.UINT32: 0,
+    FieldKind.UINT64: 0,
+    FieldKind.SINT32: 0,
+    FieldKind.SINT64: 0,
+    FieldKind.FLOAT: 0.0,
+    FieldKind.DOUBLE: 0.0,
+    FieldKind.ENUM: 0,
+}
@@ -0,0 +1,174 @@
+"""Read-only message views that decode fields on first access.
+
+A routing or filtering service typically inspects two or three scalar fields
+(``tenant_id``, ``event_id``, ``source_service``) before forwarding a payload
+untouched. :class:`LazyMessage` keeps a reference to the original buffer and
+performs a single tag scan up front that records where each field number
+occurs; nothing is decoded until an attribute is read. Each field is then
+decoded once, by a function generated for that field alone, and cached.
+
+Obtain a view with ``SomeMessage.FromString(data, lazy=True)``. The buffer is
+retained, not copied, so it must not be mutated while the view is in use.
+"""
+from __future__ import annotations
+
+from typing import Any, Generic, TypeVar
+
+from aumos_proto.codec.compiler import FieldReader, compile_field_reader
+from aumos_proto.codec.fields import ProtoField
+from aumos_proto.codec.wire import WIRETYPE_LENGTH_DELIMITED, DecodeError, decode_varint, skip_field
+
+MessageT = TypeVar("MessageT")
+
+Occurrences = list[tuple[int, int]]
+
+
+class _Layout:
+    """Per-class lookup tables for lazy views, with field readers compiled on demand."""
+
+    __slots__ = ("cls", "readers", "specs")
+
+    def __init__(self, cls: type[Any]) -> None:
+        self.cls = cls
+        self.specs: dict[str, ProtoField] = {spec.name: spec for spec in cls._proto_fields}
+        self.readers: dict[tuple[str, bool], FieldReader] = {}
+
+    def reader(self, spec: ProtoField, compact_timestamps: bool) -> FieldReader:
+        key = (spec.name, compact_timestamps)
+        reader = self.readers.get(key)
+        if reader is None:
+            reader = self.readers[key] = compile_field_reader(self.cls, spec, compact_timestamps)
+        return reader
+
+
+_LAYOUTS: dict[type[Any], _Layout] = {}
+
+
+def _layout_for(cls: type[Any]) -> _Layout:
+    layout = _LAYOUTS.get(cls)
+    if layout is None:
+        layout = _LAYOUTS[cls] = _Layout(cls)
+    return layout
+
+
+def scan_fields(buffer: bytes | bytearray | memoryview, pos: int, end: int) -> dict[int, Occurrences]:
+    """Map each field number in ``buffer[pos:end]`` to its ``(tag, value_pos)`` occurrences.
+
+    Only tags and lengths are read; values are skipped without being decoded.
+
+    Raises:
+        DecodeError: If a tag or length runs past ``end``.
+    """
+    index: dict[int, Occurrences] = {}
+    try:
+        while pos < end:
+            tag = buffer[pos]
+            if tag < 128:
+                pos += 1
+            else:
+                tag, pos = decode_varint(buffer, pos)
+            occurrences = index.get(tag >> 3)
+            if occurrences is None:
+                index[tag >> 3] = [(tag, pos)]
+            else:
+                occurrences.append((tag, pos))
+            if tag & 7 == WIRETYPE_LENGTH_DELIMITED and buffer[pos] < 128:
+                # Short strings and sub-messages: skip without a function call.
+                pos += 1 + buffer[pos]
+            else:
+                pos = skip_field(buffer, pos, tag & 7)
+    except IndexError as error:
+        raise DecodeError("Truncated message") from error
+    if pos > end:
+        raise DecodeError("Message body overran its declared length")
+    return index
+
+
+class LazyMessage(Generic[MessageT]):
+    """Read-only view over a serialized message that decodes fields on access.
+
+    Attribute reads return the same values a full ``FromString`` decode would
+    produce, including proto3 zero values for absent fields and last-one-wins
+    semantics for oneof members. Sub-messages are decoded in full when their
+    field is read.
+
+    Args:
+        cls: The message class the buffer was serialized from.
+        buffer: Buffer holding the serialized message.
+        pos: Offset of the first byte of the message within ``buffer``.
+        end: Offset one past the last byte of the message.
+        compact_timestamps: Read Timestamp fields as :class:`Timestamp` rather
+            than ``datetime``.
+
+    Raises:
+        DecodeError: If the field framing (tags and lengths) is malformed.
+            Errors inside individual field values surface when that field is read.
+    """
+
+    __slots__ = ("_buffer", "_cls", "_compact", "_end", "_index", "_layout", "_pos", "_values")
+
+    def __init__(
+        self,
+        cls: type[MessageT],
+        buffer: bytes | bytearray | memoryview,
+        pos: int,
+        end: int,
+        compact_timestamps: bool = False,
+    ) -> None:
+        object.__setattr__(self, "_cls", cls)
+        object.__setattr__(self, "_buffer", buffer)
+        object.__setattr__(self, "_pos", pos)
+        object.__setattr__(self, "_end", end)
+        object.__setattr__(self, "_compact", compact_timestamps)
+        object.__setattr__(self, "_index", scan_fields(buffer, pos, end))
+        object.__setattr__(self, "_values", {})
+        object.__setattr__(self, "_layout", _layout_for(cls))
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names that are not slots, i.e. message fields.
+        values: dict[str, Any] = self._values
+        if name in values:
+            return values[name]
+        spec = self._layout.specs.get(name)
+        if spec is None:
+            raise AttributeError(f"{self._cls.__name__!r} has no field {name!r}")
+        value = self._read(spec)
+        values[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Lazy view of {self._cls.__name__} is read-only; call to_message() first")
+
+    def __repr__(self) -> str:
+        return f"LazyMessage({self._cls.__name__}, {self._end - self._pos} bytes)"
+
+    def _read(self, spec: ProtoField) -> Any:
+        index: dict[int, Occurrences] = self._index
+        if spec.oneof is not None and not self._oneof_winner(spec):
+            return None
+        reader = self._layout.reader(spec, self._compact)
+        return reader(self._buffer, index.get(spec.number, []), self._end)
+
+    def _oneof_winner(self, spec: ProtoField) -> bool:
+        """Return True if ``spec`` is the oneof member that appears last on the wire."""
+        index: dict[int, Occurrences] = self._index
+        mine = index.get(spec.number)
+        if not mine:
+            return False
+        last = mine[-1][1]
+        for other in self._layout.specs.values():
+            if other.oneof == spec.oneof and other is not spec:
+                theirs = index.get(other.number)
+                if theirs and theirs[-1][1] > last:
+                    return False
+        return True
+
+    def to_message(self) -> MessageT:
+        """Decode the whole buffer into a regular, mutable message instance."""
+        decode = self._cls._proto_decode_compact if self._compact else self._cls._proto_decode
+        message: MessageT = decode(self._buffer, self._pos, self._end)
+        return message
+
+    def SerializeToString(self) -> bytes:
+        """Return the original wire bytes, without re-encoding."""
+        return bytes(self._buffer[self._pos:self._end])
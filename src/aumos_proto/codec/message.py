@@ -0,0 +1,179 @@
+"""Base class providing proto3 binary serialization for the stub dataclasses.
+
+Subclasses declare ``_proto_name`` (the fully qualified protobuf message name)
+and ``_proto_fields`` (a tuple of :class:`ProtoField`). ``SerializeToString`` and
+``FromString`` then produce and consume standard proto3 wire bytes, which are
+interchangeable with the Go and TypeScript stubs generated from the same
+``.proto`` files.
+
+Encoding and decoding run through functions generated once per class by
+:mod:`aumos_proto.codec.compiler`. Proto3 semantics apply: scalar fields
+equal to their zero value are omitted on the wire and read back as that zero
+value, and message-typed fields (sub-messages and Timestamps) that are
+``None`` are omitted and read back as ``None``. Unknown fields are skipped so
+that older readers accept payloads written with newer schema versions.
+
+``FromString(data, lazy=True)`` returns a :class:`LazyMessage` view instead,
+which decodes individual fields only when they are read. With
+``compact_timestamps=True``, Timestamp fields are decoded to the compact
+:class:`Timestamp` (seconds + nanos) rather than to ``datetime``.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, ClassVar, Literal, Self, overload
+
+from aumos_proto.codec.compiler import Decoder, Encoder, compile_decoder, compile_encoder
+from aumos_proto.codec.fields import ProtoField
+from aumos_proto.codec.lazy import LazyMessage
+
+
+class ProtoMessage:
+    """Mixin giving a stub dataclass protobuf-compatible serialization."""
+
+    __slots__ = ()
+
+    _proto_name: ClassVar[str]
+    _proto_fields: ClassVar[tuple[ProtoField, ...]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Every class compiles its own codec functions, even when a parent already has.
+        if "_proto_encode" not in cls.__dict__:
+            cls._proto_encode = ProtoMessage._proto_encode  # type: ignore[method-assign]
+        if "_proto_decode" not in cls.__dict__:
+            cls._proto_decode = ProtoMessage.__dict__["_proto_decode"]  # type: ignore[method-assign]
+        if "_proto_decode_compact" not in cls.__dict__:
+            cls._proto_decode_compact = ProtoMessage.__dict__["_proto_decode_compact"]  # type: ignore[method-assign]
+
+    def SerializeToString(self) -> bytes:
+        """Serialize this message to proto3 binary wire format."""
+        out = bytearray()
+        self._proto_encode(out)
+        return bytes(out)
+
+    @overload
+    @classmethod
+    def FromString(
+        cls,
+        data: bytes | bytearray | memoryview,
+        lazy: Literal[False] = False,
+        compact_timestamps: bool = False,
+    ) -> Self: ...
+
+    @overload
+    @classmethod
+    def FromString(
+        cls,
+        data: bytes | bytearray | memoryview,
+        lazy: Literal[True],
+        compact_timestamps: bool = False,
+    ) -> LazyMessage[Self]: ...
+
+    @classmethod
+    def FromString(
+        cls,
+        data: bytes | bytearray | memoryview,
+        lazy: bool = False,
+        compact_timestamps: bool = False,
+    ) -> Self | LazyMessage[Self]:
+        """Parse a message from proto3 binary wire format.
+
+        Args:
+            data: The serialized message.
+            lazy: Return a read-only :class:`LazyMessage` view that keeps ``data``
+                and decodes each field on first access, instead of decoding
+                every field up front.
+            compact_timestamps: Decode Timestamp fields, including those of
+                sub-messages, to :class:`Timestamp` instead of ``datetime``.
+
+        Raises:
+            DecodeError: If the payload is truncated or otherwise malformed. With
+                ``lazy=True`` only the field framing is checked here; errors in a
+                field's value are raised when that field is read.
+        """
+        if lazy:
+            return LazyMessage(cls, data, 0, len(data), compact_timestamps=compact_timestamps)
+        if compact_timestamps:
+            compact: Self = cls._proto_decode_compact(data, 0, len(data))
+            return compact
+        message: Self = cls._proto_decode(data, 0, len(data))
+        return message
+
+    @classmethod
+    def serialize_many(cls, messages: Iterable[Self]) -> list[bytes]:
+        """Serialize a batch of messages, one ``bytes`` payload per message.
+
+        Equivalent to ``[m.SerializeToString() for m in messages]``. The class's
+        compiled encoder is bound once and every message is encoded into one
+        reused scratch buffer; messages of a subclass go through their own
+        encoder. On 5,000 ``MeteringEvent``s this measured 18.6-19.0 ms against
+        19.5 ms for the loop above (best of 100 runs), a 3-5% gain: nearly all
+        of the time is spent encoding the fields themselves.
+        """
+        encode = cls._compiled_encoder()
+        out = bytearray()
+        payloads: list[bytes] = []
+        append = payloads.append
+        for message in messages:
+            if type(message) is cls:
+                encode(message, out)
+            else:
+                message._proto_encode(out)
+            append(bytes(out))
+            del out[:]
+        return payloads
+
+    @classmethod
+    def parse_many(
+        cls,
+        payloads: Iterable[bytes | bytearray | memoryview],
+        compact_timestamps: bool = False,
+    ) -> list[Self]:
+        """Parse a batch of payloads produced by ``SerializeToString`` or ``serialize_many``.
+
+        Equivalent to ``[cls.FromString(p, compact_timestamps=...) for p in payloads]``,
+        with the compiled decoder looked up once for the whole batch. The gain
+        over the loop is of the same order as for :meth:`serialize_many`, since
+        decoding the fields dominates.
+
+        Raises:
+            DecodeError: If any payload is truncated or otherwise malformed.
+        """
+        decode = cls._compiled_decoder(compact_timestamps)
+        return [decode(payload, 0, len(payload)) for payload in payloads]
+
+    @classmethod
+    def _compiled_encoder(cls) -> Encoder:
+        encoder = cls.__dict__["_proto_encode"]
+        if encoder is ProtoMessage._proto_encode:
+            encoder = compile_encoder(cls)
+            cls._proto_encode = encoder  # type: ignore[method-assign,assignment]
+        return encoder  # type: ignore[no-any-return]
+
+    @classmethod
+    def _compiled_decoder(cls, compact_timestamps: bool = False) -> Decoder:
+        name = "_proto_decode_compact" if compact_timestamps else "_proto_decode"
+        decoder = cls.__dict__[name]
+        if decoder is ProtoMessage.__dict__[name]:
+            decoder = staticmethod(compile_decoder(cls, compact_timestamps))
+            setattr(cls, name, decoder)
+        return decoder.__func__  # type: ignore[no-any-return]
+
+    def _proto_encode(self, out: bytearray) -> None:
+        """Append this message's fields to ``out``.
+
+        The first call compiles the class's encoder and installs it in place of
+        this method, so later calls go straight to the generated function.
+        """
+        type(self)._compiled_encoder()(self, out)
+
+    @classmethod
+    def _proto_decode(cls, buffer: bytes | bytearray | memoryview, pos: int, end: int) -> Any:
+        """Decode ``buffer[pos:end]``, compiling and installing the decoder on first use."""
+        return cls._compiled_decoder()(buffer, pos, end)
+
+    @classmethod
+    def _proto_decode_compact(cls, buffer: bytes | bytearray | memoryview, pos: int, end: int) -> Any:
+        """Like ``_proto_decode``, with Timestamp fields decoded to :class:`Timestamp`."""
+        return cls._compiled_decoder(compact_timestamps=True)(buffer, pos, end)
@@ -0,0 +1,333 @@
+"""Wire encoding for the Google well-known types used by AumOS schemas.
+
+Covers ``google.protobuf.Timestamp`` (mapped to timezone-aware ``datetime``,
+or to the compact :class:`Timestamp` on request) and ``google.protobuf.Struct`` / ``Value`` / ``ListValue`` (mapped to plain
+``dict`` / ``list`` / scalar Python values), following the field layouts in
+``google/protobuf/timestamp.proto`` and ``google/protobuf/struct.proto``.
+
+As in every other protobuf runtime, Struct numbers are doubles on the wire,
+so integers read back as ``float``.
+"""
+from __future__ import annotations
+
+import functools
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from aumos_proto.codec.wire import (
+    DecodeError,
+    decode_double,
+    decode_length,
+    decode_varint,
+    encode_double,
+    encode_varint,
+    skip_field,
+    to_signed32,
+    to_signed64,
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Range of google.protobuf.Timestamp, 0001-01-01T00:00:00Z to 9999-12-31T23:59:59.999999999Z.
+_MIN_TIMESTAMP_SECONDS = -62_135_596_800
+_MAX_TIMESTAMP_SECONDS = 253_402_300_799
+_MAX_TIMESTAMP_NANOS = 999_999_999
+
+# Pre-computed keys for the well-known message fields.
+_TAG_SECONDS = 0x08  # Timestamp.seconds = 1, varint
+_TAG_NANOS = 0x10  # Timestamp.nanos = 2, varint
+_TAG_STRUCT_FIELDS = 0x0A  # Struct.fields = 1, length-delimited (map entry)
+_TAG_ENTRY_KEY = 0x0A  # map entry key = 1, length-delimited
+_TAG_ENTRY_VALUE = 0x12  # map entry value = 2, length-delimited
+_TAG_NULL_VALUE = 0x08  # Value.null_value = 1, varint
+_TAG_NUMBER_VALUE = 0x11  # Value.number_value = 2, fixed64
+_TAG_STRING_VALUE = 0x1A  # Value.string_value = 3, length-delimited
+_TAG_BOOL_VALUE = 0x20  # Value.bool_value = 4, varint
+_TAG_STRUCT_VALUE = 0x2A  # Value.struct_value = 5, length-delimited
+_TAG_LIST_VALUE = 0x32  # Value.list_value = 6, length-delimited
+_TAG_LIST_VALUES = 0x0A  # ListValue.values = 1, length-delimited
+
+
+# ---------------------------------------------------------------------------
+# google.protobuf.Timestamp
+# ---------------------------------------------------------------------------
+
+
+@functools.total_ordering
+class Timestamp:
+    """Compact ``google.protobuf.Timestamp``: int64 seconds and int32 nanos since the epoch.
+
+    Building and decoding ``datetime`` objects dominates the cost of encoding
+    and decoding most AumOS events. A ``Timestamp`` carries the wire values as
+    plain ints and builds the UTC ``datetime`` only when ``to_datetime()`` is
+    called, caching it afterwards. Any ``TIMESTAMP`` field accepts either type
+    when encoding; decoders return ``Timestamp`` values when asked for
+    ``compact_timestamps=True``.
+
+    A ``Timestamp`` compares equal to the ``datetime`` it represents, at
+    microsecond precision.
+    """
+
+    __slots__ = ("_datetime", "nanos", "seconds")
+
+    def __init__(self, seconds: int = 0, nanos: int = 0) -> None:
+        self.seconds = seconds
+        self.nanos = nanos
+        self._datetime: datetime | None = None
+
+    @classmethod
+    def now(cls) -> Timestamp:
+        """Return the current time, read with ``time.time_ns()``."""
+        seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+        return cls(seconds, nanos)
+
+    @classmethod
+    def from_datetime(cls, value: datetime) -> Timestamp:
+        """Convert a datetime; naive values are interpreted as UTC."""
+        return cls(*datetime_to_seconds_nanos(value))
+
+    def to_datetime(self) -> datetime:
+        """Return the equivalent UTC datetime (nanos truncated to microseconds)."""
+        if self._datetime is None:
+            self._datetime = seconds_nanos_to_datetime(self.seconds, self.nanos)
+        return self._datetime
+
+    def to_nanos(self) -> int:
+        """Return nanoseconds since the Unix epoch."""
+        return self.seconds * 1_000_000_000 + self.nanos
+
+    def _micros_key(self) -> tuple[int, int]:
+        return self.seconds, self.nanos - self.nanos % 1000
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Timestamp):
+            return self.seconds == other.seconds and self.nanos == other.nanos
+        if isinstance(other, datetime):
+            return self._micros_key() == datetime_to_seconds_nanos(other)
+        return NotImplemented
+
+    def __lt__(self, other: object) -> bool:
+        if isinstance(other, Timestamp):
+            return (self.seconds, self.nanos) < (other.seconds, other.nanos)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # Equal to the hash of the matching datetime, since the two compare equal.
+        return hash(self.to_datetime())
+
+    def __repr__(self) -> str:
+        return f"Timestamp(seconds={self.seconds}, nanos={self.nanos})"
+
+
+def datetime_to_seconds_nanos(value: datetime) -> tuple[int, int]:
+    """Split a datetime into Timestamp (seconds, nanos) since the Unix epoch.
+
+    Naive datetimes are interpreted as UTC, matching how the stubs create them.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return delta.days * 86400 + delta.seconds, delta.microseconds * 1000
+
+
+def seconds_nanos_to_datetime(seconds: int, nanos: int) -> datetime:
+    """Build a UTC datetime from Timestamp fields (nanos truncated to microseconds)."""
+    return _EPOCH + timedelta(0, seconds, nanos // 1000)
+
+
+def encode_timestamp(value: datetime | Timestamp, out: bytearray) -> None:
+    """Append the body of a Timestamp message (without tag or length prefix)."""
+    if type(value) is Timestamp:
+        seconds, nanos = value.seconds, value.nanos
+    else:
+        seconds, nanos = datetime_to_seconds_nanos(value)  # type: ignore[arg-type]
+    if seconds:
+        out.append(_TAG_SECONDS)
+        encode_varint(seconds, out)
+    if nanos:
+        out.append(_TAG_NANOS)
+        encode_varint(nanos, out)
+
+
+def _timestamp_fields(buffer: bytes | bytearray | memoryview, pos: int, end: int) -> tuple[int, int]:
+    """Read (seconds, nanos) from a Timestamp body, inlining the common varint reads."""
+    seconds = 0
+    nanos = 0
+    while pos < end:
+        key = buffer[pos]
+        if key == _TAG_SECONDS or key == _TAG_NANOS:
+            pos += 1
+            raw = 0
+            shift = 0
+            while True:
+                byte = buffer[pos]
+                pos += 1
+                raw |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+                if shift >= 70:
+                    raise DecodeError("Varint exceeds 10 bytes")
+            if key == _TAG_SECONDS:
+                seconds = to_signed64(raw & 0xFFFFFFFFFFFFFFFF) if raw > 0x7FFFFFFFFFFFFFFF else raw
+            else:
+                nanos = to_signed32(raw) if raw > 0x7FFFFFFF else raw
+        else:
+            key, pos = decode_varint(buffer, pos)
+            pos = skip_field(buffer, pos, key & 7)
+    return seconds, nanos
+
+
+def decode_timestamp(buffer: bytes | bytearray | memoryview, pos: int, end: int) -> datetime:
+    """Decode a Timestamp message body spanning ``buffer[pos:end]``.
+
+    Raises:
+        DecodeError: If the value lies outside the Timestamp range, which
+            ``datetime`` cannot represent either.
+    """
+    seconds, nanos = _timestamp_fields(buffer, pos, end)
+    if not (_MIN_TIMESTAMP_SECONDS <= seconds <= _MAX_TIMESTAMP_SECONDS and 0 <= nanos <= _MAX_TIMESTAMP_NANOS):
+        raise DecodeError(f"Timestamp out of range: seconds={seconds}, nanos={nanos}")
+    return seconds_nanos_to_datetime(seconds, nanos)
+
+
+def decode_timestamp_compact(buffer: bytes | bytearray | memoryview, pos: int, end: int) -> Timestamp:
+    """Decode a Timestamp message body into a :class:`Timestamp` without building a datetime."""
+    return Timestamp(*_timestamp_fields(buffer, pos, end))
+
+
+# ---------------------------------------------------------------------------
+# google.protobuf.Struct / Value / ListValue
+# ---------------------------------------------------------------------------
+
+
+def encode_struct(value: dict[str, Any], out: bytearray) -> None:
+    """Append the body of a Struct message built from a string-keyed dict."""
+    for key, item in value.items():
+        entry = bytearray()
+        key_bytes = str(key).encode("utf-8")
+        entry.append(_TAG_ENTRY_KEY)
+        encode_varint(len(key_bytes), entry)
+        entry += key_bytes
+        body = bytearray()
+        encode_value(item, body)
+        entry.append(_TAG_ENTRY_VALUE)
+        encode_varint(len(body), entry)
+        entry += body
+        out.append(_TAG_STRUCT_FIELDS)
+        encode_varint(len(entry), out)
+        out += entry
+
+
+def encode_value(value: Any, out: bytearray) -> None:
+    """Append the body of a Value message for a JSON-compatible Python value.
+
+    Raises:
+        TypeError: If the value cannot be represented as a google.protobuf.Value.
+    """
+    if value is None:
+        out.append(_TAG_NULL_VALUE)
+        out.append(0)
+    elif isinstance(value, bool):
+        out.append(_TAG_BOOL_VALUE)
+        out.append(1 if value else 0)
+    elif isinstance(value, (int, float)):
+        out.append(_TAG_NUMBER_VALUE)
+        encode_double(float(value), out)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        out.append(_TAG_STRING_VALUE)
+        encode_varint(len(encoded), out)
+        out += encoded
+    elif isinstance(value, dict):
+        body = bytearray()
+        encode_struct(value, body)
+        out.append(_TAG_STRUCT_VALUE)
+        encode_varint(len(body), out)
+        out += body
+    elif isinstance(value, (list, tuple)):
+        body = bytearray()
+        for item in value:
+            item_body = bytearray()
+            encode_value(item, item_body)
+            body.append(_TAG_LIST_VALUES)
+            encode_varint(len(item_body), body)
+            body += item_body
+        out.append(_TAG_LIST_VALUE)
+        encode_varint(len(body), out)
+        out += body
+    else:
+        raise TypeError(
+            f"Cannot encode {type(value).__name__} as google.protobuf.Value; "
+            "expected None, bool, int, float, str, dict or list"
+        )
+
+
+def decode_struct(buffer: bytes | bytearray | memoryview, pos: int, end: int) -> dict[str, Any]:
+    """Decode a Struct message body spanning ``buffer[pos:end]``."""
+    result: dict[str, Any] = {}
+    while pos < end:
+        key, pos = decode_varint(buffer, pos)
+        if key != _TAG_STRUCT_FIELDS:
+            pos = skip_field(buffer, pos, key & 7)
+            continue
+        entry_end, pos = decode_length(buffer, pos)
+        name = ""
+        item: Any = None
+        while pos < entry_end:
+            entry_key, pos = decode_varint(buffer, pos)
+            if entry_key == _TAG_ENTRY_KEY:
+                value_end, pos = decode_length(buffer, pos)
+                name = str(buffer[pos:value_end], "utf-8")
+                pos = value_end
+            elif entry_key == _TAG_ENTRY_VALUE:
+                value_end, pos = decode_length(buffer, pos)
+                item = decode_value(buffer, pos, value_end)
+                pos = value_end
+            else:
+                pos = skip_field(buffer, pos, entry_key & 7)
+        result[name] = item
+    return result
+
+
+def decode_value(buffer: bytes | bytearray | memoryview, pos: int, end: int) -> Any:
+    """Decode a Value message body spanning ``buffer[pos:end]``."""
+    result: Any = None
+    while pos < end:
+        key, pos = decode_varint(buffer, pos)
+        if key == _TAG_NULL_VALUE:
+            _, pos = decode_varint(buffer, pos)
+            result = None
+        elif key == _TAG_NUMBER_VALUE:
+            result, pos = decode_double(buffer, pos)
+        elif key == _TAG_STRING_VALUE:
+            value_end, pos = decode_length(buffer, pos)
+            result = str(buffer[pos:value_end], "utf-8")
+            pos = value_end
+        elif key == _TAG_BOOL_VALUE:
+            raw, pos = decode_varint(buffer, pos)
+            result = bool(raw)
+        elif key == _TAG_STRUCT_VALUE:
+            value_end, pos = decode_length(buffer, pos)
+            result = decode_struct(buffer, pos, value_end)
+            pos = value_end
+        elif key == _TAG_LIST_VALUE:
+            value_end, pos = decode_length(buffer, pos)
+            result = _decode_list(buffer, pos, value_end)
+            pos = value_end
+        else:
+            pos = skip_field(buffer, pos, key & 7)
+    return result
+
+
+def _decode_list(buffer: bytes | bytearray | memoryview, pos: int, end: int) -> list[Any]:
+    items: list[Any] = []
+    while pos < end:
+        key, pos = decode_varint(buffer, pos)
+        if key != _TAG_LIST_VALUES:
+            pos = skip_field(buffer, pos, key & 7)
+            continue
+        value_end, pos = decode_length(buffer, pos)
+        items.append(decode_value(buffer, pos, value_end))
+        pos = value_end
+    return items
@@ -0,0 +1,165 @@
+"""Low-level proto3 wire format primitives.
+
+Implements the encoding rules from the Protobuf language guide:
+    - base-128 varints (int32/int64/uint32/uint64/bool/enum)
+    - ZigZag mapping for sint32/sint64
+    - little-endian fixed 32-bit and 64-bit values (float/double)
+    - length-delimited values (string/bytes/sub-messages/packed repeated)
+
+Every message field on the wire is a varint key ``(field_number << 3) | wire_type``
+followed by the value. Readers accept any object supporting the buffer protocol
+(``bytes``, ``bytearray``, ``memoryview``); writers append to a ``bytearray``.
+"""
+from __future__ import annotations
+
+import struct
+
+WIRETYPE_VARINT: int = 0
+WIRETYPE_FIXED64: int = 1
+WIRETYPE_LENGTH_DELIMITED: int = 2
+WIRETYPE_START_GROUP: int = 3
+WIRETYPE_END_GROUP: int = 4
+WIRETYPE_FIXED32: int = 5
+
+_UINT64_MASK: int = (1 << 64) - 1
+_UINT32_MASK: int = (1 << 32) - 1
+
+_FLOAT = struct.Struct("<f")
+_DOUBLE = struct.Struct("<d")
+
+
+class DecodeError(ValueError):
+    """Raised when a payload is not valid proto3 wire format."""
+
+
+def make_tag(field_number: int, wire_type: int) -> int:
+    """Return the varint key for a field number and wire type."""
+    return (field_number << 3) | wire_type
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Append ``value`` as a base-128 varint.
+
+    Negative values are written as their 64-bit two's complement, which is
+    how proto3 encodes negative int32/int64 values (always 10 bytes).
+    """
+    value &= _UINT64_MASK
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(buffer: bytes | bytearray | memoryview, pos: int) -> tuple[int, int]:
+    """Read an unsigned varint starting at ``pos``.
+
+    Returns:
+        A tuple of (value, new_position).
+
+    Raises:
+        DecodeError: If the varint is truncated or longer than 10 bytes.
+    """
+    result = 0
+    shift = 0
+    end = len(buffer)
+    while True:
+        if pos >= end:
+            raise DecodeError("Truncated varint")
+        byte = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result & _UINT64_MASK, pos
+        shift += 7
+        if shift >= 70:
+            raise DecodeError("Varint exceeds 10 bytes")
+
+
+def to_signed64(value: int) -> int:
+    """Interpret a 64-bit unsigned varint value as a signed int64."""
+    return value - (1 << 64) if value & (1 << 63) else value
+
+
+def to_signed32(value: int) -> int:
+    """Truncate a varint value to 32 bits and interpret it as a signed int32."""
+    value &= _UINT32_MASK
+    return value - (1 << 32) if value & (1 << 31) else value
+
+
+def zigzag_encode(value: int) -> int:
+    """Map a signed integer onto an unsigned one (sint32/sint64 encoding)."""
+    return ((value << 1) ^ (value >> 63)) & _UINT64_MASK
+
+
+def zigzag_decode(value: int) -> int:
+    """Inverse of :func:`zigzag_encode`."""
+    return (value >> 1) ^ -(value & 1)
+
+
+def encode_float(value: float, out: bytearray) -> None:
+    """Append a 32-bit little-endian IEEE 754 float."""
+    out += _FLOAT.pack(value)
+
+
+def encode_double(value: float, out: bytearray) -> None:
+    """Append a 64-bit little-endian IEEE 754 double."""
+    out += _DOUBLE.pack(value)
+
+
+def decode_float(buffer: bytes | bytearray | memoryview, pos: int) -> tuple[float, int]:
+    """Read a 32-bit float starting at ``pos``."""
+    if pos + 4 > len(buffer):
+        raise DecodeError("Truncated fixed32 value")
+    return float(_FLOAT.unpack_from(buffer, pos)[0]), pos + 4
+
+
+def decode_double(buffer: bytes | bytearray | memoryview, pos: int) -> tuple[float, int]:
+    """Read a 64-bit double starting at ``pos``."""
+    if pos + 8 > len(buffer):
+        raise DecodeError("Truncated fixed64 value")
+    return float(_DOUBLE.unpack_from(buffer, pos)[0]), pos + 8
+
+
+def encode_length_delimited(payload: bytes | bytearray, out: bytearray) -> None:
+    """Append a varint length prefix followed by ``payload``."""
+    encode_varint(len(payload), out)
+    out += payload
+
+
+def decode_length(buffer: bytes | bytearray | memoryview, pos: int) -> tuple[int, int]:
+    """Read a length prefix and return (end_of_value, start_of_value).
+
+    Raises:
+        DecodeError: If the declared length runs past the end of the buffer.
+    """
+    length, pos = decode_varint(buffer, pos)
+    end = pos + length
+    if end > len(buffer):
+        raise DecodeError(f"Length-delimited value of {length} bytes runs past end of buffer")
+    return end, pos
+
+
+def skip_field(buffer: bytes | bytearray | memoryview, pos: int, wire_type: int) -> int:
+    """Skip over a field value of the given wire type and return the new position.
+
+    Used to ignore unknown fields, which keeps older readers compatible with
+    payloads produced by newer schemas.
+
+    Raises:
+        DecodeError: For group wire types (unsupported in proto3) or truncated values.
+    """
+    if wire_type == WIRETYPE_VARINT:
+        _, pos = decode_varint(buffer, pos)
+        return pos
+    if wire_type == WIRETYPE_LENGTH_DELIMITED:
+        end, _ = decode_length(buffer, pos)
+        return end
+    if wire_type == WIRETYPE_FIXED64:
+        pos += 8
+    elif wire_type == WIRETYPE_FIXED32:
+        pos += 4
+    else:
+        raise DecodeError(f"Unsupported wire type {wire_type}")
+    if pos > len(buffer):
+        raise DecodeError("Truncated fixed-width value")
+    return pos
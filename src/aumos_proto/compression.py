@@ -0,0 +1,383 @@
+"""Dictionary-compressed batches of serialized events.
+
+AumOS events are small (a few hundred bytes) and mostly made of the same field
+tags and values (``source_service``, tenant IDs, actions), so compressing them
+one by one barely helps. :class:`BatchCompressor` compresses many serialized or
+schema-registry framed records together in one zlib stream primed with a
+preset dictionary of byte strings common to AumOS events, so even the first
+record of a batch compresses well::
+
+    store = DictionaryStore("dictionaries/")
+    compressor = BatchCompressor(store.latest())
+    blob = compressor.compress(records)                     # e.g. one Kafka poll batch
+
+    decompressor = BatchDecompressor(store.load_all())
+    records = decompressor.decompress(blob)
+
+A batch names the dictionary version it was compressed with, so readers keep
+every published version and writers move to a new one at their own pace:
+
+    header: b"AZDB" | format version (uint8) | dictionary version (uint32 BE, 0 = none) |
+            record count (uint32 BE) | uncompressed body size (uint32 BE)
+    body:   zlib stream of the records, each prefixed with its length as a varint
+
+Dictionaries are trained from sample records with :func:`train_dictionary`,
+and versions are kept as files by :class:`DictionaryStore`. The command line
+trains a dictionary from event log captures (see :mod:`aumos_proto.eventlog`)
+and reports the sizes it achieves::
+
+    python -m aumos_proto.compression train dictionaries/ captures/*.aelog
+    python -m aumos_proto.compression evaluate dictionaries/ captures/*.aelog
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import struct
+import sys
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from aumos_proto.codec.wire import DecodeError, decode_varint, encode_varint
+from aumos_proto.registry.framing import Buffer
+
+BATCH_MAGIC = b"AZDB"
+FORMAT_VERSION = 1
+NO_DICTIONARY = 0
+# zlib only looks back 32 KiB, so a larger dictionary is never used.
+MAX_DICTIONARY_SIZE = 32 * 1024
+_BATCH_HEADER = struct.Struct(">4sBIII")
+BATCH_HEADER_SIZE: int = _BATCH_HEADER.size
+
+_DICTIONARY_SUFFIX = ".zdict"
+
+
+class CorruptBatchError(ValueError):
+    """Raised when a compressed batch has a bad header or its body does not decompress."""
+
+
+class UnknownDictionaryError(LookupError):
+    """Raised when a batch was compressed with a dictionary version the reader does not have."""
+
+
+@dataclass(frozen=True)
+class CompressionDictionary:
+    """A versioned zlib preset dictionary.
+
+    Attributes:
+        version: Positive version number written into every batch compressed with it.
+        data:    Dictionary bytes, most useful strings last (closest to the data).
+
+    Raises:
+        ValueError: If the version is not positive or the data is empty or too large.
+    """
+
+    version: int
+    data: bytes
+
+    def __post_init__(self) -> None:
+        if self.version <= NO_DICTIONARY:
+            raise ValueError("Dictionary version must be positive")
+        if not self.data or len(self.data) > MAX_DICTIONARY_SIZE:
+            raise ValueError(f"Dictionary must hold 1 to {MAX_DICTIONARY_SIZE} bytes")
+
+
+class DictionaryStore:
+    """Directory of immutable dictionary versions, one ``v<version>.zdict`` file each.
+
+    Args:
+        directory: Directory holding the dictionaries; created on first :meth:`add`.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = Path(directory)
+
+    def versions(self) -> list[int]:
+        """Return the stored versions in ascending order."""
+        if not self.directory.is_dir():
+            return []
+        versions = []
+        for path in self.directory.glob(f"v*{_DICTIONARY_SUFFIX}"):
+            number = path.name[1:-len(_DICTIONARY_SUFFIX)]
+            if number.isdigit():
+                versions.append(int(number))
+        return sorted(versions)
+
+    def get(self, version: int) -> CompressionDictionary:
+        """Load one version.
+
+        Raises:
+            UnknownDictionaryError: If the version is not stored.
+        """
+        path = self._path(version)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            raise UnknownDictionaryError(f"No compression dictionary v{version} in {self.directory}") from None
+        return CompressionDictionary(version, data)
+
+    def latest(self) -> CompressionDictionary | None:
+        """Load the highest version, or None if the store is empty."""
+        versions = self.versions()
+        return self.get(versions[-1]) if versions else None
+
+    def load_all(self) -> list[CompressionDictionary]:
+        """Load every stored version, for readers of batches of any age."""
+        return [self.get(version) for version in self.versions()]
+
+    def add(self, data: bytes) -> CompressionDictionary:
+        """Store ``data`` as the next version; existing versions are never rewritten."""
+        versions = self.versions()
+        dictionary = CompressionDictionary(versions[-1] + 1 if versions else 1, bytes(data))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(dictionary.version)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(dictionary.data)
+        # Hard-linking fails if another writer took the version meanwhile, instead of replacing it.
+        try:
+            os.link(temporary, path)
+        finally:
+            temporary.unlink()
+        return dictionary
+
+    def _path(self, version: int) -> Path:
+        return self.directory / f"v{version}{_DICTIONARY_SUFFIX}"
+
+
+class BatchCompressor:
+    """Compresses batches of records with one preset dictionary.
+
+    The zlib state primed with the dictionary is built once and copied for
+    each batch.
+
+    Args:
+        dictionary: Preset dictionary, or None for plain zlib.
+        level:      zlib compression level, 0-9.
+    """
+
+    def __init__(self, dictionary: CompressionDictionary | None, level: int = 6) -> None:
+        self.dictionary = dictionary
+        self._version = dictionary.version if dictionary is not None else NO_DICTIONARY
+        if dictionary is not None:
+            self._primed = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS, zdict=dictionary.data)
+        else:
+            self._primed = zlib.compressobj(level)
+
+    def compress(self, records: Sequence[Buffer]) -> bytes:
+        """Return one compressed batch holding ``records`` in order."""
+        body = bytearray()
+        for record in records:
+            encode_varint(len(record), body)
+            body += record
+        compressor = self._primed.copy()
+        header = _BATCH_HEADER.pack(BATCH_MAGIC, FORMAT_VERSION, self._version, len(records), len(body))
+        return header + compressor.compress(body) + compressor.flush()
+
+
+class BatchDecompressor:
+    """Decompresses batches written with any of a set of dictionary versions.
+
+    Args:
+        dictionaries: Every dictionary version batches may reference.
+    """
+
+    def __init__(self, dictionaries: Iterable[CompressionDictionary] = ()) -> None:
+        self._primed: dict[int, Any] = {NO_DICTIONARY: zlib.decompressobj()}
+        for dictionary in dictionaries:
+            self._primed[dictionary.version] = zlib.decompressobj(zlib.MAX_WBITS, zdict=dictionary.data)
+
+    def decompress(self, batch: Buffer) -> list[bytes]:
+        """Return the records of a compressed batch.
+
+        Raises:
+            CorruptBatchError:      If the header is invalid or the body is damaged.
+            UnknownDictionaryError: If the batch's dictionary version is not known.
+        """
+        if len(batch) < BATCH_HEADER_SIZE:
+            raise CorruptBatchError("Too short for a compressed batch header")
+        magic, format_version, version, count, size = _BATCH_HEADER.unpack_from(batch)
+        if magic != BATCH_MAGIC:
+            raise CorruptBatchError("Not an AumOS compressed batch")
+        if format_version != FORMAT_VERSION:
+            raise CorruptBatchError(f"Unsupported compressed batch format version {format_version}")
+        primed = self._primed.get(version)
+        if primed is None:
+            raise UnknownDictionaryError(f"Batch was compressed with unknown dictionary v{version}")
+
+        decompressor = primed.copy()
+        try:
+            with memoryview(batch) as view:
+                body = decompressor.decompress(view[BATCH_HEADER_SIZE:], size)
+        except zlib.error as error:
+            raise CorruptBatchError(f"Compressed batch body is damaged: {error}") from error
+        if len(body) != size or not decompressor.eof or decompressor.unconsumed_tail:
+            raise CorruptBatchError("Compressed batch body does not match its header")
+        if decompressor.unused_data:
+            raise CorruptBatchError("Compressed batch has trailing bytes after its body")
+
+        records = []
+        position = 0
+        try:
+            for _ in range(count):
+                length, position = decode_varint(body, position)
+                end = position + length
+                if end > size:
+                    raise CorruptBatchError("Compressed batch record runs past the body")
+                records.append(body[position:end])
+                position = end
+        except DecodeError as error:
+            raise CorruptBatchError(f"Compressed batch record length is damaged: {error}") from error
+        if position != size:
+            raise CorruptBatchError("Compressed batch body has trailing bytes")
+        return records
+
+
+def compress_batch(records: Sequence[Buffer], dictionary: CompressionDictionary | None = None, level: int = 6) -> bytes:
+    """Compress one batch; prefer a reused :class:`BatchCompressor` for many batches."""
+    return BatchCompressor(dictionary, level).compress(records)
+
+
+def decompress_batch(batch: Buffer, dictionaries: Iterable[CompressionDictionary] = ()) -> list[bytes]:
+    """Decompress one batch; prefer a reused :class:`BatchDecompressor` for many batches."""
+    return BatchDecompressor(dictionaries).decompress(batch)
+
+
+def train_dictionary(
+    samples: Iterable[Buffer],
+    size: int = MAX_DICTIONARY_SIZE,
+    segment_size: int = 64,
+    kmer_size: int = 8,
+) -> bytes:
+    """Build a preset dictionary from sample records.
+
+    Scores every ``kmer_size``-byte substring by the number of samples it
+    occurs in. The samples are split into one stretch per dictionary segment,
+    and from each the ``segment_size``-byte window with the highest total
+    score is kept. Substrings already covered no longer count, so segments do
+    not repeat each other. The best segments go at the end of the dictionary,
+    which zlib reaches with the shortest distances.
+
+    Args:
+        samples:      Representative records, e.g. framed events from event logs.
+        size:         Maximum dictionary size in bytes (at most 32 KiB).
+        segment_size: Length of each copied segment.
+        kmer_size:    Length of the substrings that are scored.
+
+    Returns:
+        Dictionary bytes; shorter than ``size`` if the samples have too little
+        shared content.
+
+    Raises:
+        ValueError: If the parameters are out of range or no shared content is found.
+    """
+    if not 0 < size <= MAX_DICTIONARY_SIZE:
+        raise ValueError(f"Dictionary size must be between 1 and {MAX_DICTIONARY_SIZE}")
+    if not 0 < kmer_size <= segment_size:
+        raise ValueError("kmer_size must be positive and at most segment_size")
+    records = [bytes(sample) for sample in samples if len(sample) >= kmer_size]
+
+    frequency: Counter[bytes] = Counter()
+    for record in records:
+        frequency.update({record[i:i + kmer_size] for i in range(len(record) - kmer_size + 1)})
+    corpus = b"".join(records)
+    window = segment_size - kmer_size + 1
+    stretch = max(segment_size, len(corpus) // max(1, size // segment_size))
+
+    segments: list[tuple[int, bytes]] = []
+    for start in range(0, len(corpus) - segment_size + 1, stretch):
+        end = min(start + stretch, len(corpus)) - kmer_size + 1
+        scores = [frequency.get(corpus[i:i + kmer_size], 0) for i in range(start, end)]
+        scores = [score if score > 1 else 0 for score in scores]
+        total = best = sum(scores[:window])
+        best_at = 0
+        for offset in range(1, len(scores) - window + 1):
+            total += scores[offset + window - 1] - scores[offset - 1]
+            if total > best:
+                best, best_at = total, offset
+        if best == 0:
+            continue
+        segment_start = start + best_at
+        for i in range(segment_start, segment_start + window):
+            frequency[corpus[i:i + kmer_size]] = 0
+        segments.append((best, corpus[segment_start:segment_start + segment_size]))
+
+    if not segments:
+        raise ValueError("Samples share no content to build a dictionary from")
+    segments.sort(key=lambda segment: segment[0])
+    return b"".join(segment for _, segment in segments)[-size:]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command-line entry point: train or evaluate dictionaries from event log captures."""
+    parser = argparse.ArgumentParser(
+        prog="python -m aumos_proto.compression",
+        description="Train or evaluate compression dictionaries from event log captures.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="train a dictionary and store it as the next version")
+    train.add_argument("--size", type=int, default=MAX_DICTIONARY_SIZE, help="dictionary size in bytes")
+    evaluate = commands.add_parser("evaluate", help="report batch sizes with a stored dictionary")
+    evaluate.add_argument("--version", type=int, help="dictionary version (default: latest)")
+    for command in (train, evaluate):
+        command.add_argument("--batch-size", type=int, default=100, help="records per compressed batch")
+        command.add_argument("directory", help="dictionary store directory")
+        command.add_argument("logs", nargs="+", help="event log files with sample records")
+    args = parser.parse_args(argv)
+
+    from aumos_proto.eventlog import read_event_log
+
+    records = [record for path in args.logs for record in read_event_log(path)]
+    if not records:
+        print("No records in the given event logs", file=sys.stderr)
+        return 2
+    store = DictionaryStore(args.directory)
+    try:
+        if args.command == "train":
+            # Every tenth record is held out, so the report reflects unseen events.
+            held_out = records[::10]
+            trained = [record for index, record in enumerate(records) if index % 10]
+            dictionary = store.add(train_dictionary(trained or records, size=args.size))
+            print(f"Stored dictionary v{dictionary.version} ({len(dictionary.data)} bytes) in {store.directory}")
+            records = held_out
+        elif args.version is not None:
+            dictionary = store.get(args.version)
+        else:
+            latest = store.latest()
+            if latest is None:
+                print(f"No dictionaries in {store.directory}", file=sys.stderr)
+                return 2
+            dictionary = latest
+    except (ValueError, UnknownDictionaryError) as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    raw, plain, primed = _batch_sizes(records, dictionary, args.batch_size)
+    print(f"{len(records)} records in batches of {args.batch_size}: {raw} bytes raw, "
+          f"{plain} with zlib ({_ratio(raw, plain)}), "
+          f"{primed} with dictionary v{dictionary.version} ({_ratio(raw, primed)})")
+    return 0
+
+
+def _batch_sizes(
+    records: Sequence[bytes], dictionary: CompressionDictionary, batch_size: int
+) -> tuple[int, int, int]:
+    plain, primed = BatchCompressor(None), BatchCompressor(dictionary)
+    raw = plain_size = primed_size = 0
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        raw += sum(len(record) for record in batch)
+        plain_size += len(plain.compress(batch))
+        primed_size += len(primed.compress(batch))
+    return raw, plain_size, primed_size
+
+
+def _ratio(raw: int, compressed: int) -> str:
+    return f"{raw / compressed:.1f}x" if compressed else "n/a"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""Append-only event log files of schema-registry framed records.
+
+Captures of metering and audit streams are stored as the exact bytes that went
+over Kafka, so a replay decodes them with the same :class:`FramedDecoder` as a
+live consumer. A file is a 12-byte header followed by length-delimited records:
+
+    file header:  b"AUMOSLOG" | format version (uint16 BE) | flags (uint16 BE, 0)
+    record:       length (uint32 BE) | CRC-32 of the framed bytes (uint32 BE) |
+                  framed bytes (5-byte Confluent header + Protobuf payload)
+
+:class:`EventLogWriter` batches records in memory and hands the OS large
+writes. :class:`EventLogReader` memory-maps the file and yields each framed
+record as a zero-copy ``memoryview``, so a multi-GB capture is streamed
+through the page cache instead of being read into RAM or re-parsed from text.
+
+A crash can leave a partially written record at the end of a file. Readers
+stop before it. Call :func:`recover_event_log` before appending to such a
+file again.
+"""
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Iterable, Iterator
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+from aumos_proto.registry.framing import HEADER_SIZE, MAGIC_BYTE, Buffer, encode_message_with_schema_id
+
+if TYPE_CHECKING:
+    from aumos_proto.codec import ProtoMessage
+    from aumos_proto.registry.decoder import FramedDecoder
+
+logger = logging.getLogger(__name__)
+
+FILE_MAGIC = b"AUMOSLOG"
+FORMAT_VERSION = 1
+_FILE_HEADER = struct.Struct(">8sHH")
+_RECORD_PREFIX = struct.Struct(">II")
+FILE_HEADER_SIZE: int = _FILE_HEADER.size
+RECORD_PREFIX_SIZE: int = _RECORD_PREFIX.size
+
+
+class CorruptEventLogError(ValueError):
+    """Raised when an event log file has a bad header or a record fails its checksum."""
+
+
+class EventLogWriter:
+    """Buffered appender of framed records to an event log file.
+
+    Creates the file (with its header) if it does not exist, and appends to
+    it otherwise. Records are collected in memory and written once the buffer
+    holds ``buffer_size`` bytes, on :meth:`flush` and on :meth:`close`.
+
+    Args:
+        path:        Event log file.
+        buffer_size: Bytes buffered before they are written to the file.
+
+    Raises:
+        CorruptEventLogError: If ``path`` exists but is not an event log file.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], buffer_size: int = 1 << 20) -> None:
+        self._file = open(path, "ab", buffering=0)
+        try:
+            if self._file.tell() == 0:
+                self._file.write(_FILE_HEADER.pack(FILE_MAGIC, FORMAT_VERSION, 0))
+            else:
+                with open(path, "rb") as existing:
+                    _check_file_header(existing.read(FILE_HEADER_SIZE), path)
+        except BaseException:
+            self._file.close()
+            raise
+        self._buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._records = 0
+
+    def __enter__(self) -> EventLogWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def records_written(self) -> int:
+        """Number of records appended through this writer, flushed or not."""
+        return self._records
+
+    def append(self, framed: Buffer) -> None:
+        """Append one framed record (Confluent header + payload), e.g. a Kafka record value.
+
+        Raises:
+            ValueError: If ``framed`` does not start with a Confluent framing header.
+        """
+        if len(framed) < HEADER_SIZE or framed[0] != MAGIC_BYTE:
+            raise ValueError("Record is not schema-registry framed")
+        buffer = self._buffer
+        buffer += _RECORD_PREFIX.pack(len(framed), zlib.crc32(framed))
+        buffer += framed
+        self._records += 1
+        if len(buffer) >= self._buffer_size:
+            self._write_buffer()
+
+    def append_many(self, records: Iterable[Buffer]) -> None:
+        """Append framed records in order."""
+        for framed in records:
+            self.append(framed)
+
+    def append_message(self, schema_id: int, message: ProtoMessage) -> None:
+        """Frame and append a message, encoding it straight into the write buffer.
+
+        If encoding fails, nothing is appended and the error propagates.
+        """
+        buffer = self._buffer
+        start = len(buffer)
+        try:
+            buffer += bytes(RECORD_PREFIX_SIZE)
+            encode_message_with_schema_id(schema_id, message, out=buffer)
+        except BaseException:
+            # Drop the placeholder prefix and partial payload so later records stay readable.
+            del buffer[start:]
+            raise
+        with memoryview(buffer) as view, view[start + RECORD_PREFIX_SIZE:] as framed:
+            crc = zlib.crc32(framed)
+            length = len(framed)
+        _RECORD_PREFIX.pack_into(buffer, start, length, crc)
+        self._records += 1
+        if len(buffer) >= self._buffer_size:
+            self._write_buffer()
+
+    def flush(self, fsync: bool = False) -> None:
+        """Write buffered records to the file, and to stable storage if ``fsync`` is set."""
+        self._write_buffer()
+        if fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Flush buffered records and close the file."""
+        if self._file.closed:
+            return
+        try:
+            self._write_buffer()
+        finally:
+            self._file.close()
+
+    def _write_buffer(self) -> None:
+        if not self._buffer:
+            return
+        # The file is unbuffered, so a write may take only part of the buffer.
+        with memoryview(self._buffer) as view:
+            written = 0
+            while written < len(view):
+                with view[written:] as rest:
+                    written += self._file.write(rest)
+        self._buffer.clear()
+
+
+class EventLogReader:
+    """Memory-mapped reader of an event log file.
+
+    Iterating yields each framed record as a ``memoryview`` into the mapping,
+    in file order. The views are valid until the reader is closed; copy them
+    with ``bytes(view)`` to keep records beyond that. A partially written
+    record at the end of the file (from a crashed writer) is skipped with a
+    warning.
+
+    Args:
+        path:             Event log file.
+        verify_checksums: Check each record's CRC-32 while reading.
+
+    Raises:
+        CorruptEventLogError: If the file header is missing or invalid.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], verify_checksums: bool = True) -> None:
+        self._path = path
+        self._verify = verify_checksums
+        with open(path, "rb") as file:
+            _check_file_header(file.read(FILE_HEADER_SIZE), path)
+            size = os.fstat(file.fileno()).st_size
+            self._mmap: mmap.mmap | None = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size > FILE_HEADER_SIZE else None
+            )
+        self._view: memoryview | None = memoryview(self._mmap) if self._mmap is not None else None
+        if self._mmap is not None and hasattr(self._mmap, "madvise"):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+
+    def __enter__(self) -> EventLogReader:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[memoryview]:
+        """Yield every framed record.
+
+        Raises:
+            CorruptEventLogError: If a record fails its checksum.
+        """
+        view = self._view
+        if view is None:
+            return
+        end = len(view)
+        unpack_prefix = _RECORD_PREFIX.unpack_from
+        crc32 = zlib.crc32
+        verify = self._verify
+        position = FILE_HEADER_SIZE
+        while position < end:
+            if end - position < RECORD_PREFIX_SIZE:
+                _warn_torn_tail(self._path, position)
+                return
+            length, crc = unpack_prefix(view, position)
+            start = position + RECORD_PREFIX_SIZE
+            position = start + length
+            if position > end:
+                _warn_torn_tail(self._path, start - RECORD_PREFIX_SIZE)
+                return
+            record = view[start:position]
+            if verify and crc32(record) != crc:
+                raise CorruptEventLogError(f"{self._path}: checksum mismatch in record at offset {start}")
+            yield record
+
+    def messages(self, decoder: FramedDecoder, batch_size: int = 1024) -> Iterator[ProtoMessage]:
+        """Decode every record into its event object with ``decoder``.
+
+        Records are decoded ``batch_size`` at a time through
+        :meth:`FramedDecoder.decode_many`, which groups them by schema ID.
+
+        Raises:
+            CorruptEventLogError: If a record fails its checksum or framing.
+            UnknownSchemaError: If a schema ID maps to no known message type.
+        """
+        batch: list[memoryview] = []
+        for record in self:
+            batch.append(record)
+            if len(batch) == batch_size:
+                yield from _decode_batch(decoder, batch)
+                batch = []
+        if batch:
+            yield from _decode_batch(decoder, batch)
+
+    def close(self) -> None:
+        """Unmap the file. Records still referenced by the caller keep the mapping alive until released."""
+        view, self._view = self._view, None
+        mapping, self._mmap = self._mmap, None
+        if mapping is None:
+            return
+        try:
+            if view is not None:
+                view.release()
+            mapping.close()
+        except BufferError:
+            # The caller still holds record views; the mapping is closed once they are collected.
+            pass
+
+
+def read_event_log(path: str | os.PathLike[str], verify_checksums: bool = True) -> Iterator[bytes]:
+    """Yield every framed record of an event log file as ``bytes``.
+
+    Convenience wrapper around :class:`EventLogReader` for callers that keep
+    records after iteration; the file is unmapped when the generator finishes.
+    """
+    with EventLogReader(path, verify_checksums) as reader:
+        for record in reader:
+            yield bytes(record)
+            record.release()
+
+
+def recover_event_log(path: str | os.PathLike[str]) -> int:
+    """Truncate a partially written record left at the end of an event log by a crash.
+
+    Only record lengths are followed; checksums are not verified.
+
+    Returns:
+        The number of bytes removed (0 if the file ended on a record boundary).
+
+    Raises:
+        CorruptEventLogError: If the file header is missing or invalid.
+    """
+    with open(path, "r+b") as file:
+        _check_file_header(file.read(FILE_HEADER_SIZE), path)
+        size = os.fstat(file.fileno()).st_size
+        if size <= FILE_HEADER_SIZE:
+            return 0
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            position = FILE_HEADER_SIZE
+            while size - position >= RECORD_PREFIX_SIZE:
+                length = _RECORD_PREFIX.unpack_from(mapping, position)[0]
+                if position + RECORD_PREFIX_SIZE + length > size:
+                    break
+                position += RECORD_PREFIX_SIZE + length
+        if position < size:
+            file.truncate(position)
+            logger.warning("Truncated %d bytes of a partial record from %s", size - position, path)
+        return size - position
+
+
+def _check_file_header(header: bytes, path: str | os.PathLike[str]) -> None:
+    if len(header) < FILE_HEADER_SIZE:
+        raise CorruptEventLogError(f"{path}: too short for an event log header")
+    magic, version, _flags = _FILE_HEADER.unpack(header)
+    if magic != FILE_MAGIC:
+        raise CorruptEventLogError(f"{path}: not an AumOS event log")
+    if version != FORMAT_VERSION:
+        raise CorruptEventLogError(f"{path}: unsupported event log format version {version}")
+
+
+def _warn_torn_tail(path: str | os.PathLike[str], offset: int) -> None:
+    logger.warning("Ignoring partial record at offset %d of %s", offset, path)
+
+
+def _decode_batch(decoder: FramedDecoder, batch: list[memoryview]) -> Iterator[ProtoMessage]:
+    for message in decoder.decode_many(batch):
+        if message is None:
+            raise CorruptEventLogError("Event log record is not schema-registry framed")
+        yield message
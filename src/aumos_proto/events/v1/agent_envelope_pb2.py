@@ -5,18 +5,19 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, ClassVar
 
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.ids import new_event_id
 
-@dataclass
-class AgentEnvelope:
+
+@dataclass(slots=True)
+class AgentEnvelope(ProtoMessage):
     """Standard envelope for all agent-to-agent messages."""
 
-    message_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    message_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     source_agent_id: str = ""
     target_agent_id: str = ""
@@ -30,18 +31,19 @@ class AgentEnvelope:
     ttl_seconds: int = 0
     retry_count: int = 0
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "AgentEnvelope":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "created_at" in parsed and isinstance(parsed["created_at"], str):
-            parsed["created_at"] = datetime.fromisoformat(parsed["created_at"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.AgentEnvelope"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "message_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "source_agent_id", FieldKind.STRING),
+        ProtoField(4, "target_agent_id", FieldKind.STRING),
+        ProtoField(5, "conversation_id", FieldKind.STRING),
+        ProtoField(6, "message_type", FieldKind.STRING),
+        ProtoField(7, "payload", FieldKind.STRUCT),
+        ProtoField(8, "privilege_level", FieldKind.INT32),
+        ProtoField(9, "created_at", FieldKind.TIMESTAMP),
+        ProtoField(10, "correlation_id", FieldKind.STRING),
+        ProtoField(11, "metadata", FieldKind.MAP, value_kind=FieldKind.STRING),
+        ProtoField(12, "ttl_seconds", FieldKind.INT32),
+        ProtoField(13, "retry_count", FieldKind.INT32),
+    )
@@ -5,18 +5,19 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, ClassVar
 
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.ids import new_event_id
 
-@dataclass
-class AuditEvent:
+
+@dataclass(slots=True)
+class AuditEvent(ProtoMessage):
     """Audit event capturing all user and system actions."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     user_id: str = ""
     action: str = ""
@@ -30,18 +31,19 @@ class AuditEvent:
     request_id: str = ""
     session_id: str = ""
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "AuditEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.AuditEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "user_id", FieldKind.STRING),
+        ProtoField(4, "action", FieldKind.STRING),
+        ProtoField(5, "resource_type", FieldKind.STRING),
+        ProtoField(6, "resource_id", FieldKind.STRING),
+        ProtoField(7, "outcome", FieldKind.STRING),
+        ProtoField(8, "details", FieldKind.STRUCT),
+        ProtoField(9, "source_service", FieldKind.STRING),
+        ProtoField(10, "ip_address", FieldKind.STRING),
+        ProtoField(11, "timestamp", FieldKind.TIMESTAMP),
+        ProtoField(12, "request_id", FieldKind.STRING),
+        ProtoField(13, "session_id", FieldKind.STRING),
+    )
@@ -6,18 +6,19 @@ Replace with real protoc-generated output once buf generate pipeline is active.
 """
 from __future__ import annotations
 
-import json
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, ClassVar
 
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.ids import new_event_id
 
-@dataclass
-class FeatureFlagEvaluationEvent:
+
+@dataclass(slots=True)
+class FeatureFlagEvaluationEvent(ProtoMessage):
     """Records every evaluation of a feature flag for audit and analytics."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     flag_key: str = ""
     enabled: bool = False
@@ -26,28 +27,24 @@ class FeatureFlagEvaluationEvent:
     context: dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "FeatureFlagEvaluationEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.FeatureFlagEvaluationEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "flag_key", FieldKind.STRING),
+        ProtoField(4, "enabled", FieldKind.BOOL),
+        ProtoField(5, "evaluated_for", FieldKind.STRING),
+        ProtoField(6, "source_service", FieldKind.STRING),
+        ProtoField(7, "context", FieldKind.STRUCT),
+        ProtoField(8, "timestamp", FieldKind.TIMESTAMP),
+    )
 
 
-@dataclass
-class FeatureFlagChangeEvent:
+@dataclass(slots=True)
+class FeatureFlagChangeEvent(ProtoMessage):
     """Records updates to feature flag configuration."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     flag_key: str = ""
     previous_enabled: bool = False
@@ -56,18 +53,14 @@ class FeatureFlagChangeEvent:
     change_reason: str = ""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "FeatureFlagChangeEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.FeatureFlagChangeEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "flag_key", FieldKind.STRING),
+        ProtoField(4, "previous_enabled", FieldKind.BOOL),
+        ProtoField(5, "new_enabled", FieldKind.BOOL),
+        ProtoField(6, "changed_by", FieldKind.STRING),
+        ProtoField(7, "change_reason", FieldKind.STRING),
+        ProtoField(8, "timestamp", FieldKind.TIMESTAMP),
+    )
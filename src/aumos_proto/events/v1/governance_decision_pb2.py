@@ -5,12 +5,13 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
-from typing import Any
+from typing import Any, ClassVar
+
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.ids import new_event_id
 
 
 class GovernanceDecision(IntEnum):
@@ -24,11 +25,11 @@ class GovernanceDecision(IntEnum):
     AUTO_APPROVED = 5
 
 
-@dataclass
-class GovernanceDecisionEvent:
+@dataclass(slots=True)
+class GovernanceDecisionEvent(ProtoMessage):
     """Event representing a governance policy decision."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     policy_id: str = ""
     policy_name: str = ""
@@ -40,20 +41,17 @@ class GovernanceDecisionEvent:
     evidence: dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else int(v) if isinstance(v, GovernanceDecision) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "GovernanceDecisionEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        if "decision" in parsed and isinstance(parsed["decision"], int):
-            parsed["decision"] = GovernanceDecision(parsed["decision"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.GovernanceDecisionEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "policy_id", FieldKind.STRING),
+        ProtoField(4, "policy_name", FieldKind.STRING),
+        ProtoField(5, "resource_type", FieldKind.STRING),
+        ProtoField(6, "resource_id", FieldKind.STRING),
+        ProtoField(7, "decision", FieldKind.ENUM, enum_type=GovernanceDecision),
+        ProtoField(8, "violations", FieldKind.STRING, repeated=True),
+        ProtoField(9, "decided_by", FieldKind.STRING),
+        ProtoField(10, "evidence", FieldKind.STRUCT),
+        ProtoField(11, "timestamp", FieldKind.TIMESTAMP),
+    )
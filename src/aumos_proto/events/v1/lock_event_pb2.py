@@ -6,17 +6,19 @@ Replace with real protoc-generated output once buf generate pipeline is active.
 """
 from __future__ import annotations
 
-import json
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import ClassVar
 
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.ids import new_event_id
 
-@dataclass
-class LockAcquiredEvent:
+
+@dataclass(slots=True)
+class LockAcquiredEvent(ProtoMessage):
     """Records when a distributed lock is successfully acquired."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     lock_name: str = ""
     lock_owner: str = ""
@@ -24,28 +26,23 @@ class LockAcquiredEvent:
     source_service: str = ""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "LockAcquiredEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.LockAcquiredEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "lock_name", FieldKind.STRING),
+        ProtoField(4, "lock_owner", FieldKind.STRING),
+        ProtoField(5, "ttl_seconds", FieldKind.INT32),
+        ProtoField(6, "source_service", FieldKind.STRING),
+        ProtoField(7, "timestamp", FieldKind.TIMESTAMP),
+    )
 
 
-@dataclass
-class LockReleasedEvent:
+@dataclass(slots=True)
+class LockReleasedEvent(ProtoMessage):
     """Records when a distributed lock is released (explicitly or via TTL expiry)."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     lock_name: str = ""
     lock_owner: str = ""
@@ -53,28 +50,23 @@ class LockReleasedEvent:
     source_service: str = ""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
+    _proto_name: ClassVar[str] = "aumos.events.v1.LockReleasedEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "lock_name", FieldKind.STRING),
+        ProtoField(4, "lock_owner", FieldKind.STRING),
+        ProtoField(5, "timed_out", FieldKind.BOOL),
+        ProtoField(6, "source_service", FieldKind.STRING),
+        ProtoField(7, "timestamp", FieldKind.TIMESTAMP),
+    )
 
-    @classmethod
-    def FromString(cls, data: bytes) -> "LockReleasedEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
 
-
-@dataclass
-class LockContentionEvent:
+@dataclass(slots=True)
+class LockContentionEvent(ProtoMessage):
     """Records when a lock acquisition attempt fails due to contention."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     lock_name: str = ""
     requesting_owner: str = ""
@@ -83,18 +75,14 @@ class LockContentionEvent:
     source_service: str = ""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "LockContentionEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.LockContentionEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "lock_name", FieldKind.STRING),
+        ProtoField(4, "requesting_owner", FieldKind.STRING),
+        ProtoField(5, "current_owner", FieldKind.STRING),
+        ProtoField(6, "wait_seconds", FieldKind.INT32),
+        ProtoField(7, "source_service", FieldKind.STRING),
+        ProtoField(8, "timestamp", FieldKind.TIMESTAMP),
+    )
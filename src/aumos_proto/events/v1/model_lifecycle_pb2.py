@@ -5,12 +5,13 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
-from typing import Any
+from typing import Any, ClassVar
+
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.ids import new_event_id
 
 
 class ModelLifecycleAction(IntEnum):
@@ -28,11 +29,11 @@ class ModelLifecycleAction(IntEnum):
     MODEL_DELETED = 9
 
 
-@dataclass
-class ModelLifecycleEvent:
+@dataclass(slots=True)
+class ModelLifecycleEvent(ProtoMessage):
     """Event representing a change in model lifecycle state."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     model_id: str = ""
     model_name: str = ""
@@ -42,20 +43,15 @@ class ModelLifecycleEvent:
     metadata: dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else int(v) if isinstance(v, ModelLifecycleAction) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "ModelLifecycleEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        if "action" in parsed and isinstance(parsed["action"], int):
-            parsed["action"] = ModelLifecycleAction(parsed["action"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.ModelLifecycleEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "model_id", FieldKind.STRING),
+        ProtoField(4, "model_name", FieldKind.STRING),
+        ProtoField(5, "version", FieldKind.STRING),
+        ProtoField(6, "action", FieldKind.ENUM, enum_type=ModelLifecycleAction),
+        ProtoField(7, "triggered_by", FieldKind.STRING),
+        ProtoField(8, "metadata", FieldKind.STRUCT),
+        ProtoField(9, "timestamp", FieldKind.TIMESTAMP),
+    )
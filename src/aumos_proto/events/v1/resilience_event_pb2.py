@@ -6,17 +6,19 @@ Replace with real protoc-generated output once buf generate pipeline is active.
 """
 from __future__ import annotations
 
-import json
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import ClassVar
 
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.ids import new_event_id
 
-@dataclass
-class CircuitBreakerEvent:
+
+@dataclass(slots=True)
+class CircuitBreakerEvent(ProtoMessage):
     """Records state transitions in a circuit breaker."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     circuit_name: str = ""
     from_state: str = ""   # closed, open, half_open
@@ -27,28 +29,26 @@ class CircuitBreakerEvent:
     trigger_reason: str = ""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "CircuitBreakerEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
-
-
-@dataclass
-class RateLimitEvent:
+    _proto_name: ClassVar[str] = "aumos.events.v1.CircuitBreakerEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "circuit_name", FieldKind.STRING),
+        ProtoField(4, "from_state", FieldKind.STRING),
+        ProtoField(5, "to_state", FieldKind.STRING),
+        ProtoField(6, "source_service", FieldKind.STRING),
+        ProtoField(7, "failure_count", FieldKind.INT32),
+        ProtoField(8, "success_count", FieldKind.INT32),
+        ProtoField(9, "trigger_reason", FieldKind.STRING),
+        ProtoField(10, "timestamp", FieldKind.TIMESTAMP),
+    )
+
+
+@dataclass(slots=True)
+class RateLimitEvent(ProtoMessage):
     """Records when a rate limit threshold is crossed."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     path: str = ""
     limit: int = 0
@@ -58,28 +58,25 @@ class RateLimitEvent:
     client_id: str = ""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "RateLimitEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
-
-
-@dataclass
-class BulkheadEvent:
+    _proto_name: ClassVar[str] = "aumos.events.v1.RateLimitEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "path", FieldKind.STRING),
+        ProtoField(4, "limit", FieldKind.INT32),
+        ProtoField(5, "current_count", FieldKind.INT32),
+        ProtoField(6, "rejected", FieldKind.BOOL),
+        ProtoField(7, "source_service", FieldKind.STRING),
+        ProtoField(8, "client_id", FieldKind.STRING),
+        ProtoField(9, "timestamp", FieldKind.TIMESTAMP),
+    )
+
+
+@dataclass(slots=True)
+class BulkheadEvent(ProtoMessage):
     """Records when a bulkhead rejects a call due to concurrency saturation."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     bulkhead_name: str = ""
     max_concurrent_calls: int = 0
@@ -88,18 +85,14 @@ class BulkheadEvent:
     source_service: str = ""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "BulkheadEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.BulkheadEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "bulkhead_name", FieldKind.STRING),
+        ProtoField(4, "max_concurrent_calls", FieldKind.INT32),
+        ProtoField(5, "active_calls", FieldKind.INT32),
+        ProtoField(6, "rejected", FieldKind.BOOL),
+        ProtoField(7, "source_service", FieldKind.STRING),
+        ProtoField(8, "timestamp", FieldKind.TIMESTAMP),
+    )
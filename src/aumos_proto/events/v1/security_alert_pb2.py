@@ -5,12 +5,13 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
-from typing import Any
+from typing import Any, ClassVar
+
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.ids import new_event_id
 
 
 class AlertSeverity(IntEnum):
@@ -24,11 +25,11 @@ class AlertSeverity(IntEnum):
     CRITICAL = 5
 
 
-@dataclass
-class SecurityAlertEvent:
+@dataclass(slots=True)
+class SecurityAlertEvent(ProtoMessage):
     """Event representing a security alert or threat detection."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     severity: AlertSeverity = AlertSeverity.ALERT_SEVERITY_UNSPECIFIED
     alert_type: str = ""
@@ -40,20 +41,17 @@ class SecurityAlertEvent:
     auto_mitigated: bool = False
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else int(v) if isinstance(v, AlertSeverity) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "SecurityAlertEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        if "severity" in parsed and isinstance(parsed["severity"], int):
-            parsed["severity"] = AlertSeverity(parsed["severity"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.SecurityAlertEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "severity", FieldKind.ENUM, enum_type=AlertSeverity),
+        ProtoField(4, "alert_type", FieldKind.STRING),
+        ProtoField(5, "source_service", FieldKind.STRING),
+        ProtoField(6, "description", FieldKind.STRING),
+        ProtoField(7, "details", FieldKind.STRUCT),
+        ProtoField(8, "affected_resources", FieldKind.STRING, repeated=True),
+        ProtoField(9, "mitigation_action", FieldKind.STRING),
+        ProtoField(10, "auto_mitigated", FieldKind.BOOL),
+        ProtoField(11, "timestamp", FieldKind.TIMESTAMP),
+    )
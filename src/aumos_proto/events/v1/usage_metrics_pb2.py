@@ -5,17 +5,19 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import ClassVar
 
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.ids import new_event_id
 
-@dataclass
-class UsageMetricsEvent:
+
+@dataclass(slots=True)
+class UsageMetricsEvent(ProtoMessage):
     """Event capturing resource usage metrics for billing and monitoring."""
 
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=new_event_id)
     tenant_id: str = ""
     service_name: str = ""
     metric_type: str = ""
@@ -24,18 +26,14 @@ class UsageMetricsEvent:
     labels: dict[str, str] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "UsageMetricsEvent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "timestamp" in parsed and isinstance(parsed["timestamp"], str):
-            parsed["timestamp"] = datetime.fromisoformat(parsed["timestamp"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.events.v1.UsageMetricsEvent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "event_id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "service_name", FieldKind.STRING),
+        ProtoField(4, "metric_type", FieldKind.STRING),
+        ProtoField(5, "value", FieldKind.DOUBLE),
+        ProtoField(6, "unit", FieldKind.STRING),
+        ProtoField(7, "labels", FieldKind.MAP, value_kind=FieldKind.STRING),
+        ProtoField(8, "timestamp", FieldKind.TIMESTAMP),
+    )
@@ -0,0 +1,134 @@
+"""Event ID generation for the stub ``event_id`` / ``message_id`` defaults.
+
+``str(uuid.uuid4())`` costs a ``getrandom`` syscall and UUID object
+construction per event, and the resulting IDs are scattered uniformly across
+the key space, which hurts index locality in the audit store. The default
+generator here produces RFC 9562 UUIDv7 strings instead:
+
+    48-bit Unix milliseconds | version 7 | 12-bit sequence | variant | 62 random bits
+
+IDs sort by creation time (and by generation order within one process), and
+they remain valid UUIDs for every consumer that parses them. Random bits come
+from a pool refilled from ``os.urandom`` in large blocks, so the syscall is
+amortized over thousands of IDs, and the hex formatting of the random part is
+done in bulk at refill time.
+
+The generator used by the stubs is process-wide and can be replaced with
+:func:`set_id_generator`, e.g. to restore ``uuid4`` or to make IDs
+deterministic in tests.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from collections.abc import Callable
+
+IdGenerator = Callable[[], str]
+
+_SEQUENCE_LIMIT = 1 << 12
+# The top two bits of the random tail carry the RFC 9562 variant (0b10).
+_VARIANT_NIBBLE = {digit: "89ab"[int(digit, 16) & 3] for digit in "0123456789abcdef"}
+
+
+class TimeOrderedIdGenerator:
+    """Thread-safe UUIDv7 generator drawing randomness from a buffered pool.
+
+    Within one millisecond the 12-bit sequence field counts up, so IDs from
+    one generator are strictly increasing even when the wall clock stalls or
+    steps back; after 4096 IDs in one millisecond the timestamp borrows from
+    the next one.
+
+    Args:
+        pool_size: Number of random ID tails formatted per ``os.urandom`` call.
+
+    Raises:
+        ValueError: If ``pool_size`` is not positive.
+    """
+
+    def __init__(self, pool_size: int = 4096) -> None:
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be positive, got {pool_size}")
+        self._pool_size = pool_size
+        self._lock = threading.Lock()
+        self._pool: list[str] = []
+        self._last_ms = -1
+        self._sequence = 0
+        self._prefix = ""
+        _generators.add(self)
+
+    def __call__(self) -> str:
+        """Return a new UUIDv7 in canonical 8-4-4-4-12 hex form."""
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._set_millisecond(now_ms)
+            else:
+                self._sequence += 1
+                if self._sequence == _SEQUENCE_LIMIT:
+                    self._set_millisecond(self._last_ms + 1)
+            pool = self._pool
+            if not pool:
+                pool.extend(_random_tails(self._pool_size))
+            return f"{self._prefix}{self._sequence:03x}-{pool.pop()}"
+
+    def _set_millisecond(self, unix_ms: int) -> None:
+        self._last_ms = unix_ms
+        self._sequence = 0
+        digits = f"{unix_ms:012x}"
+        self._prefix = f"{digits[:8]}-{digits[8:]}-7"
+
+    def _reset_in_child(self) -> None:
+        # The parent's lock may have been held by a thread that does not exist
+        # in the child, and reusing its pool would replay the parent's IDs.
+        self._lock = threading.Lock()
+        self._pool = []
+
+
+# Generators still alive, reset by one fork hook without keeping them alive.
+_generators: weakref.WeakSet[TimeOrderedIdGenerator] = weakref.WeakSet()
+
+
+def _reset_generators_in_child() -> None:
+    for generator in list(_generators):
+        generator._reset_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_generators_in_child)
+
+
+def _random_tails(count: int) -> list[str]:
+    """Format ``count`` random ``"vxxx-xxxxxxxxxxxx"`` UUID tails (variant nibble first)."""
+    digits = os.urandom(8 * count).hex()
+    return [
+        f"{_VARIANT_NIBBLE[digits[i]]}{digits[i + 1:i + 4]}-{digits[i + 4:i + 16]}"
+        for i in range(0, 16 * count, 16)
+    ]
+
+
+_generator: IdGenerator = TimeOrderedIdGenerator()
+
+
+def new_event_id() -> str:
+    """Return a new ID from the process-wide generator (the stubs' default factory)."""
+    return _generator()
+
+
+def get_id_generator() -> IdGenerator:
+    """Return the process-wide ID generator."""
+    return _generator
+
+
+def set_id_generator(generator: IdGenerator) -> IdGenerator:
+    """Replace the process-wide ID generator and return the previous one.
+
+    Args:
+        generator: Zero-argument callable returning a new ID string, e.g.
+                   ``lambda: str(uuid.uuid4())`` to restore random UUIDs.
+    """
+    global _generator
+    previous = _generator
+    _generator = generator
+    return previous
@@ -0,0 +1,332 @@
+"""Streaming windowed rollups of metering events.
+
+:class:`MeteringAggregator` consumes :class:`MeteringEvent` objects and keeps
+usage totals per :class:`RollupKey` (tenant, project, team, service, model)
+for tumbling or sliding event-time windows::
+
+    aggregator = MeteringAggregator(window_ms=60_000)                 # 1-minute tumbling
+    aggregator = MeteringAggregator(window_ms=3_600_000, slide_ms=300_000)  # 1 h every 5 min
+
+    for event in events:
+        for window in aggregator.add(event):
+            publish(window.to_dict())
+    remaining = aggregator.flush()                                  # on shutdown
+
+Events are accumulated into panes ``slide_ms`` wide, so each event costs one
+pane lookup and a few additions whatever the window size. A window is emitted
+once the watermark (the latest event time seen minus ``allowed_lateness_ms``)
+passes its end, and panes no open window needs are dropped then, which bounds
+memory by the keys active within ``window_ms + allowed_lateness_ms``. Events
+whose every window ends at or before the watermark are counted in
+:attr:`MeteringAggregator.late_events` and otherwise ignored.
+
+Windows are aligned to multiples of ``slide_ms`` since the Unix epoch, so
+consumers in different processes produce the same windows. Their results for
+one window add up: combine them with :func:`merge_window_results`, after a
+round trip through :meth:`WindowResult.to_dict` and
+:meth:`WindowResult.from_dict` if they cross process boundaries.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, fields
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from aumos_proto.events.v1 import MeteringEvent
+
+# Sentinels for "nothing emitted yet" and "no window pending".
+_MIN_TIME = -(1 << 63)
+_MAX_TIME = 1 << 63
+
+
+class RollupKey(NamedTuple):
+    """Dimensions metering totals are grouped by.
+
+    ``model_id`` comes from ``token_usage`` or ``inference_usage`` and is
+    empty for storage and synthetic data usage.
+    """
+
+    tenant_id: str
+    project_id: str
+    team_id: str
+    service_name: str
+    model_id: str
+
+
+@dataclass(slots=True)
+class UsageTotals:
+    """Summed usage of the events in one window for one :class:`RollupKey`."""
+
+    events: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    estimated_cost_usd: float = 0.0
+    compute_ms: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    synthetic_records: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """Input plus output tokens."""
+        return self.input_tokens + self.output_tokens
+
+    def merge(self, other: UsageTotals) -> None:
+        """Add ``other`` into these totals."""
+        self.events += other.events
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.estimated_cost_usd += other.estimated_cost_usd
+        self.compute_ms += other.compute_ms
+        self.bytes_read += other.bytes_read
+        self.bytes_written += other.bytes_written
+        self.synthetic_records += other.synthetic_records
+
+    def copy(self) -> UsageTotals:
+        """Return an independent copy."""
+        copied = UsageTotals()
+        copied.merge(self)
+        return copied
+
+
+@dataclass(slots=True)
+class WindowResult:
+    """Totals of one closed window, covering event times ``start_ms <= t < end_ms``."""
+
+    start_ms: int
+    end_ms: int
+    totals: dict[RollupKey, UsageTotals]
+
+    def merge(self, other: WindowResult) -> None:
+        """Add the totals of the same window computed elsewhere, e.g. by another consumer.
+
+        Raises:
+            ValueError: If ``other`` covers a different window.
+        """
+        if (other.start_ms, other.end_ms) != (self.start_ms, self.end_ms):
+            raise ValueError(
+                f"Cannot merge window [{other.start_ms}, {other.end_ms}) into [{self.start_ms}, {self.end_ms})"
+            )
+        for key, totals in other.totals.items():
+            existing = self.totals.get(key)
+            if existing is None:
+                self.totals[key] = totals.copy()
+            else:
+                existing.merge(totals)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable form, one row per key."""
+        return {
+            "start_ms": self.start_ms,
+            "end_ms": self.end_ms,
+            "totals": [{**key._asdict(), **asdict(totals)} for key, totals in self.totals.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> WindowResult:
+        """Rebuild a result from :meth:`to_dict` output."""
+        totals: dict[RollupKey, UsageTotals] = {}
+        for row in data["totals"]:
+            key = RollupKey(*(row[name] for name in RollupKey._fields))
+            totals[key] = UsageTotals(**{spec.name: row[spec.name] for spec in fields(UsageTotals)})
+        return cls(data["start_ms"], data["end_ms"], totals)
+
+
+class MeteringAggregator:
+    """Incremental tumbling or sliding window totals of metering events.
+
+    Not thread-safe; use one aggregator per consumer thread and combine them
+    with :meth:`merge` or their results with :func:`merge_window_results`.
+
+    Args:
+        window_ms:           Window length in milliseconds of event time.
+        slide_ms:            Distance between window starts; defaults to
+                             ``window_ms`` (tumbling windows). Must divide
+                             ``window_ms``.
+        allowed_lateness_ms: How far behind the latest event time an event may
+                             be and still be counted in every window it falls in.
+
+    Raises:
+        ValueError: If the window parameters are inconsistent.
+    """
+
+    def __init__(self, window_ms: int, slide_ms: int | None = None, allowed_lateness_ms: int = 0) -> None:
+        slide_ms = window_ms if slide_ms is None else slide_ms
+        if window_ms <= 0 or slide_ms <= 0:
+            raise ValueError("window_ms and slide_ms must be positive")
+        if window_ms % slide_ms:
+            raise ValueError(f"slide_ms ({slide_ms}) must divide window_ms ({window_ms})")
+        if allowed_lateness_ms < 0:
+            raise ValueError("allowed_lateness_ms must not be negative")
+        self.window_ms = window_ms
+        self.slide_ms = slide_ms
+        self.allowed_lateness_ms = allowed_lateness_ms
+        self.late_events = 0
+        self._panes: dict[int, dict[tuple[str, ...], UsageTotals]] = {}
+        self._watermark = _MIN_TIME
+        self._closed_until = _MIN_TIME
+        self._next_end = _MAX_TIME
+
+    @property
+    def watermark(self) -> int:
+        """Event time up to which windows are complete (and emitted)."""
+        return self._watermark
+
+    def __len__(self) -> int:
+        """Number of (pane, key) totals held in memory."""
+        return sum(len(pane) for pane in self._panes.values())
+
+    def add(self, event: MeteringEvent) -> list[WindowResult]:
+        """Count one event and return the windows its event time closes, oldest first.
+
+        If an event has more than one ``resource`` field set, the one with the
+        highest field number is counted, as when such a payload is decoded.
+        """
+        time_ms = event.timestamp_ms
+        pane_start = time_ms - time_ms % self.slide_ms
+        if pane_start + self.window_ms <= self._watermark:
+            self.late_events += 1
+            return []
+        pane = self._panes.get(pane_start)
+        if pane is None:
+            pane = self._panes[pane_start] = {}
+            self._next_end = max(min(self._next_end, pane_start + self.slide_ms), self._closed_until + self.slide_ms)
+
+        model_id = ""
+        token = inference = storage = synthetic = None
+        if event.synthetic_usage is not None:
+            synthetic = event.synthetic_usage
+        elif event.storage_usage is not None:
+            storage = event.storage_usage
+        elif event.inference_usage is not None:
+            inference = event.inference_usage
+            model_id = inference.model_id
+        elif event.token_usage is not None:
+            token = event.token_usage
+            model_id = token.model_id
+
+        key = (event.tenant_id, event.project_id, event.team_id, event.service_name, model_id)
+        totals = pane.get(key)
+        if totals is None:
+            totals = pane[key] = UsageTotals()
+        totals.events += 1
+        if token is not None:
+            totals.input_tokens += token.input_tokens
+            totals.output_tokens += token.output_tokens
+            totals.estimated_cost_usd += token.estimated_cost_usd
+        elif inference is not None:
+            totals.compute_ms += inference.compute_ms
+        elif storage is not None:
+            totals.bytes_read += storage.bytes_read
+            totals.bytes_written += storage.bytes_written
+        elif synthetic is not None:
+            totals.synthetic_records += synthetic.records_generated
+
+        watermark = time_ms - self.allowed_lateness_ms
+        if watermark > self._watermark:
+            self._watermark = watermark
+        return self._close_windows() if self._watermark >= self._next_end else []
+
+    def add_many(self, events: Iterable[MeteringEvent]) -> list[WindowResult]:
+        """Count events in order and return every window they close, oldest first."""
+        closed: list[WindowResult] = []
+        for event in events:
+            windows = self.add(event)
+            if windows:
+                closed.extend(windows)
+        return closed
+
+    def advance_watermark(self, time_ms: int) -> list[WindowResult]:
+        """Close the windows ending at or before ``time_ms``, e.g. when a partition goes idle.
+
+        The watermark never moves backwards.
+        """
+        if time_ms > self._watermark:
+            self._watermark = time_ms
+        return self._close_windows()
+
+    def flush(self) -> list[WindowResult]:
+        """Close every window holding data, e.g. at shutdown or a partition revocation."""
+        if not self._panes:
+            return []
+        return self.advance_watermark(max(self._panes) + self.window_ms)
+
+    def merge(self, other: MeteringAggregator) -> list[WindowResult]:
+        """Add another aggregator's open panes and watermark into this one.
+
+        Data ``other`` holds only for windows that are complete here is
+        counted in :attr:`late_events`.
+
+        Returns:
+            The windows closed by the merged watermark.
+
+        Raises:
+            ValueError: If the aggregators use different window parameters.
+        """
+        if (other.window_ms, other.slide_ms) != (self.window_ms, self.slide_ms):
+            raise ValueError("Cannot merge aggregators with different window_ms or slide_ms")
+        self.late_events += other.late_events
+        for pane_start, other_pane in other._panes.items():
+            if pane_start + self.window_ms <= self._watermark:
+                self.late_events += sum(totals.events for totals in other_pane.values())
+                continue
+            pane = self._panes.get(pane_start)
+            if pane is None:
+                pane = self._panes[pane_start] = {}
+                self._next_end = max(
+                    min(self._next_end, pane_start + self.slide_ms), self._closed_until + self.slide_ms
+                )
+            for key, totals in other_pane.items():
+                existing = pane.get(key)
+                if existing is None:
+                    pane[key] = totals.copy()
+                else:
+                    existing.merge(totals)
+        return self.advance_watermark(other._watermark)
+
+    def _close_windows(self) -> list[WindowResult]:
+        closed: list[WindowResult] = []
+        window, slide, panes = self.window_ms, self.slide_ms, self._panes
+        while panes:
+            end = max(self._closed_until + slide, min(panes) + slide)
+            if end > self._watermark:
+                break
+            start = end - window
+            if window == slide:
+                # Tumbling: the window is exactly one pane, which is dropped below.
+                totals = {RollupKey._make(key): value for key, value in panes[start].items()}
+            else:
+                totals = {}
+                for pane_start, pane in panes.items():
+                    if start <= pane_start < end:
+                        for key, value in pane.items():
+                            rollup_key = RollupKey._make(key)
+                            existing = totals.get(rollup_key)
+                            if existing is None:
+                                totals[rollup_key] = value.copy()
+                            else:
+                                existing.merge(value)
+            closed.append(WindowResult(start, end, totals))
+            self._closed_until = end
+            for pane_start in [pane_start for pane_start in panes if pane_start + window <= end]:
+                del panes[pane_start]
+        self._next_end = max(self._closed_until + slide, min(panes) + slide) if panes else _MAX_TIME
+        return closed
+
+
+def merge_window_results(results: Iterable[WindowResult]) -> list[WindowResult]:
+    """Combine results for the same windows from several consumers.
+
+    Returns:
+        One result per distinct window, ordered by start and end. The inputs
+        are not modified.
+    """
+    merged: dict[tuple[int, int], WindowResult] = {}
+    for result in results:
+        window = (result.start_ms, result.end_ms)
+        target = merged.get(window)
+        if target is None:
+            target = merged[window] = WindowResult(result.start_ms, result.end_ms, {})
+        target.merge(result)
+    return [merged[window] for window in sorted(merged)]
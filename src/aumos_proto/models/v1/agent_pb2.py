@@ -5,10 +5,12 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
+from typing import ClassVar
+
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
 
 
 class AgentType(IntEnum):
@@ -32,8 +34,8 @@ class AgentStatus(IntEnum):
     TERMINATED = 5
 
 
-@dataclass
-class Agent:
+@dataclass(slots=True)
+class Agent(ProtoMessage):
     """Agent represents an autonomous or semi-autonomous AI agent in AumOS."""
 
     id: str = ""
@@ -47,26 +49,16 @@ class Agent:
     owner_id: str = ""
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (
-                v.isoformat() if isinstance(v, datetime)
-                else int(v) if isinstance(v, (AgentType, AgentStatus))
-                else v
-            )
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "Agent":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        if "created_at" in parsed and isinstance(parsed["created_at"], str):
-            parsed["created_at"] = datetime.fromisoformat(parsed["created_at"])
-        if "agent_type" in parsed and isinstance(parsed["agent_type"], int):
-            parsed["agent_type"] = AgentType(parsed["agent_type"])
-        if "status" in parsed and isinstance(parsed["status"], int):
-            parsed["status"] = AgentStatus(parsed["status"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.models.v1.Agent"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "name", FieldKind.STRING),
+        ProtoField(4, "description", FieldKind.STRING),
+        ProtoField(5, "agent_type", FieldKind.ENUM, enum_type=AgentType),
+        ProtoField(6, "privilege_level", FieldKind.INT32),
+        ProtoField(7, "status", FieldKind.ENUM, enum_type=AgentStatus),
+        ProtoField(8, "capabilities", FieldKind.STRING, repeated=True),
+        ProtoField(9, "owner_id", FieldKind.STRING),
+        ProtoField(10, "created_at", FieldKind.TIMESTAMP),
+    )
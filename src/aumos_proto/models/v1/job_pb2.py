@@ -5,11 +5,12 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
-from typing import Any
+from typing import Any, ClassVar
+
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
 
 
 class JobStatus(IntEnum):
@@ -23,8 +24,8 @@ class JobStatus(IntEnum):
     CANCELLED = 5
 
 
-@dataclass
-class Job:
+@dataclass(slots=True)
+class Job(ProtoMessage):
     """Job represents an async task submitted to AumOS for execution."""
 
     id: str = ""
@@ -40,25 +41,18 @@ class Job:
     started_at: datetime | None = None
     completed_at: datetime | None = None
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (
-                v.isoformat() if isinstance(v, datetime)
-                else int(v) if isinstance(v, JobStatus)
-                else v
-            )
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "Job":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        for time_field in ("created_at", "started_at", "completed_at"):
-            if time_field in parsed and isinstance(parsed[time_field], str):
-                parsed[time_field] = datetime.fromisoformat(parsed[time_field])
-        if "status" in parsed and isinstance(parsed["status"], int):
-            parsed["status"] = JobStatus(parsed["status"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.models.v1.Job"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "job_type", FieldKind.STRING),
+        ProtoField(4, "status", FieldKind.ENUM, enum_type=JobStatus),
+        ProtoField(5, "input_params", FieldKind.STRUCT),
+        ProtoField(6, "output", FieldKind.STRUCT),
+        ProtoField(7, "created_by", FieldKind.STRING),
+        ProtoField(8, "progress_percent", FieldKind.FLOAT),
+        ProtoField(9, "error_message", FieldKind.STRING),
+        ProtoField(10, "created_at", FieldKind.TIMESTAMP),
+        ProtoField(11, "started_at", FieldKind.TIMESTAMP),
+        ProtoField(12, "completed_at", FieldKind.TIMESTAMP),
+    )
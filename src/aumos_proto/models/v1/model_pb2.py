@@ -5,11 +5,12 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
-from typing import Any
+from typing import Any, ClassVar
+
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
 
 
 class ModelStatus(IntEnum):
@@ -23,8 +24,8 @@ class ModelStatus(IntEnum):
     ARCHIVED = 5
 
 
-@dataclass
-class Model:
+@dataclass(slots=True)
+class Model(ProtoMessage):
     """Model represents an ML model artifact managed by AumOS."""
 
     id: str = ""
@@ -41,21 +42,19 @@ class Model:
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data = {
-            k: (v.isoformat() if isinstance(v, datetime) else int(v) if isinstance(v, ModelStatus) else v)
-            for k, v in self.__dict__.items()
-        }
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "Model":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        for time_field in ("created_at", "updated_at"):
-            if time_field in parsed and isinstance(parsed[time_field], str):
-                parsed[time_field] = datetime.fromisoformat(parsed[time_field])
-        if "status" in parsed and isinstance(parsed["status"], int):
-            parsed["status"] = ModelStatus(parsed["status"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.models.v1.Model"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "id", FieldKind.STRING),
+        ProtoField(2, "tenant_id", FieldKind.STRING),
+        ProtoField(3, "name", FieldKind.STRING),
+        ProtoField(4, "version", FieldKind.STRING),
+        ProtoField(5, "framework", FieldKind.STRING),
+        ProtoField(6, "status", FieldKind.ENUM, enum_type=ModelStatus),
+        ProtoField(7, "artifact_uri", FieldKind.STRING),
+        ProtoField(8, "metrics", FieldKind.STRUCT),
+        ProtoField(9, "parameters", FieldKind.STRUCT),
+        ProtoField(10, "tags", FieldKind.STRING, repeated=True),
+        ProtoField(11, "created_by", FieldKind.STRING),
+        ProtoField(12, "created_at", FieldKind.TIMESTAMP),
+        ProtoField(13, "updated_at", FieldKind.TIMESTAMP),
+    )
@@ -5,10 +5,12 @@ In production, these will be replaced by actual protoc-generated code.
 """
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
+from typing import ClassVar
+
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
 
 
 class TenantStatus(IntEnum):
@@ -21,8 +23,8 @@ class TenantStatus(IntEnum):
     DECOMMISSIONED = 4
 
 
-@dataclass
-class TenantQuota:
+@dataclass(slots=True)
+class TenantQuota(ProtoMessage):
     """Resource quota assigned to a tenant."""
 
     cpu_cores: int = 0
@@ -31,9 +33,18 @@ class TenantQuota:
     storage_gb: int = 0
     max_models: int = 0
 
+    _proto_name: ClassVar[str] = "aumos.models.v1.TenantQuota"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "cpu_cores", FieldKind.INT32),
+        ProtoField(2, "memory_gb", FieldKind.INT32),
+        ProtoField(3, "gpu_count", FieldKind.INT32),
+        ProtoField(4, "storage_gb", FieldKind.INT32),
+        ProtoField(5, "max_models", FieldKind.INT32),
+    )
+
 
-@dataclass
-class Tenant:
+@dataclass(slots=True)
+class Tenant(ProtoMessage):
     """Tenant represents an isolated organizational unit within AumOS."""
 
     id: str = ""
@@ -46,29 +57,15 @@ class Tenant:
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def SerializeToString(self) -> bytes:
-        """Compatibility method for Protobuf serialization."""
-        data: dict = {}
-        for k, v in self.__dict__.items():
-            if isinstance(v, datetime):
-                data[k] = v.isoformat()
-            elif isinstance(v, TenantStatus):
-                data[k] = int(v)
-            elif isinstance(v, TenantQuota):
-                data[k] = v.__dict__
-            else:
-                data[k] = v
-        return json.dumps(data).encode("utf-8")
-
-    @classmethod
-    def FromString(cls, data: bytes) -> "Tenant":
-        """Compatibility method for Protobuf deserialization."""
-        parsed = json.loads(data.decode("utf-8"))
-        for time_field in ("created_at", "updated_at"):
-            if time_field in parsed and isinstance(parsed[time_field], str):
-                parsed[time_field] = datetime.fromisoformat(parsed[time_field])
-        if "status" in parsed and isinstance(parsed["status"], int):
-            parsed["status"] = TenantStatus(parsed["status"])
-        if "quota" in parsed and isinstance(parsed["quota"], dict):
-            parsed["quota"] = TenantQuota(**parsed["quota"])
-        return cls(**parsed)
+    _proto_name: ClassVar[str] = "aumos.models.v1.Tenant"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "id", FieldKind.STRING),
+        ProtoField(2, "name", FieldKind.STRING),
+        ProtoField(3, "display_name", FieldKind.STRING),
+        ProtoField(4, "status", FieldKind.ENUM, enum_type=TenantStatus),
+        ProtoField(5, "tier", FieldKind.STRING),
+        ProtoField(6, "k8s_namespace", FieldKind.STRING),
+        ProtoField(7, "quota", FieldKind.MESSAGE, message_type=TenantQuota),
+        ProtoField(8, "created_at", FieldKind.TIMESTAMP),
+        ProtoField(9, "updated_at", FieldKind.TIMESTAMP),
+    )
@@ -1,24 +1,73 @@
 """Schema registry integration for aumos-proto.
 
-Provides SchemaRegistryClient for registering Protobuf schemas with
-Confluent Schema Registry and resolving schema IDs at publish time.
+Provides SchemaRegistryClient (and its asyncio counterpart,
+AsyncSchemaRegistryClient) for registering Protobuf schemas with
+Confluent Schema Registry and resolving schema IDs at publish time, and
+FramedDecoder for turning framed consumer records back into event objects.
 
 Wire format: magic byte (0x00) + 4-byte big-endian schema ID + payload bytes.
 This is the standard Confluent Schema Registry framing used by all Confluent clients.
 """
-from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig
+from aumos_proto.registry.async_client import AsyncSchemaRegistryClient
+from aumos_proto.registry.cache import CacheInfo, LruCache, SchemaIdCache
+from aumos_proto.registry.client import (
+    RegisteredSchema,
+    SchemaCompatibilityError,
+    SchemaNotReadyError,
+    SchemaRegistryClient,
+    SchemaRegistryConfig,
+    SchemaRegistryError,
+)
+from aumos_proto.registry.compatibility import (
+    CompatibilityViolation,
+    check_backward_compatibility,
+    check_proto_dirs,
+)
+from aumos_proto.registry.decoder import FramedDecoder, UnknownSchemaError
 from aumos_proto.registry.framing import (
+    HEADER_SIZE,
     MAGIC_BYTE,
+    FramedBatch,
     decode_schema_id,
+    encode_batch_with_schema_id,
+    encode_message_with_schema_id,
     encode_with_schema_id,
     strip_schema_framing,
+    strip_schema_framing_batch,
+    strip_schema_framing_buffer,
+    strip_schema_framing_view,
+    write_schema_header,
 )
+from aumos_proto.registry.metrics import InMemoryMetrics, RegistryObserver
 
 __all__ = [
+    "HEADER_SIZE",
     "MAGIC_BYTE",
+    "AsyncSchemaRegistryClient",
+    "CacheInfo",
+    "CompatibilityViolation",
+    "FramedBatch",
+    "FramedDecoder",
+    "InMemoryMetrics",
+    "LruCache",
+    "RegisteredSchema",
+    "RegistryObserver",
+    "SchemaCompatibilityError",
+    "SchemaIdCache",
+    "SchemaNotReadyError",
     "SchemaRegistryClient",
     "SchemaRegistryConfig",
+    "SchemaRegistryError",
+    "UnknownSchemaError",
+    "check_backward_compatibility",
+    "check_proto_dirs",
     "decode_schema_id",
+    "encode_batch_with_schema_id",
+    "encode_message_with_schema_id",
     "encode_with_schema_id",
     "strip_schema_framing",
+    "strip_schema_framing_batch",
+    "strip_schema_framing_buffer",
+    "strip_schema_framing_view",
+    "write_schema_header",
 ]
@@ -0,0 +1,6 @@
+"""``python -m aumos_proto.registry OLD_PROTO_DIR NEW_PROTO_DIR`` — offline BACKWARD compatibility check."""
+import sys
+
+from aumos_proto.registry.compatibility import main
+
+sys.exit(main())
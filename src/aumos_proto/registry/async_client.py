@@ -0,0 +1,580 @@
+"""Asyncio Confluent Schema Registry client for aumos-proto.
+
+Mirrors :class:`SchemaRegistryClient` for asyncio services. Requests go through
+one pooled ``httpx.AsyncClient``, and a semaphore caps how many are in flight
+at once (``SchemaRegistryConfig.max_concurrent_requests``).
+register_all_aumos_schemas() issues all subject registrations concurrently, so
+startup takes roughly one registry round trip instead of one per subject.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from functools import partial
+from types import TracebackType
+from typing import Any
+
+import httpx
+
+from aumos_proto.registry.cache import (
+    LATEST,
+    CacheInfo,
+    LruCache,
+    PersistentSchemaCache,
+    SchemaIdCache,
+    SchemaVersion,
+    schema_fingerprint,
+)
+from aumos_proto.registry.client import (
+    AUMOS_PROTO_SUBJECTS,
+    RegisteredSchema,
+    SchemaNotReadyError,
+    SchemaRegistryClient,
+    SchemaRegistryConfig,
+    SchemaRegistryError,
+    _checked_sources,
+    _log_late_registration,
+    _minimal_proto_schema,
+    _pool_limits,
+    _proto_payload,
+    _registered_schema,
+    _registry_url,
+    _source_for,
+)
+from aumos_proto.registry.metrics import PERSISTENT_CACHE, SCHEMA_CACHE, SCHEMA_ID_CACHE, RegistryObserver
+from aumos_proto.registry.protos import WELL_KNOWN_PREFIX, ProtoSource, proto_fingerprint
+from aumos_proto.registry.singleflight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AsyncSchemaRegistryClient:
+    """Async REST client for the Confluent Schema Registry.
+
+    Provides the same operations as SchemaRegistryClient as coroutines:
+    - register_schema(), get_schema_id(), get_schema_by_id(), get_subjects_by_schema_id(),
+      set_compatibility(), invalidate_schema_id()
+    - register_all_aumos_schemas(): register all known AumOS subjects concurrently
+
+    Use it as an async context manager or call aclose() to release the pool.
+    sharing_cache_with() builds an async client that shares its schema ID,
+    schema and on-disk caches with an existing sync client. With
+    ``config.schema_cache_path`` set, schemas answered from the on-disk cache
+    are re-registered in background tasks that aclose() waits for; stale
+    ``"latest"`` schema IDs are refreshed the same way.
+    Instrumentation events go to ``observer`` as for the sync client.
+    """
+
+    config: SchemaRegistryConfig = field(default_factory=SchemaRegistryConfig)
+    observer: RegistryObserver = field(default_factory=RegistryObserver, repr=False)
+    _schema_id_cache: SchemaIdCache = field(init=False, repr=False)
+    _http: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    _semaphore: asyncio.Semaphore = field(init=False, repr=False)
+    _schemas_by_id: LruCache[int, RegisteredSchema] = field(init=False, repr=False)
+    _persistent_cache: PersistentSchemaCache | None = field(init=False, repr=False)
+    _background_tasks: set[asyncio.Task[Any]] = field(default_factory=set, init=False, repr=False)
+    _pending_registrations: dict[str, asyncio.Task[int]] = field(default_factory=dict, init=False, repr=False)
+    _schema_id_flights: AsyncSingleFlight[tuple[str, SchemaVersion], int] = field(
+        default_factory=AsyncSingleFlight, init=False, repr=False
+    )
+    _schema_flights: AsyncSingleFlight[int, RegisteredSchema] = field(
+        default_factory=AsyncSingleFlight, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+        self._schema_id_cache = SchemaIdCache(
+            self.config.schema_id_ttl_seconds, self.config.schema_id_max_stale_seconds
+        )
+        self._schemas_by_id = LruCache(self.config.schema_cache_size, on_evict=self._schema_evicted)
+        self._persistent_cache = (
+            PersistentSchemaCache(self.config.schema_cache_path) if self.config.schema_cache_path else None
+        )
+
+    @classmethod
+    def sharing_cache_with(cls, client: SchemaRegistryClient) -> AsyncSchemaRegistryClient:
+        """Create an async client with the same config, observer and caches as ``client``."""
+        async_client = cls(config=client.config, observer=client.observer)
+        async_client._schema_id_cache = client._schema_id_cache
+        async_client._schemas_by_id = client._schemas_by_id
+        async_client._persistent_cache = client._persistent_cache
+        return async_client
+
+    async def __aenter__(self) -> AsyncSchemaRegistryClient:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Wait for background registrations and revalidations, then close the pooled HTTP client."""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        http, self._http = self._http, None
+        if http is not None:
+            await http.aclose()
+
+    def _build_auth(self) -> tuple[str, str] | None:
+        if self.config.username and self.config.password:
+            return (self.config.username, self.config.password)
+        return None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        # No await between the check and the assignment, so no lock is needed.
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                auth=self._build_auth(),
+                timeout=self.config.timeout_seconds,
+                limits=_pool_limits(self.config),
+            )
+        return self._http
+
+    async def _request(self, method: str, endpoint: str, json: Any = None, **path_params: object) -> httpx.Response:
+        """Send a request to ``endpoint`` (a path template) and report its latency to the observer."""
+        url = _registry_url(self.config.url, endpoint, path_params)
+        async with self._semaphore:
+            status: int | None = None
+            started = time.perf_counter()
+            try:
+                response = await self._http_client().request(method, url, json=json)
+                status = response.status_code
+                return response
+            finally:
+                self.observer.request_finished(method, endpoint, status, time.perf_counter() - started)
+
+    def _schema_evicted(self, schema_id: int, schema: RegisteredSchema) -> None:
+        self.observer.cache_eviction(SCHEMA_CACHE)
+
+    async def register_schema(
+        self,
+        subject: str,
+        schema_type: str,
+        schema_definition: str,
+        references: list[dict[str, str]] | None = None,
+    ) -> int:
+        """Register a schema under the given subject name.
+
+        Args:
+            subject:           Schema Registry subject (e.g. "aumos.events.audit-value").
+            schema_type:       "PROTOBUF", "AVRO", or "JSON".
+            schema_definition: The raw schema string (proto file content for PROTOBUF).
+            references:        Optional list of schema references for imported protos.
+
+        Returns:
+            The integer schema ID assigned by the registry.
+
+        Raises:
+            SchemaRegistryError: If the schema is incompatible or the registry is unreachable.
+        """
+        if self.config.cache_schema_ids:
+            cached = self._schema_id_cache.lookup(subject)
+            if cached is not None and not cached.stale:
+                return cached.schema_id
+
+        payload: dict[str, Any] = {
+            "schemaType": schema_type,
+            "schema": schema_definition,
+        }
+        if references:
+            payload["references"] = references
+
+        if self._persistent_cache is None:
+            return await self._post_schema(subject, payload)
+
+        fingerprint = schema_fingerprint(schema_type, schema_definition, references)
+        schema_id = self._persistent_cache.get(subject, fingerprint)
+        if schema_id is None:
+            self.observer.cache_miss(PERSISTENT_CACHE)
+            schema_id = await self._post_schema(subject, payload)
+            self._persistent_cache.put(subject, fingerprint, schema_id)
+            return schema_id
+
+        self.observer.cache_hit(PERSISTENT_CACHE)
+        logger.debug("Schema subject=%s schema_id=%d loaded from %s", subject, schema_id, self._persistent_cache.path)
+        if self.config.cache_schema_ids:
+            self._schema_id_cache[subject] = schema_id
+        self._in_background(self._revalidate(self._persistent_cache, subject, payload, fingerprint))
+        return schema_id
+
+    def _in_background(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        self._track(asyncio.create_task(coroutine))
+
+    def _track(self, task: asyncio.Task[Any]) -> None:
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _post_schema(self, subject: str, payload: dict[str, Any]) -> int:
+        try:
+            response = await self._request("POST", "/subjects/{subject}/versions", json=payload, subject=subject)
+            response.raise_for_status()
+            schema_id: int = response.json()["id"]
+            if self.config.cache_schema_ids:
+                self._schema_id_cache[subject] = schema_id
+            logger.info("Registered schema subject=%s schema_id=%d", subject, schema_id)
+            return schema_id
+        except httpx.HTTPStatusError as error:
+            raise SchemaRegistryError(
+                f"Failed to register schema for subject '{subject}': "
+                f"HTTP {error.response.status_code}"
+            ) from error
+        except httpx.RequestError as error:
+            raise SchemaRegistryError(
+                f"Schema registry unreachable at {self.config.url}: {error}"
+            ) from error
+
+    async def _revalidate(
+        self, persistent_cache: PersistentSchemaCache, subject: str, payload: dict[str, Any], fingerprint: str
+    ) -> None:
+        """Re-register a schema answered from the on-disk cache and record any ID change."""
+        cached_id = persistent_cache.get(subject, fingerprint)
+        try:
+            schema_id = await self._post_schema(subject, payload)
+        except SchemaRegistryError as error:
+            logger.warning("Could not revalidate cached schema subject=%s: %s", subject, error)
+            return
+        if schema_id != cached_id:
+            logger.warning("Cached schema ID for subject=%s was stale: %s -> %d", subject, cached_id, schema_id)
+        persistent_cache.put(subject, fingerprint, schema_id)
+
+    async def get_schema_id(self, subject: str, version: SchemaVersion = LATEST) -> int:
+        """Resolve the schema ID of a subject version.
+
+        With ``config.cache_schema_ids`` set, a cached ID is returned without
+        awaiting the registry. A stale ``"latest"`` entry is refreshed in a
+        background task, so new versions are picked up within about one TTL.
+        Concurrent misses for the same subject version share one request.
+
+        Args:
+            subject: Schema Registry subject name.
+            version: Version number, or "latest".
+
+        Returns:
+            Integer schema ID of that version.
+
+        Raises:
+            SchemaNotReadyError: If the subject's registration is still running in
+                the background after a register_all_aumos_schemas() deadline.
+            SchemaRegistryError: If the subject does not exist or registry is unreachable.
+        """
+        if self.config.cache_schema_ids:
+            cached = self._schema_id_cache.lookup(subject, version)
+            if cached is not None:
+                self.observer.cache_hit(SCHEMA_ID_CACHE)
+                if cached.stale and self._schema_id_cache.claim_refresh(subject, version):
+                    self._in_background(self._refresh_schema_id(subject, version))
+                return cached.schema_id
+            self.observer.cache_miss(SCHEMA_ID_CACHE)
+        if subject in self._pending_registrations:
+            raise SchemaNotReadyError(f"Schema for subject '{subject}' is still being registered")
+        return await self._schema_id_flights.do((subject, version), partial(self._load_schema_id, subject, version))
+
+    async def _load_schema_id(self, subject: str, version: SchemaVersion) -> int:
+        # A flight for this key may have filled the cache since the caller missed it.
+        if self.config.cache_schema_ids:
+            cached = self._schema_id_cache.lookup(subject, version)
+            if cached is not None and not cached.stale:
+                return cached.schema_id
+        return await self._fetch_schema_id(subject, version)
+
+    async def _fetch_schema_id(self, subject: str, version: SchemaVersion) -> int:
+        try:
+            response = await self._request("GET", "/subjects/{subject}/versions/{version}", subject=subject, version=version)
+            response.raise_for_status()
+            schema_id: int = response.json()["id"]
+            if self.config.cache_schema_ids:
+                self._schema_id_cache.store(subject, schema_id, version)
+            return schema_id
+        except httpx.HTTPStatusError as error:
+            raise SchemaRegistryError(
+                f"Failed to get schema ID for subject '{subject}': "
+                f"HTTP {error.response.status_code}"
+            ) from error
+        except httpx.RequestError as error:
+            raise SchemaRegistryError(
+                f"Schema registry unreachable at {self.config.url}: {error}"
+            ) from error
+
+    async def _refresh_schema_id(self, subject: str, version: SchemaVersion) -> None:
+        try:
+            await self._schema_id_flights.do((subject, version), partial(self._fetch_schema_id, subject, version))
+        except SchemaRegistryError as error:
+            logger.warning("Could not refresh schema ID for subject=%s — serving cached ID: %s", subject, error)
+        finally:
+            # A successful store() has already dropped the claim; any other outcome must give it back.
+            self._schema_id_cache.release_refresh(subject, version)
+
+    def invalidate_schema_id(self, subject: str | None = None, version: SchemaVersion | None = None) -> int:
+        """Drop cached schema IDs so the next lookup asks the registry.
+
+        Args:
+            subject: Subject to drop; None drops every subject.
+            version: Version to drop; None drops all cached versions of the subject(s).
+
+        Returns:
+            The number of cache entries removed.
+        """
+        return self._schema_id_cache.invalidate(subject, version)
+
+    async def get_schema_by_id(self, schema_id: int) -> RegisteredSchema:
+        """Fetch the schema registered under a global schema ID.
+
+        Results are cached in an LRU bounded by ``config.schema_cache_size``.
+        Concurrent misses for the same ID share one registry request.
+
+        Args:
+            schema_id: Schema ID read from a framed message header.
+
+        Returns:
+            The registered schema.
+
+        Raises:
+            SchemaRegistryError: If the ID is unknown or the registry is unreachable.
+        """
+        cached = self._schemas_by_id.get(schema_id)
+        if cached is not None:
+            self.observer.cache_hit(SCHEMA_CACHE)
+            return cached
+        self.observer.cache_miss(SCHEMA_CACHE)
+        return await self._schema_flights.do(schema_id, partial(self._fetch_schema, schema_id))
+
+    async def _fetch_schema(self, schema_id: int) -> RegisteredSchema:
+        try:
+            response = await self._request("GET", "/schemas/ids/{schema_id}", schema_id=schema_id)
+            response.raise_for_status()
+            schema = _registered_schema(schema_id, response.json())
+            self._schemas_by_id.put(schema_id, schema)
+            return schema
+        except httpx.HTTPStatusError as error:
+            raise SchemaRegistryError(
+                f"Failed to fetch schema ID {schema_id}: "
+                f"HTTP {error.response.status_code}"
+            ) from error
+        except httpx.RequestError as error:
+            raise SchemaRegistryError(
+                f"Schema registry unreachable at {self.config.url}: {error}"
+            ) from error
+
+    def schema_cache_info(self) -> CacheInfo:
+        """Return hit/miss counters and size of the get_schema_by_id() cache."""
+        return self._schemas_by_id.cache_info()
+
+    async def get_subjects_by_schema_id(self, schema_id: int) -> list[str]:
+        """List the subjects under which a schema ID is registered.
+
+        Args:
+            schema_id: Schema ID read from a framed message header.
+
+        Returns:
+            Subject names using this schema (one ID can back several subjects).
+
+        Raises:
+            SchemaRegistryError: If the ID is unknown or the registry is unreachable.
+        """
+        try:
+            response = await self._request("GET", "/schemas/ids/{schema_id}/versions", schema_id=schema_id)
+            response.raise_for_status()
+            return [entry["subject"] for entry in response.json()]
+        except httpx.HTTPStatusError as error:
+            raise SchemaRegistryError(
+                f"Failed to look up subjects for schema ID {schema_id}: "
+                f"HTTP {error.response.status_code}"
+            ) from error
+        except httpx.RequestError as error:
+            raise SchemaRegistryError(
+                f"Schema registry unreachable at {self.config.url}: {error}"
+            ) from error
+
+    async def set_compatibility(self, subject: str, mode: str) -> None:
+        """Set the compatibility mode for a subject.
+
+        Args:
+            subject: The schema registry subject name.
+            mode:    Compatibility mode — "BACKWARD", "FORWARD", "FULL", or
+                     their _TRANSITIVE variants, or "NONE".
+        """
+        try:
+            response = await self._request("PUT", "/config/{subject}", json={"compatibility": mode}, subject=subject)
+            response.raise_for_status()
+            logger.info("Set compatibility mode subject=%s mode=%s", subject, mode)
+        except httpx.HTTPStatusError as error:
+            raise SchemaRegistryError(
+                f"Failed to set compatibility for '{subject}': "
+                f"HTTP {error.response.status_code}"
+            ) from error
+
+    async def register_all_aumos_schemas(self, deadline_seconds: float | None = None) -> dict[str, int]:
+        """Register all known AumOS Protobuf event schemas concurrently.
+
+        At most ``config.max_concurrent_requests`` registrations are in flight
+        at once. As with the sync client, failures are logged as warnings so
+        that a temporarily unavailable registry does not block service startup,
+        ``.proto`` files are read from ``config.proto_descriptor_dir`` when set,
+        unchanged subjects are skipped via ``config.schema_cache_path``, and
+        ``config.compatibility_baseline_dir`` gates registration on an offline
+        BACKWARD compatibility check.
+
+        With ``deadline_seconds``, the call returns once the deadline passes.
+        Subjects not yet registered by then continue in background tasks, and
+        get_schema_id() raises SchemaNotReadyError for them until they finish.
+
+        Args:
+            deadline_seconds: Total time budget for startup registration. None
+                              waits for every subject.
+
+        Returns:
+            Dict mapping subject_name to schema_id for all successfully registered schemas
+            (within the deadline, when one is given).
+
+        Raises:
+            SchemaCompatibilityError: If the local schemas break compatibility with
+                                      the baseline; nothing is registered.
+        """
+        started = time.perf_counter()
+        sources = self._proto_sources()
+        references: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        tasks: dict[asyncio.Task[int], str] = {}
+        for subject, message_fqn in AUMOS_PROTO_SUBJECTS:
+            task = asyncio.create_task(
+                self.register_schema(
+                    subject=subject,
+                    schema_type="PROTOBUF",
+                    schema_definition=_minimal_proto_schema(message_fqn),
+                )
+                if sources is None
+                else self._register_proto_subject(subject, message_fqn, sources, references)
+            )
+            if deadline_seconds is not None:
+                # Without a deadline the caller waits for every subject, so nothing is ever "not ready".
+                self._pending_registrations[subject] = task
+                task.add_done_callback(partial(self._registration_finished, subject))
+            tasks[task] = subject
+
+        done, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+
+        schema_ids: dict[str, int] = {}
+        for task, subject in tasks.items():
+            if task not in done:
+                continue
+            error = task.exception()
+            if isinstance(error, SchemaRegistryError):
+                logger.warning("Failed to register schema for subject=%s — continuing", subject)
+            elif error is not None:
+                raise error
+            else:
+                schema_ids[subject] = task.result()
+        for task in pending:
+            self._track(task)
+            task.add_done_callback(partial(_log_late_registration, tasks[task]))
+        if pending:
+            logger.warning(
+                "Schema registration deadline of %.1fs reached — %d subjects continue in the background",
+                deadline_seconds,
+                len(pending),
+            )
+
+        logger.info(
+            "Schema registration complete: %d/%d subjects registered",
+            len(schema_ids),
+            len(AUMOS_PROTO_SUBJECTS),
+        )
+        self.observer.registration_finished(len(schema_ids), len(AUMOS_PROTO_SUBJECTS), time.perf_counter() - started)
+        return schema_ids
+
+    def _registration_finished(self, subject: str, task: asyncio.Task[int]) -> None:
+        self._pending_registrations.pop(subject, None)
+
+    def pending_registrations(self) -> frozenset[str]:
+        """Subjects whose registration is still running in the background."""
+        return frozenset(self._pending_registrations)
+
+    def _proto_sources(self) -> dict[str, ProtoSource] | None:
+        if self.config.proto_descriptor_dir is None:
+            logger.warning("proto_descriptor_dir is not set — registering placeholder schemas")
+            return None
+        return _checked_sources(self.config.proto_descriptor_dir, self.config.compatibility_baseline_dir)
+
+    async def _register_proto_subject(
+        self,
+        subject: str,
+        message_fqn: str,
+        sources: dict[str, ProtoSource],
+        references: dict[str, asyncio.Task[dict[str, Any]]],
+    ) -> int:
+        if self.config.cache_schema_ids:
+            cached = self._schema_id_cache.lookup(subject)
+            if cached is not None and not cached.stale:
+                return cached.schema_id
+
+        source = _source_for(sources, message_fqn, self.config.proto_descriptor_dir)
+        fingerprint = proto_fingerprint(sources, source.path, message_fqn)
+        if self._persistent_cache is not None:
+            schema_id = self._persistent_cache.get(subject, fingerprint)
+            if schema_id is not None:
+                self.observer.cache_hit(PERSISTENT_CACHE)
+                logger.debug("Schema subject=%s unchanged since last registration — skipped", subject)
+                if self.config.cache_schema_ids:
+                    self._schema_id_cache[subject] = schema_id
+                return schema_id
+            self.observer.cache_miss(PERSISTENT_CACHE)
+
+        payload = _proto_payload(source, await self._proto_references(source, sources, references), message_fqn)
+        schema_id = await self._post_schema(subject, payload)
+        if self._persistent_cache is not None:
+            self._persistent_cache.put(subject, fingerprint, schema_id)
+        return schema_id
+
+    async def _proto_references(
+        self,
+        source: ProtoSource,
+        sources: dict[str, ProtoSource],
+        references: dict[str, asyncio.Task[dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        """Register the local imports of ``source`` and return them as schema references.
+
+        ``references`` holds one task per import, so subjects registering
+        concurrently share a single registration of each dependency.
+        """
+        resolved: list[dict[str, Any]] = []
+        for imported in source.imports:
+            if imported in sources:
+                if imported not in references:
+                    references[imported] = asyncio.create_task(
+                        self._register_dependency(sources[imported], sources, references)
+                    )
+                resolved.append(await references[imported])
+            elif not imported.startswith(WELL_KNOWN_PREFIX):
+                raise SchemaRegistryError(
+                    f"Import '{imported}' of {source.path} not found under {self.config.proto_descriptor_dir}"
+                )
+        return resolved
+
+    async def _register_dependency(
+        self,
+        dependency: ProtoSource,
+        sources: dict[str, ProtoSource],
+        references: dict[str, asyncio.Task[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        payload = _proto_payload(dependency, await self._proto_references(dependency, sources, references))
+        await self._post_schema(dependency.path, payload)
+        try:
+            response = await self._request("POST", "/subjects/{subject}", json=payload, subject=dependency.path)
+            response.raise_for_status()
+            return {"name": dependency.path, "subject": dependency.path, "version": response.json()["version"]}
+        except httpx.HTTPStatusError as error:
+            raise SchemaRegistryError(
+                f"Failed to look up schema version for subject '{dependency.path}': "
+                f"HTTP {error.response.status_code}"
+            ) from error
+        except httpx.RequestError as error:
+            raise SchemaRegistryError(
+                f"Schema registry unreachable at {self.config.url}: {error}"
+            ) from error
@@ -0,0 +1,308 @@
+"""Caches used by the schema registry clients.
+
+Registry lookups sit on every consumer's decode path, so their results are
+kept in memory. :class:`LruCache` bounds memory for keys with unbounded
+cardinality, such as schema IDs seen on the wire, and counts hits and misses
+so the hit rate can be exported as a metric.
+
+:class:`SchemaIdCache` maps ``(subject, version)`` to schema IDs. Entries for
+``"latest"`` go stale after a TTL, so clients can serve the cached ID while
+refreshing it in the background. Numbered versions never change in the
+registry and never expire.
+
+:class:`PersistentSchemaCache` keeps registered schema IDs in a JSON file,
+keyed by subject and schema fingerprint, so a restarted or newly scaled
+replica can resolve its subjects without a registry round trip.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator, Mapping, MutableMapping, Sequence
+from pathlib import Path
+from typing import Any, Generic, Literal, NamedTuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+LATEST: Literal["latest"] = "latest"
+SchemaVersion = int | Literal["latest"]
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics, shaped like ``functools.lru_cache``'s ``cache_info()``."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LruCache(Generic[K, V]):
+    """Thread-safe bounded mapping that evicts the least recently used entry.
+
+    Args:
+        maxsize:  Maximum number of entries kept.
+        on_evict: Called with the key and value of each entry evicted to make room.
+
+    Raises:
+        ValueError: If ``maxsize`` is not positive.
+    """
+
+    def __init__(self, maxsize: int, on_evict: Callable[[K, V], None] | None = None) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self._maxsize = maxsize
+        self._on_evict = on_evict
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for ``key`` (marking it most recently used), or None."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        """Insert or replace ``key``, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) <= self._maxsize:
+                return
+            evicted = self._entries.popitem(last=False)
+        if self._on_evict is not None:
+            self._on_evict(*evicted)
+
+    def pop(self, key: K) -> V | None:
+        """Remove ``key`` and return its value, or None if it was not cached."""
+        with self._lock:
+            return self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+
+class CachedSchemaId(NamedTuple):
+    """A schema ID served from :class:`SchemaIdCache`, flagged when it is due a refresh."""
+
+    schema_id: int
+    stale: bool
+
+
+class SchemaIdCache(MutableMapping[str, int]):
+    """Thread-safe ``(subject, version) -> schema ID`` cache with TTL and stale-while-revalidate.
+
+    A ``"latest"`` entry is fresh for ``ttl_seconds`` after it was stored. After
+    that :meth:`lookup` still returns it, flagged ``stale``, so callers can
+    answer immediately and refresh in the background. Once it is older than
+    ``ttl_seconds + max_stale_seconds`` it is treated as missing. Numbered
+    versions are immutable in the registry and never go stale.
+
+    As a mapping, the cache reads and writes the ``"latest"`` entry of each
+    subject, regardless of age.
+
+    Args:
+        ttl_seconds:       How long a ``"latest"`` entry is served without refresh.
+        max_stale_seconds: How long past its TTL an entry may still be served
+                           while it is refreshed. None serves it indefinitely.
+        clock:             Monotonic time source, in seconds.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_stale_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_stale = max_stale_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (subject, version) -> (schema_id, stored_at)
+        self._entries: dict[tuple[str, SchemaVersion], tuple[int, float]] = {}
+        self._refreshing: set[tuple[str, SchemaVersion]] = set()
+
+    def __getitem__(self, subject: str) -> int:
+        return self._entries[(subject, LATEST)][0]
+
+    def __setitem__(self, subject: str, schema_id: int) -> None:
+        self.store(subject, schema_id)
+
+    def __delitem__(self, subject: str) -> None:
+        with self._lock:
+            del self._entries[(subject, LATEST)]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([subject for subject, version in list(self._entries) if version == LATEST])
+
+    def __len__(self) -> int:
+        return sum(1 for _, version in list(self._entries) if version == LATEST)
+
+    def lookup(self, subject: str, version: SchemaVersion = LATEST) -> CachedSchemaId | None:
+        """Return the cached ID for ``(subject, version)``, or None on a miss or expiry."""
+        entry = self._entries.get((subject, version))
+        if entry is None:
+            return None
+        schema_id, stored_at = entry
+        if version != LATEST:
+            return CachedSchemaId(schema_id, stale=False)
+        age = self._clock() - stored_at
+        if age <= self._ttl:
+            return CachedSchemaId(schema_id, stale=False)
+        if self._max_stale is not None and age > self._ttl + self._max_stale:
+            return None
+        return CachedSchemaId(schema_id, stale=True)
+
+    def store(self, subject: str, schema_id: int, version: SchemaVersion = LATEST) -> None:
+        """Cache ``schema_id`` for ``(subject, version)``, fresh from now."""
+        with self._lock:
+            self._entries[(subject, version)] = (schema_id, self._clock())
+            self._refreshing.discard((subject, version))
+
+    def invalidate(self, subject: str | None = None, version: SchemaVersion | None = None) -> int:
+        """Drop cached IDs so the next lookup goes to the registry.
+
+        Args:
+            subject: Subject to drop; None drops every subject.
+            version: Version to drop within the subject(s); None drops all versions.
+
+        Returns:
+            The number of entries removed.
+        """
+        with self._lock:
+            doomed = [
+                key for key in self._entries
+                if (subject is None or key[0] == subject) and (version is None or key[1] == version)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def claim_refresh(self, subject: str, version: SchemaVersion = LATEST) -> bool:
+        """Return True if the caller should refresh ``(subject, version)``; False if a refresh is in flight."""
+        with self._lock:
+            if (subject, version) in self._refreshing:
+                return False
+            self._refreshing.add((subject, version))
+            return True
+
+    def release_refresh(self, subject: str, version: SchemaVersion = LATEST) -> None:
+        """Give up a claimed refresh without storing a new ID, e.g. after a registry error."""
+        with self._lock:
+            self._refreshing.discard((subject, version))
+
+
+def schema_fingerprint(
+    schema_type: str,
+    schema_definition: str,
+    references: Sequence[Mapping[str, Any]] | None = None,
+) -> str:
+    """Return a stable SHA-256 hex digest of a registration request."""
+    canonical = json.dumps(
+        {"schemaType": schema_type, "schema": schema_definition, "references": list(references or ())},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class PersistentSchemaCache:
+    """Schema IDs of registered schemas, persisted to a JSON file.
+
+    Entries are keyed by subject and :func:`schema_fingerprint`, so an entry
+    is only reused when the exact same schema is registered again. The file is
+    rewritten atomically whenever an entry changes. A missing or unreadable
+    file starts an empty cache instead of failing startup.
+
+    Args:
+        path: Location of the cache file. Parent directories are created on first write.
+    """
+
+    _FORMAT_VERSION = 1
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = self._load()
+
+    @property
+    def path(self) -> Path:
+        """Location of the cache file."""
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, subject: str, fingerprint: str) -> int | None:
+        """Return the cached schema ID for ``subject`` if its fingerprint matches."""
+        entry = self._entries.get(subject)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        schema_id: int = entry["schema_id"]
+        return schema_id
+
+    def put(self, subject: str, fingerprint: str, schema_id: int) -> None:
+        """Record ``schema_id`` for ``subject`` and rewrite the file if the entry changed."""
+        entry = {"fingerprint": fingerprint, "schema_id": schema_id}
+        with self._lock:
+            if self._entries.get(subject) == entry:
+                return
+            self._entries[subject] = entry
+            self._save()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            document = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            logger.warning("Ignoring unreadable schema cache file %s: %s", self._path, error)
+            return {}
+        if not isinstance(document, dict) or document.get("version") != self._FORMAT_VERSION:
+            logger.warning("Ignoring schema cache file %s with unknown format", self._path)
+            return {}
+        entries: dict[str, dict[str, Any]] = document.get("entries", {})
+        return entries
+
+    def _save(self) -> None:
+        document = {"version": self._FORMAT_VERSION, "entries": self._entries}
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial file.
+            fd, tmp_path = tempfile.mkstemp(dir=self._path.parent, prefix=f".{self._path.name}.")
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(document, tmp_file, sort_keys=True, indent=1)
+            os.replace(tmp_path, self._path)
+        except OSError as error:
+            logger.warning("Could not write schema cache file %s: %s", self._path, error)
@@ -9,15 +9,46 @@ messages. This means:
   - New optional fields may be added freely.
   - Existing fields may not be removed or renamed.
   - Field types may not change.
+
+These rules are checked offline by :mod:`aumos_proto.registry.compatibility`,
+optionally before registration (``SchemaRegistryConfig.compatibility_baseline_dir``).
 """
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import partial
+from types import TracebackType
+from typing import Any, Optional
+from urllib.parse import quote
 
 import httpx
 
+from aumos_proto.registry.cache import (
+    LATEST,
+    CacheInfo,
+    LruCache,
+    PersistentSchemaCache,
+    SchemaIdCache,
+    SchemaVersion,
+    schema_fingerprint,
+)
+from aumos_proto.registry.compatibility import CompatibilityViolation, check_backward_compatibility
+from aumos_proto.registry.metrics import PERSISTENT_CACHE, SCHEMA_CACHE, SCHEMA_ID_CACHE, RegistryObserver
+from aumos_proto.registry.protos import (
+    WELL_KNOWN_PREFIX,
+    ProtoSource,
+    find_message_source,
+    load_proto_sources,
+    message_schema,
+    proto_fingerprint,
+)
+from aumos_proto.registry.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 # All known AumOS event proto subjects registered with the schema registry.
@@ -53,6 +84,33 @@ class SchemaRegistryConfig:
     timeout_seconds: float = 10.0
     proto_descriptor_dir: Optional[str] = None
     cache_schema_ids: bool = True
+    # Cached "latest" schema IDs are refreshed in the background once older than
+    # the TTL, and dropped when older than TTL + max stale (None: never dropped).
+    schema_id_ttl_seconds: float = 300.0
+    schema_id_max_stale_seconds: Optional[float] = None
+    # Connection pool of the long-lived HTTP client shared by all requests.
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    keepalive_expiry_seconds: float = 30.0
+    # Upper bound on in-flight requests from AsyncSchemaRegistryClient.
+    max_concurrent_requests: int = 8
+    # Maximum number of schemas kept by get_schema_by_id().
+    schema_cache_size: int = 1024
+    # JSON file persisting registered schema IDs across restarts; None disables it.
+    schema_cache_path: Optional[str] = None
+    # Published proto tree that proto_descriptor_dir is checked against, offline,
+    # before register_all_aumos_schemas() registers anything; None skips the check.
+    compatibility_baseline_dir: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RegisteredSchema:
+    """A schema as stored in the registry under a global schema ID."""
+
+    schema_id: int
+    schema_type: str
+    schema: str
+    references: tuple[dict[str, Any], ...] = ()
 
 
 @dataclass
@@ -62,17 +120,109 @@ class SchemaRegistryClient:
     Provides:
     - register_schema(): register a Protobuf schema under a subject name
     - get_schema_id():   resolve the integer ID for a registered schema
+    - invalidate_schema_id(): drop cached schema IDs
+    - get_schema_by_id(): fetch the schema behind an ID, through a bounded LRU cache
+    - get_subjects_by_schema_id(): map a schema ID back to its subjects
     - register_all_aumos_schemas(): bulk-register all known AumOS event schemas
+
+    Requests share one pooled keep-alive ``httpx.Client``, opened on first use,
+    so consecutive calls reuse TCP/TLS connections. Call close() or use the
+    client as a context manager to release the pool; a closed client reopens
+    it on the next request.
+
+    Schema IDs resolved for a subject's latest version are served from cache;
+    once older than ``config.schema_id_ttl_seconds`` they are still returned
+    immediately while a background thread fetches the current ID.
+
+    With ``config.schema_cache_path`` set, register_schema() answers from the
+    on-disk cache when the same schema was registered before, and re-registers
+    it on a background thread to pick up any ID change.
+
+    The client is safe to share between threads. Concurrent cache misses for
+    the same subject version or schema ID share one in-flight request.
+
+    Request latencies, cache hits, misses and evictions, and startup
+    registration time are reported to ``observer``; see :mod:`.metrics`.
     """
 
     config: SchemaRegistryConfig = field(default_factory=SchemaRegistryConfig)
-    _schema_id_cache: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    observer: RegistryObserver = field(default_factory=RegistryObserver, repr=False)
+    _schema_id_cache: SchemaIdCache = field(init=False, repr=False)
+    _http: Optional[httpx.Client] = field(default=None, init=False, repr=False)
+    _http_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _schemas_by_id: LruCache[int, RegisteredSchema] = field(init=False, repr=False)
+    _persistent_cache: Optional[PersistentSchemaCache] = field(init=False, repr=False)
+    _background: Optional[ThreadPoolExecutor] = field(default=None, init=False, repr=False)
+    _pending_registrations: dict[str, Future[int]] = field(default_factory=dict, init=False, repr=False)
+    _schema_id_flights: SingleFlight[tuple[str, SchemaVersion], int] = field(
+        default_factory=SingleFlight, init=False, repr=False
+    )
+    _schema_flights: SingleFlight[int, RegisteredSchema] = field(default_factory=SingleFlight, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._schema_id_cache = SchemaIdCache(
+            self.config.schema_id_ttl_seconds, self.config.schema_id_max_stale_seconds
+        )
+        self._schemas_by_id = LruCache(self.config.schema_cache_size, on_evict=self._schema_evicted)
+        self._persistent_cache = (
+            PersistentSchemaCache(self.config.schema_cache_path) if self.config.schema_cache_path else None
+        )
+
+    def __enter__(self) -> SchemaRegistryClient:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for background registrations and revalidations, then close the pooled HTTP client."""
+        with self._http_lock:
+            background, self._background = self._background, None
+        if background is not None:
+            background.shutdown(wait=True)
+        with self._http_lock:
+            http, self._http = self._http, None
+        if http is not None:
+            http.close()
 
     def _build_auth(self) -> Optional[tuple[str, str]]:
         if self.config.username and self.config.password:
             return (self.config.username, self.config.password)
         return None
 
+    def _http_client(self) -> httpx.Client:
+        http = self._http
+        if http is None:
+            with self._http_lock:
+                http = self._http
+                if http is None:
+                    http = self._http = httpx.Client(
+                        auth=self._build_auth(),
+                        timeout=self.config.timeout_seconds,
+                        limits=_pool_limits(self.config),
+                    )
+        return http
+
+    def _request(self, method: str, endpoint: str, json: Any = None, **path_params: object) -> httpx.Response:
+        """Send a request to ``endpoint`` (a path template) and report its latency to the observer."""
+        url = _registry_url(self.config.url, endpoint, path_params)
+        status: Optional[int] = None
+        started = time.perf_counter()
+        try:
+            response = self._http_client().request(method, url, json=json)
+            status = response.status_code
+            return response
+        finally:
+            self.observer.request_finished(method, endpoint, status, time.perf_counter() - started)
+
+    def _schema_evicted(self, schema_id: int, schema: RegisteredSchema) -> None:
+        self.observer.cache_eviction(SCHEMA_CACHE)
+
     def register_schema(
         self,
         subject: str,
@@ -94,8 +244,10 @@ class SchemaRegistryClient:
         Raises:
             SchemaRegistryError: If the schema is incompatible or the registry is unreachable.
         """
-        if subject in self._schema_id_cache and self.config.cache_schema_ids:
-            return self._schema_id_cache[subject]
+        if self.config.cache_schema_ids:
+            cached = self._schema_id_cache.lookup(subject)
+            if cached is not None and not cached.stale:
+                return cached.schema_id
 
         payload: dict = {
             "schemaType": schema_type,
@@ -104,12 +256,27 @@ class SchemaRegistryClient:
         if references:
             payload["references"] = references
 
-        url = f"{self.config.url}/subjects/{subject}/versions"
-        auth = self._build_auth()
+        if self._persistent_cache is None:
+            return self._post_schema(subject, payload)
 
+        fingerprint = schema_fingerprint(schema_type, schema_definition, references)
+        schema_id = self._persistent_cache.get(subject, fingerprint)
+        if schema_id is None:
+            self.observer.cache_miss(PERSISTENT_CACHE)
+            schema_id = self._post_schema(subject, payload)
+            self._persistent_cache.put(subject, fingerprint, schema_id)
+            return schema_id
+
+        self.observer.cache_hit(PERSISTENT_CACHE)
+        logger.debug("Schema subject=%s schema_id=%d loaded from %s", subject, schema_id, self._persistent_cache.path)
+        if self.config.cache_schema_ids:
+            self._schema_id_cache[subject] = schema_id
+        self._background_executor().submit(self._revalidate, self._persistent_cache, subject, payload, fingerprint)
+        return schema_id
+
+    def _post_schema(self, subject: str, payload: dict[str, Any]) -> int:
         try:
-            with httpx.Client(timeout=self.config.timeout_seconds) as client:
-                response = client.post(url, json=payload, auth=auth)
+            response = self._request("POST", "/subjects/{subject}/versions", json=payload, subject=subject)
             response.raise_for_status()
             schema_id: int = response.json()["id"]
             if self.config.cache_schema_ids:
@@ -126,31 +293,76 @@ class SchemaRegistryClient:
                 f"Schema registry unreachable at {self.config.url}: {error}"
             ) from error
 
-    def get_schema_id(self, subject: str) -> int:
-        """Resolve the latest schema ID for a given subject.
+    def _background_executor(self) -> ThreadPoolExecutor:
+        with self._http_lock:
+            if self._background is None:
+                self._background = ThreadPoolExecutor(
+                    max_workers=self.config.max_concurrent_requests, thread_name_prefix="schema-registry"
+                )
+            return self._background
+
+    def _revalidate(
+        self, persistent_cache: PersistentSchemaCache, subject: str, payload: dict[str, Any], fingerprint: str
+    ) -> None:
+        """Re-register a schema answered from the on-disk cache and record any ID change."""
+        cached_id = persistent_cache.get(subject, fingerprint)
+        try:
+            schema_id = self._post_schema(subject, payload)
+        except SchemaRegistryError as error:
+            logger.warning("Could not revalidate cached schema subject=%s: %s", subject, error)
+            return
+        if schema_id != cached_id:
+            logger.warning("Cached schema ID for subject=%s was stale: %s -> %d", subject, cached_id, schema_id)
+        persistent_cache.put(subject, fingerprint, schema_id)
+
+    def get_schema_id(self, subject: str, version: SchemaVersion = LATEST) -> int:
+        """Resolve the schema ID of a subject version.
+
+        With ``config.cache_schema_ids`` set, a cached ID is returned without
+        blocking on the registry. A stale ``"latest"`` entry is refreshed in the
+        background, so new versions are picked up within about one TTL. Threads
+        that miss the cache for the same subject version at the same time wait
+        on a single registry request.
 
         Args:
             subject: Schema Registry subject name.
+            version: Version number, or "latest".
 
         Returns:
-            Integer schema ID of the latest version.
+            Integer schema ID of that version.
 
         Raises:
+            SchemaNotReadyError: If the subject's registration is still running in
+                the background after a register_all_aumos_schemas() deadline.
             SchemaRegistryError: If the subject does not exist or registry is unreachable.
         """
-        if subject in self._schema_id_cache:
-            return self._schema_id_cache[subject]
-
-        url = f"{self.config.url}/subjects/{subject}/versions/latest"
-        auth = self._build_auth()
-
+        if self.config.cache_schema_ids:
+            cached = self._schema_id_cache.lookup(subject, version)
+            if cached is not None:
+                self.observer.cache_hit(SCHEMA_ID_CACHE)
+                if cached.stale and self._schema_id_cache.claim_refresh(subject, version):
+                    self._background_executor().submit(self._refresh_schema_id, subject, version)
+                return cached.schema_id
+            self.observer.cache_miss(SCHEMA_ID_CACHE)
+        if subject in self._pending_registrations:
+            raise SchemaNotReadyError(f"Schema for subject '{subject}' is still being registered")
+        return self._schema_id_flights.do((subject, version), partial(self._load_schema_id, subject, version))
+
+    def _load_schema_id(self, subject: str, version: SchemaVersion) -> int:
+        # A flight for this key may have filled the cache since the caller missed it.
+        if self.config.cache_schema_ids:
+            cached = self._schema_id_cache.lookup(subject, version)
+            if cached is not None and not cached.stale:
+                return cached.schema_id
+        return self._fetch_schema_id(subject, version)
+
+    def _fetch_schema_id(self, subject: str, version: SchemaVersion) -> int:
         try:
-            with httpx.Client(timeout=self.config.timeout_seconds) as client:
-                response = client.get(url, auth=auth)
+            response = self._request("GET", "/subjects/{subject}/versions/{version}", subject=subject, version=version)
             response.raise_for_status()
             schema_id: int = response.json()["id"]
             if self.config.cache_schema_ids:
-                self._schema_id_cache[subject] = schema_id
+                self._schema_id_cache.store(subject, schema_id, version)
             return schema_id
         except httpx.HTTPStatusError as error:
             raise SchemaRegistryError(
@@ -162,6 +374,97 @@ class SchemaRegistryClient:
                 f"Schema registry unreachable at {self.config.url}: {error}"
             ) from error
 
+    def _refresh_schema_id(self, subject: str, version: SchemaVersion) -> None:
+        try:
+            self._schema_id_flights.do((subject, version), partial(self._fetch_schema_id, subject, version))
+        except SchemaRegistryError as error:
+            logger.warning("Could not refresh schema ID for subject=%s — serving cached ID: %s", subject, error)
+        finally:
+            # A successful store() has already dropped the claim; any other outcome must give it back.
+            self._schema_id_cache.release_refresh(subject, version)
+
+    def invalidate_schema_id(self, subject: Optional[str] = None, version: Optional[SchemaVersion] = None) -> int:
+        """Drop cached schema IDs so the next lookup asks the registry.
+
+        Args:
+            subject: Subject to drop; None drops every subject.
+            version: Version to drop; None drops all cached versions of the subject(s).
+
+        Returns:
+            The number of cache entries removed.
+        """
+        return self._schema_id_cache.invalidate(subject, version)
+
+    def get_schema_by_id(self, schema_id: int) -> RegisteredSchema:
+        """Fetch the schema registered under a global schema ID.
+
+        Schemas behind an ID never change, so results are cached without expiry
+        in an LRU bounded by ``config.schema_cache_size``; see schema_cache_info().
+        Concurrent misses for the same ID share one registry request.
+
+        Args:
+            schema_id: Schema ID read from a framed message header.
+
+        Returns:
+            The registered schema.
+
+        Raises:
+            SchemaRegistryError: If the ID is unknown or the registry is unreachable.
+        """
+        cached = self._schemas_by_id.get(schema_id)
+        if cached is not None:
+            self.observer.cache_hit(SCHEMA_CACHE)
+            return cached
+        self.observer.cache_miss(SCHEMA_CACHE)
+        return self._schema_flights.do(schema_id, partial(self._fetch_schema, schema_id))
+
+    def _fetch_schema(self, schema_id: int) -> RegisteredSchema:
+        try:
+            response = self._request("GET", "/schemas/ids/{schema_id}", schema_id=schema_id)
+            response.raise_for_status()
+            schema = _registered_schema(schema_id, response.json())
+            self._schemas_by_id.put(schema_id, schema)
+            return schema
+        except httpx.HTTPStatusError as error:
+            raise SchemaRegistryError(
+                f"Failed to fetch schema ID {schema_id}: "
+                f"HTTP {error.response.status_code}"
+            ) from error
+        except httpx.RequestError as error:
+            raise SchemaRegistryError(
+                f"Schema registry unreachable at {self.config.url}: {error}"
+            ) from error
+
+    def schema_cache_info(self) -> CacheInfo:
+        """Return hit/miss counters and size of the get_schema_by_id() cache."""
+        return self._schemas_by_id.cache_info()
+
+    def get_subjects_by_schema_id(self, schema_id: int) -> list[str]:
+        """List the subjects under which a schema ID is registered.
+
+        Args:
+            schema_id: Schema ID read from a framed message header.
+
+        Returns:
+            Subject names using this schema (one ID can back several subjects).
+
+        Raises:
+            SchemaRegistryError: If the ID is unknown or the registry is unreachable.
+        """
+        try:
+            response = self._request("GET", "/schemas/ids/{schema_id}/versions", schema_id=schema_id)
+            response.raise_for_status()
+            return [entry["subject"] for entry in response.json()]
+        except httpx.HTTPStatusError as error:
+            raise SchemaRegistryError(
+                f"Failed to look up subjects for schema ID {schema_id}: "
+                f"HTTP {error.response.status_code}"
+            ) from error
+        except httpx.RequestError as error:
+            raise SchemaRegistryError(
+                f"Schema registry unreachable at {self.config.url}: {error}"
+            ) from error
+
     def set_compatibility(self, subject: str, mode: str) -> None:
         """Set the compatibility mode for a subject.
 
@@ -170,12 +473,8 @@ class SchemaRegistryClient:
             mode:    Compatibility mode — "BACKWARD", "FORWARD", "FULL", or
                      their _TRANSITIVE variants, or "NONE".
         """
-        url = f"{self.config.url}/config/{subject}"
-        auth = self._build_auth()
-
         try:
-            with httpx.Client(timeout=self.config.timeout_seconds) as client:
-                response = client.put(url, json={"compatibility": mode}, auth=auth)
+            response = self._request("PUT", "/config/{subject}", json={"compatibility": mode}, subject=subject)
             response.raise_for_status()
             logger.info("Set compatibility mode subject=%s mode=%s", subject, mode)
         except httpx.HTTPStatusError as error:
@@ -184,32 +483,89 @@ class SchemaRegistryClient:
                 f"HTTP {error.response.status_code}"
             ) from error
 
-    def register_all_aumos_schemas(self) -> dict[str, int]:
+    def register_all_aumos_schemas(self, deadline_seconds: Optional[float] = None) -> dict[str, int]:
         """Register all known AumOS Protobuf event schemas with the registry.
 
         Called by EventPublisher.start() on service startup. Returns a mapping
         of subject name to schema ID. Failures are logged as warnings so that
         a temporarily unavailable registry does not block service startup.
 
+        With ``config.proto_descriptor_dir`` set, each subject is registered
+        with the ``.proto`` file declaring its message, reordered so that
+        message comes first (see :func:`.protos.message_schema`); subjects
+        declared in one file thus get distinct schema IDs. Local imports are
+        registered first, under their import path as subject, and passed as
+        ``references``. ``google/protobuf`` imports that are not vendored in
+        the directory are left to the registry's built-in well-known types.
+        With ``config.schema_cache_path`` also set, subjects whose file and
+        imports are unchanged since their last successful registration are
+        skipped without contacting the registry. Without a descriptor
+        directory, a placeholder schema is registered per subject.
+
+        With ``deadline_seconds``, subjects are registered concurrently on
+        background threads and the call returns once all are done or the
+        deadline passes, whichever is first. Subjects still in flight keep
+        registering in the background. Until they finish, get_schema_id() raises
+        SchemaNotReadyError for them instead of blocking on HTTP.
+
+        With ``config.compatibility_baseline_dir`` also set, the descriptor
+        directory is first checked against that published tree under the
+        BACKWARD rules (see :mod:`.compatibility`), without network calls.
+
+        Args:
+            deadline_seconds: Total time budget for startup registration. None
+                              registers every subject before returning.
+
         Returns:
-            Dict mapping subject_name to schema_id for all successfully registered schemas.
+            Dict mapping subject_name to schema_id for all successfully registered schemas
+            (within the deadline, when one is given).
+
+        Raises:
+            SchemaCompatibilityError: If the local schemas break compatibility with
+                                      the baseline; nothing is registered.
         """
         schema_ids: dict[str, int] = {}
+        started = time.perf_counter()
+        sources = self._proto_sources()
+        references: dict[str, dict[str, Any]] = {}
 
-        for subject, message_fqn in AUMOS_PROTO_SUBJECTS:
-            message_name = message_fqn.split(".")[-1]
-            minimal_schema = f'syntax = "proto3"; message {message_name} {{}}'
-
-            try:
-                schema_id = self.register_schema(
+        def register(subject: str, message_fqn: str) -> int:
+            if sources is None:
+                return self.register_schema(
                     subject=subject,
                     schema_type="PROTOBUF",
-                    schema_definition=minimal_schema,
+                    schema_definition=_minimal_proto_schema(message_fqn),
                 )
-                schema_ids[subject] = schema_id
-            except SchemaRegistryError:
+            return self._register_proto_subject(subject, message_fqn, sources, references)
+
+        if deadline_seconds is None:
+            for subject, message_fqn in AUMOS_PROTO_SUBJECTS:
+                try:
+                    schema_ids[subject] = register(subject, message_fqn)
+                except SchemaRegistryError:
+                    logger.warning(
+                        "Failed to register schema for subject=%s — continuing", subject
+                    )
+        else:
+            futures: dict[Future[int], str] = {}
+            for subject, message_fqn in AUMOS_PROTO_SUBJECTS:
+                future = self._background_executor().submit(register, subject, message_fqn)
+                self._pending_registrations[subject] = future
+                future.add_done_callback(partial(self._registration_finished, subject))
+                futures[future] = subject
+            done, pending = wait(futures, timeout=deadline_seconds)
+            for future in done:
+                try:
+                    schema_ids[futures[future]] = future.result()
+                except SchemaRegistryError:
+                    logger.warning("Failed to register schema for subject=%s — continuing", futures[future])
+            for future in pending:
+                future.add_done_callback(partial(_log_late_registration, futures[future]))
+            if pending:
                 logger.warning(
-                    "Failed to register schema for subject=%s — continuing", subject
+                    "Schema registration deadline of %.1fs reached — %d subjects continue in the background",
+                    deadline_seconds,
+                    len(pending),
                 )
 
         logger.info(
@@ -217,8 +573,181 @@ class SchemaRegistryClient:
             len(schema_ids),
             len(AUMOS_PROTO_SUBJECTS),
         )
+        self.observer.registration_finished(len(schema_ids), len(AUMOS_PROTO_SUBJECTS), time.perf_counter() - started)
         return schema_ids
 
+    def _registration_finished(self, subject: str, future: Future[int]) -> None:
+        self._pending_registrations.pop(subject, None)
+
+    def pending_registrations(self) -> frozenset[str]:
+        """Subjects whose registration is still running in the background."""
+        return frozenset(self._pending_registrations)
+
+    def _proto_sources(self) -> Optional[dict[str, ProtoSource]]:
+        if self.config.proto_descriptor_dir is None:
+            logger.warning("proto_descriptor_dir is not set — registering placeholder schemas")
+            return None
+        return _checked_sources(self.config.proto_descriptor_dir, self.config.compatibility_baseline_dir)
+
+    def _register_proto_subject(
+        self,
+        subject: str,
+        message_fqn: str,
+        sources: dict[str, ProtoSource],
+        references: dict[str, dict[str, Any]],
+    ) -> int:
+        if self.config.cache_schema_ids:
+            cached = self._schema_id_cache.lookup(subject)
+            if cached is not None and not cached.stale:
+                return cached.schema_id
+
+        source = _source_for(sources, message_fqn, self.config.proto_descriptor_dir)
+        fingerprint = proto_fingerprint(sources, source.path, message_fqn)
+        if self._persistent_cache is not None:
+            schema_id = self._persistent_cache.get(subject, fingerprint)
+            if schema_id is not None:
+                self.observer.cache_hit(PERSISTENT_CACHE)
+                logger.debug("Schema subject=%s unchanged since last registration — skipped", subject)
+                if self.config.cache_schema_ids:
+                    self._schema_id_cache[subject] = schema_id
+                return schema_id
+            self.observer.cache_miss(PERSISTENT_CACHE)
+
+        payload = _proto_payload(source, self._proto_references(source, sources, references), message_fqn)
+        schema_id = self._post_schema(subject, payload)
+        if self._persistent_cache is not None:
+            self._persistent_cache.put(subject, fingerprint, schema_id)
+        return schema_id
+
+    def _proto_references(
+        self,
+        source: ProtoSource,
+        sources: dict[str, ProtoSource],
+        references: dict[str, dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Register the local imports of ``source`` and return them as schema references.
+
+        ``references`` memoizes imports already registered during this run.
+        """
+        resolved: list[dict[str, Any]] = []
+        for imported in source.imports:
+            if imported in references:
+                resolved.append(references[imported])
+            elif imported in sources:
+                dependency = sources[imported]
+                payload = _proto_payload(dependency, self._proto_references(dependency, sources, references))
+                self._post_schema(imported, payload)
+                version = self._lookup_version(imported, payload)
+                references[imported] = {"name": imported, "subject": imported, "version": version}
+                resolved.append(references[imported])
+            elif not imported.startswith(WELL_KNOWN_PREFIX):
+                raise SchemaRegistryError(
+                    f"Import '{imported}' of {source.path} not found under {self.config.proto_descriptor_dir}"
+                )
+        return resolved
+
+    def _lookup_version(self, subject: str, payload: dict[str, Any]) -> int:
+        try:
+            response = self._request("POST", "/subjects/{subject}", json=payload, subject=subject)
+            response.raise_for_status()
+            version: int = response.json()["version"]
+            return version
+        except httpx.HTTPStatusError as error:
+            raise SchemaRegistryError(
+                f"Failed to look up schema version for subject '{subject}': "
+                f"HTTP {error.response.status_code}"
+            ) from error
+        except httpx.RequestError as error:
+            raise SchemaRegistryError(
+                f"Schema registry unreachable at {self.config.url}: {error}"
+            ) from error
+
+
+def _pool_limits(config: SchemaRegistryConfig) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry_seconds,
+    )
+
+
+def _registered_schema(schema_id: int, body: dict[str, Any]) -> RegisteredSchema:
+    # The registry omits schemaType for Avro, its original and default format.
+    return RegisteredSchema(
+        schema_id=schema_id,
+        schema_type=body.get("schemaType", "AVRO"),
+        schema=body["schema"],
+        references=tuple(body.get("references", ())),
+    )
+
+
+def _log_late_registration(subject: str, future: Future[int] | asyncio.Future[int]) -> None:
+    error = future.exception()
+    if error is None:
+        logger.info("Background schema registration finished subject=%s schema_id=%d", subject, future.result())
+    else:
+        logger.warning("Background schema registration failed subject=%s: %s", subject, error)
+
+
+def _checked_sources(proto_dir: str, baseline_dir: Optional[str]) -> dict[str, ProtoSource]:
+    """Load ``proto_dir``, checking it against ``baseline_dir`` first when one is given.
+
+    Raises:
+        SchemaCompatibilityError: If the sources break BACKWARD compatibility with the baseline.
+    """
+    sources = load_proto_sources(proto_dir)
+    if baseline_dir is not None:
+        violations = check_backward_compatibility(load_proto_sources(baseline_dir), sources)
+        if violations:
+            raise SchemaCompatibilityError(violations)
+    return sources
+
+
+def _registry_url(base_url: str, endpoint: str, path_params: dict[str, object]) -> str:
+    """Fill an endpoint template with URL-quoted path parameters."""
+    return base_url + endpoint.format(**{name: quote(str(value), safe="") for name, value in path_params.items()})
+
+
+def _source_for(sources: dict[str, ProtoSource], message_fqn: str, proto_dir: Optional[str]) -> ProtoSource:
+    source = find_message_source(sources, message_fqn)
+    if source is None:
+        raise SchemaRegistryError(f"No .proto file under {proto_dir} declares {message_fqn}")
+    return source
+
+
+def _proto_payload(
+    source: ProtoSource,
+    references: list[dict[str, Any]],
+    message_fqn: Optional[str] = None,
+) -> dict[str, Any]:
+    schema = source.content if message_fqn is None else message_schema(source, message_fqn)
+    payload: dict[str, Any] = {"schemaType": "PROTOBUF", "schema": schema}
+    if references:
+        payload["references"] = references
+    return payload
+
+
+def _minimal_proto_schema(message_fqn: str) -> str:
+    message_name = message_fqn.split(".")[-1]
+    return f'syntax = "proto3"; message {message_name} {{}}'
+
 
 class SchemaRegistryError(Exception):
     """Raised when schema registration or ID resolution fails."""
+
+
+class SchemaNotReadyError(SchemaRegistryError):
+    """Raised instead of blocking when a subject's registration is still running in the background."""
+
+
+class SchemaCompatibilityError(SchemaRegistryError):
+    """Raised when local schemas break BACKWARD compatibility with the configured baseline.
+
+    Attributes:
+        violations: Every rule broken by the local schemas.
+    """
+
+    def __init__(self, violations: list[CompatibilityViolation]) -> None:
+        self.violations = violations
+        details = "\n  ".join(str(violation) for violation in violations)
+        super().__init__(f"{len(violations)} BACKWARD compatibility violation(s):\n  {details}")
@@ -0,0 +1,410 @@
+"""Offline BACKWARD compatibility checks between two versions of the proto tree.
+
+RFC-001 registers every subject with BACKWARD compatibility: a new schema
+version must stay readable by consumers built against the previous one. The
+registry enforces that only when a schema is POSTed; this module applies the
+same rules locally, so registration and deploys can be gated without a
+network call:
+
+  - files, messages, enums, fields and enum values may not be removed
+  - fields and enum values may not be renumbered
+  - fields may not be renamed or change type, label (``repeated``,
+    ``optional``, ``map``) or ``oneof`` membership
+  - field numbers listed in a ``reserved`` statement may not be reused
+
+Adding files, messages, fields and enum values is always allowed. Schemas are
+compared as written in the ``.proto`` sources (see :mod:`.protos`), so no
+``protoc`` run or descriptor set is needed.
+
+Run ``python -m aumos_proto.registry OLD_DIR NEW_DIR`` to check
+two proto trees from CI; it exits non-zero when violations are found.
+"""
+from __future__ import annotations
+
+import re
+import sys
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from aumos_proto.registry.protos import ProtoSource, load_proto_sources
+
+_COMMENT = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+# String literals, (dotted) identifiers and numbers, or a single punctuation character.
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\.?\w[\w.]*|\S')
+# Field labels that change how a field is encoded or presented to readers.
+_LABELS = frozenset({"repeated", "optional", "required"})
+# Statements skipped up to their terminating ";" inside message and enum bodies.
+_SKIPPED_STATEMENTS = frozenset({"option", "extensions", "syntax", "package", "import"})
+_MAX_FIELD_NUMBER = 536_870_911
+
+
+@dataclass(frozen=True)
+class FieldSchema:
+    """A message field as declared: name, number, type and label."""
+
+    name: str
+    number: int
+    type: str
+    label: str = ""
+    oneof: str | None = None
+
+
+@dataclass
+class MessageSchema:
+    """Fields and reservations of one message, keyed by field number."""
+
+    fields: dict[int, FieldSchema] = field(default_factory=dict)
+    reserved_numbers: list[range] = field(default_factory=list)
+
+    def is_reserved(self, number: int) -> bool:
+        """Return True if ``number`` is covered by a ``reserved`` statement."""
+        return any(number in reserved for reserved in self.reserved_numbers)
+
+
+@dataclass
+class ProtoSchema:
+    """Messages and enums declared in one ``.proto`` file.
+
+    Names are relative to the file's package; nested declarations are joined
+    with dots (``"Outer.Inner"``). Enum values are keyed by number.
+    """
+
+    path: str
+    package: str
+    messages: dict[str, MessageSchema] = field(default_factory=dict)
+    enums: dict[str, dict[int, str]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class CompatibilityViolation:
+    """One BACKWARD compatibility rule broken by the new schema version.
+
+    Attributes:
+        path:    Import path of the affected ``.proto`` file.
+        element: Affected declaration, e.g. ``"MeteringEvent.labels"``.
+        rule:    Identifier of the broken rule, e.g. ``"FIELD_NO_DELETE"``.
+        message: Human-readable description of the change.
+    """
+
+    path: str
+    element: str
+    rule: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.element}: {self.message} [{self.rule}]"
+
+
+class ProtoSyntaxError(ValueError):
+    """Raised when a ``.proto`` file cannot be parsed for compatibility checking."""
+
+
+def parse_proto_schema(source: ProtoSource) -> ProtoSchema:
+    """Extract the messages, fields and enums declared in a ``.proto`` file.
+
+    Raises:
+        ProtoSyntaxError: If braces are unbalanced or a declaration is malformed.
+    """
+    schema = ProtoSchema(path=source.path, package=source.package)
+    tokens = _TOKEN.findall(_COMMENT.sub("", source.content))
+    try:
+        end = _parse_body(tokens, 0, "", schema, top_level=True)
+    except (IndexError, ValueError) as error:
+        raise ProtoSyntaxError(f"{source.path}: cannot parse schema: {error}") from error
+    if end != len(tokens):
+        raise ProtoSyntaxError(f"{source.path}: unbalanced braces")
+    return schema
+
+
+def _parse_body(tokens: list[str], pos: int, scope: str, schema: ProtoSchema, top_level: bool = False) -> int:
+    """Parse declarations until the closing brace of the current block; return the position after it."""
+    message = None if top_level else schema.messages[scope]
+    while pos < len(tokens):
+        token = tokens[pos]
+        if token == "}":
+            if top_level:
+                raise ValueError("unexpected '}'")
+            return pos + 1
+        if token == ";":
+            pos += 1
+        elif token == "message":
+            name = _qualify(scope, tokens[pos + 1])
+            schema.messages[name] = MessageSchema()
+            pos = _parse_body(tokens, _expect(tokens, pos + 2, "{"), name, schema)
+        elif token == "enum":
+            name = _qualify(scope, tokens[pos + 1])
+            schema.enums[name] = {}
+            pos = _parse_enum(tokens, _expect(tokens, pos + 2, "{"), schema.enums[name])
+        elif token in ("service", "extend"):
+            pos = _skip_block(tokens, pos)
+        elif token in _SKIPPED_STATEMENTS or message is None:
+            pos = _skip_statement(tokens, pos)
+        elif token == "oneof":
+            oneof = tokens[pos + 1]
+            pos = _expect(tokens, pos + 2, "{")
+            while tokens[pos] != "}":
+                if tokens[pos] in (";", "option"):
+                    pos = _skip_statement(tokens, pos) if tokens[pos] == "option" else pos + 1
+                    continue
+                pos = _parse_field(tokens, pos, message, oneof)
+            pos += 1
+        elif token == "reserved":
+            pos = _parse_reserved(tokens, pos + 1, message)
+        else:
+            pos = _parse_field(tokens, pos, message, None)
+    if not top_level:
+        raise ValueError(f"missing '}}' for {scope}")
+    return pos
+
+
+def _parse_field(tokens: list[str], pos: int, message: MessageSchema, oneof: str | None) -> int:
+    label = ""
+    if tokens[pos] in _LABELS:
+        label = tokens[pos]
+        pos += 1
+    if tokens[pos] == "map":
+        end = tokens.index(">", pos)
+        label = "map"
+        field_type = "map<" + "".join(tokens[pos + 2:end]) + ">"
+        pos = end + 1
+    else:
+        field_type = tokens[pos]
+        pos += 1
+    name = tokens[pos]
+    pos = _expect(tokens, pos + 1, "=")
+    number = int(tokens[pos], 0)
+    message.fields[number] = FieldSchema(name, number, field_type.lstrip("."), label, oneof)
+    return _skip_statement(tokens, pos)
+
+
+def _parse_reserved(tokens: list[str], pos: int, message: MessageSchema) -> int:
+    while tokens[pos] != ";":
+        token = tokens[pos]
+        if token[0].isdigit():
+            start = int(token, 0)
+            if tokens[pos + 1] == "to":
+                stop = _MAX_FIELD_NUMBER if tokens[pos + 2] == "max" else int(tokens[pos + 2], 0)
+                message.reserved_numbers.append(range(start, stop + 1))
+                pos += 3
+                continue
+            message.reserved_numbers.append(range(start, start + 1))
+        pos += 1
+    return pos + 1
+
+
+def _parse_enum(tokens: list[str], pos: int, values: dict[int, str]) -> int:
+    while tokens[pos] != "}":
+        if tokens[pos] in ("option", "reserved"):
+            pos = _skip_statement(tokens, pos)
+        elif tokens[pos] == ";":
+            pos += 1
+        else:
+            name = tokens[pos]
+            pos = _expect(tokens, pos + 1, "=")
+            number = -int(tokens[pos + 1], 0) if tokens[pos] == "-" else int(tokens[pos], 0)
+            # With allow_alias the first name declared for a number is canonical.
+            values.setdefault(number, name)
+            pos = _skip_statement(tokens, pos)
+    return pos + 1
+
+
+def _expect(tokens: list[str], pos: int, expected: str) -> int:
+    if tokens[pos] != expected:
+        raise ValueError(f"expected {expected!r}, found {tokens[pos]!r}")
+    return pos + 1
+
+
+def _skip_statement(tokens: list[str], pos: int) -> int:
+    """Return the position after the ``;`` ending the statement at ``pos`` (skipping ``{...}`` options)."""
+    depth = 0
+    while True:
+        token = tokens[pos]
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        elif token == ";" and depth == 0:
+            return pos + 1
+        pos += 1
+
+
+def _skip_block(tokens: list[str], pos: int) -> int:
+    depth = 0
+    while True:
+        token = tokens[pos]
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+
+
+def _qualify(scope: str, name: str) -> str:
+    return f"{scope}.{name}" if scope else name
+
+
+def check_backward_compatibility(
+    old_sources: Mapping[str, ProtoSource],
+    new_sources: Mapping[str, ProtoSource],
+) -> list[CompatibilityViolation]:
+    """Compare two versions of a proto tree under the BACKWARD rules.
+
+    Args:
+        old_sources: The published schemas, keyed by import path (as returned
+                     by :func:`.protos.load_proto_sources`).
+        new_sources: The candidate schemas, keyed the same way.
+
+    Returns:
+        Every violation found, ordered by file and declaration. An empty list
+        means the new version can be registered.
+
+    Raises:
+        ProtoSyntaxError: If a file present in both versions cannot be parsed.
+    """
+    violations: list[CompatibilityViolation] = []
+    for path, old_source in old_sources.items():
+        new_source = new_sources.get(path)
+        if new_source is None:
+            violations.append(CompatibilityViolation(path, path, "FILE_NO_DELETE", "file was deleted"))
+            continue
+        if old_source.content == new_source.content:
+            continue
+        violations.extend(_check_file(parse_proto_schema(old_source), parse_proto_schema(new_source)))
+    return violations
+
+
+def check_proto_dirs(old_root: str | Path, new_root: str | Path) -> list[CompatibilityViolation]:
+    """Load two proto trees from disk and compare them with :func:`check_backward_compatibility`."""
+    return check_backward_compatibility(load_proto_sources(old_root), load_proto_sources(new_root))
+
+
+def _check_file(old: ProtoSchema, new: ProtoSchema) -> Iterator[CompatibilityViolation]:
+    path = old.path
+    if old.package != new.package:
+        yield CompatibilityViolation(
+            path, path, "FILE_SAME_PACKAGE", f"package changed from {old.package!r} to {new.package!r}"
+        )
+    for name, old_message in old.messages.items():
+        new_message = new.messages.get(name)
+        if new_message is None:
+            yield CompatibilityViolation(path, name, "MESSAGE_NO_DELETE", "message was deleted")
+            continue
+        yield from _check_message(path, name, old_message, new_message, old.package, new.package)
+    for name, old_values in old.enums.items():
+        new_values = new.enums.get(name)
+        if new_values is None:
+            yield CompatibilityViolation(path, name, "ENUM_NO_DELETE", "enum was deleted")
+            continue
+        yield from _check_enum(path, name, old_values, new_values)
+
+
+def _check_message(
+    path: str,
+    name: str,
+    old: MessageSchema,
+    new: MessageSchema,
+    old_package: str,
+    new_package: str,
+) -> Iterator[CompatibilityViolation]:
+    new_numbers = {new_field.name: number for number, new_field in new.fields.items()}
+    for number, old_field in old.fields.items():
+        element = f"{name}.{old_field.name}"
+        new_field = new.fields.get(number)
+        moved_to = new_numbers.get(old_field.name)
+        if moved_to is not None and moved_to != number:
+            yield CompatibilityViolation(
+                path, element, "FIELD_SAME_NUMBER", f"field was renumbered from {number} to {moved_to}"
+            )
+        elif new_field is None:
+            yield CompatibilityViolation(path, element, "FIELD_NO_DELETE", f"field {number} was deleted")
+        elif new_field.name != old_field.name:
+            yield CompatibilityViolation(
+                path, element, "FIELD_SAME_NAME", f"field {number} was renamed to {new_field.name!r}"
+            )
+        else:
+            yield from _check_field(path, element, old_field, new_field, old_package, new_package)
+    for number, new_field in new.fields.items():
+        if number not in old.fields and old.is_reserved(number):
+            yield CompatibilityViolation(
+                path,
+                f"{name}.{new_field.name}",
+                "FIELD_RESERVED_NUMBER",
+                f"field reuses reserved number {number}",
+            )
+
+
+def _check_field(
+    path: str,
+    element: str,
+    old: FieldSchema,
+    new: FieldSchema,
+    old_package: str,
+    new_package: str,
+) -> Iterator[CompatibilityViolation]:
+    old_type = _strip_package(old.type, old_package)
+    new_type = _strip_package(new.type, new_package)
+    if old_type != new_type:
+        yield CompatibilityViolation(
+            path, element, "FIELD_SAME_TYPE", f"type changed from {old_type!r} to {new_type!r}"
+        )
+    if old.label != new.label:
+        yield CompatibilityViolation(
+            path,
+            element,
+            "FIELD_SAME_LABEL",
+            f"label changed from {old.label or 'singular'!r} to {new.label or 'singular'!r}",
+        )
+    if old.oneof != new.oneof:
+        yield CompatibilityViolation(
+            path, element, "FIELD_SAME_ONEOF", f"oneof changed from {old.oneof!r} to {new.oneof!r}"
+        )
+
+
+def _check_enum(
+    path: str,
+    name: str,
+    old_values: dict[int, str],
+    new_values: dict[int, str],
+) -> Iterator[CompatibilityViolation]:
+    new_numbers = {value_name: number for number, value_name in new_values.items()}
+    for number, value_name in old_values.items():
+        element = f"{name}.{value_name}"
+        moved_to = new_numbers.get(value_name)
+        if moved_to is not None and moved_to != number:
+            yield CompatibilityViolation(
+                path, element, "ENUM_VALUE_SAME_NUMBER", f"enum value was renumbered from {number} to {moved_to}"
+            )
+        elif number not in new_values:
+            yield CompatibilityViolation(path, element, "ENUM_VALUE_NO_DELETE", f"enum value {number} was deleted")
+        elif new_values[number] != value_name:
+            yield CompatibilityViolation(
+                path, element, "ENUM_VALUE_SAME_NAME", f"enum value {number} was renamed to {new_values[number]!r}"
+            )
+
+
+def _strip_package(type_name: str, package: str) -> str:
+    """Drop the file's own package from a type reference, so ``pkg.Foo`` and ``Foo`` compare equal."""
+    prefix = f"{package}."
+    return type_name[len(prefix):] if package and type_name.startswith(prefix) else type_name
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command-line entry point: compare two proto trees and print any violations."""
+    args = sys.argv[1:] if argv is None else list(argv)
+    if len(args) != 2:
+        print("usage: python -m aumos_proto.registry OLD_PROTO_DIR NEW_PROTO_DIR", file=sys.stderr)
+        return 2
+    try:
+        violations = check_proto_dirs(args[0], args[1])
+    except ProtoSyntaxError as error:
+        print(error, file=sys.stderr)
+        return 2
+    for violation in violations:
+        print(violation)
+    if violations:
+        print(f"{len(violations)} BACKWARD compatibility violation(s)", file=sys.stderr)
+        return 1
+    return 0
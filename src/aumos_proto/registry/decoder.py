@@ -0,0 +1,185 @@
+"""Decode schema-registry framed records straight into AumOS event objects.
+
+Without this, consumers strip the framing header, work out which message class
+the schema ID belongs to and then call that class's ``FromString``.
+:class:`FramedDecoder` does all three in one call. It keeps a
+``schema_id -> message class`` table built from ``AUMOS_PROTO_SUBJECTS``. The
+table is resolved through :class:`SchemaRegistryClient` once at warm-up and
+extended on demand for IDs first seen later, such as a new schema version
+registered after startup. After that, each record is a cache lookup plus a
+decode, with no registry round trip. The table is an :class:`LruCache`, so IDs
+seen on the wire cannot grow it without limit.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+import httpx
+
+from aumos_proto.codec import LazyMessage, ProtoMessage
+from aumos_proto.registry.cache import LruCache
+from aumos_proto.registry.client import AUMOS_PROTO_SUBJECTS, SchemaRegistryClient, SchemaRegistryError
+from aumos_proto.registry.framing import strip_schema_framing_batch, strip_schema_framing_view
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownSchemaError(SchemaRegistryError):
+    """Raised when a schema ID does not belong to any known AumOS message type."""
+
+
+def default_message_types() -> dict[str, type[ProtoMessage]]:
+    """Map fully qualified proto names to the ``aumos_proto.events.v1`` stub classes."""
+    from aumos_proto.events import v1
+
+    message_types: dict[str, type[ProtoMessage]] = {}
+    for name in v1.__all__:
+        candidate = getattr(v1, name)
+        if isinstance(candidate, type) and issubclass(candidate, ProtoMessage):
+            message_types[candidate._proto_name] = candidate
+    return message_types
+
+
+class FramedDecoder:
+    """Decodes Confluent-framed records into the matching AumOS message class.
+
+    Args:
+        client:        Registry client used to resolve subjects to schema IDs.
+        subjects:      (subject, fully qualified message name) pairs to serve.
+                       Defaults to ``AUMOS_PROTO_SUBJECTS``.
+        message_types: Fully qualified message name to stub class. Defaults to
+                       every message in ``aumos_proto.events.v1``.
+        compact_timestamps: Decode Timestamp fields to ``aumos_proto.codec.Timestamp``
+                       instead of ``datetime``.
+        cache_size:    Maximum number of schema IDs kept in the dispatch table.
+                       Defaults to the client's ``config.schema_cache_size``.
+    """
+
+    def __init__(
+        self,
+        client: SchemaRegistryClient,
+        subjects: Iterable[tuple[str, str]] = AUMOS_PROTO_SUBJECTS,
+        message_types: Mapping[str, type[ProtoMessage]] | None = None,
+        compact_timestamps: bool = False,
+        cache_size: int | None = None,
+    ) -> None:
+        types = default_message_types() if message_types is None else dict(message_types)
+        self._client = client
+        self._compact_timestamps = compact_timestamps
+        self._types_by_subject: dict[str, type[ProtoMessage]] = {
+            subject: types[message_fqn] for subject, message_fqn in subjects if message_fqn in types
+        }
+        # None marks IDs the registry confirmed belong to none of our subjects, or does not know.
+        self._types_by_id: LruCache[int, type[ProtoMessage] | None] = LruCache(
+            client.config.schema_cache_size if cache_size is None else cache_size
+        )
+
+    def warm_up(self) -> int:
+        """Resolve the current schema ID of every subject and fill the dispatch table.
+
+        Subjects that cannot be resolved are logged and skipped; their IDs are
+        looked up on first use instead.
+
+        Returns:
+            The number of subjects resolved.
+
+        Raises:
+            SchemaRegistryError: If subjects of different message types resolve to
+                the same schema ID, which would decode one type as the other.
+        """
+        resolved: dict[int, tuple[str, type[ProtoMessage]]] = {}
+        count = 0
+        for subject, message_type in self._types_by_subject.items():
+            try:
+                schema_id = self._client.get_schema_id(subject)
+            except SchemaRegistryError:
+                logger.warning("Could not resolve schema ID for subject=%s — deferring to first use", subject)
+                continue
+            other_subject, other_type = resolved.setdefault(schema_id, (subject, message_type))
+            if other_type is not message_type:
+                raise SchemaRegistryError(
+                    f"Subjects {other_subject} ({other_type.__name__}) and {subject} ({message_type.__name__}) "
+                    f"share schema ID {schema_id}"
+                )
+            count += 1
+        for schema_id, (_, message_type) in resolved.items():
+            self._types_by_id.put(schema_id, message_type)
+        return count
+
+    def register(self, schema_id: int, message_type: type[ProtoMessage]) -> None:
+        """Add or override the message class for a schema ID."""
+        self._types_by_id.put(schema_id, message_type)
+
+    def message_type_for(self, schema_id: int) -> type[ProtoMessage]:
+        """Return the message class for ``schema_id``, asking the registry on a miss.
+
+        Raises:
+            UnknownSchemaError: If the ID is unknown to the registry or registered
+                under none of the known subjects.
+            SchemaRegistryError: If the registry cannot be reached to resolve a new ID.
+        """
+        message_type = self._types_by_id.get(schema_id)
+        if message_type is None and schema_id not in self._types_by_id:
+            message_type = self._resolve(schema_id)
+        if message_type is None:
+            raise UnknownSchemaError(f"Schema ID {schema_id} is not registered under any known AumOS subject")
+        return message_type
+
+    def decode(self, framed: bytes | bytearray | memoryview, lazy: bool = False) -> ProtoMessage | LazyMessage[Any]:
+        """Decode one framed record into its event object.
+
+        Args:
+            framed: Raw value of a Kafka consumer record.
+            lazy:   Return a ``LazyMessage`` view instead of a fully decoded message.
+
+        Raises:
+            ValueError: If the record is not schema-registry framed.
+            UnknownSchemaError: If the schema ID maps to no known message type.
+            DecodeError: If the payload is malformed.
+        """
+        schema_id, payload = strip_schema_framing_view(framed)
+        message_type = self.message_type_for(schema_id)
+        if lazy:
+            return message_type.FromString(payload, lazy=True, compact_timestamps=self._compact_timestamps)
+        return message_type.FromString(payload, compact_timestamps=self._compact_timestamps)
+
+    def decode_many(self, records: Sequence[bytes | bytearray | memoryview]) -> list[ProtoMessage | None]:
+        """Decode a poll batch, grouping records by schema ID and parsing each group in one call.
+
+        Returns:
+            One message per record, in order, with ``None`` for records whose
+            framing header is malformed.
+
+        Raises:
+            UnknownSchemaError: If a schema ID maps to no known message type.
+            DecodeError: If a payload is malformed.
+        """
+        batch = strip_schema_framing_batch(records)
+        messages: list[ProtoMessage | None] = [None] * len(records)
+        for schema_id, indices in batch.bucket_by_schema_id().items():
+            message_type = self.message_type_for(schema_id)
+            payloads = [batch.payload(index) for index in indices]
+            decoded = message_type.parse_many(payloads, compact_timestamps=self._compact_timestamps)
+            for index, message in zip(indices, decoded, strict=True):
+                messages[index] = message
+        return messages
+
+    def _resolve(self, schema_id: int) -> type[ProtoMessage] | None:
+        message_type: type[ProtoMessage] | None = None
+        try:
+            subjects = self._client.get_subjects_by_schema_id(schema_id)
+        except SchemaRegistryError as error:
+            # A 404 is as final as a foreign subject: cache it so a bad ID costs one lookup.
+            cause = error.__cause__
+            if not (isinstance(cause, httpx.HTTPStatusError) and cause.response.status_code == 404):
+                raise
+            subjects = []
+        for subject in subjects:
+            message_type = self._types_by_subject.get(subject)
+            if message_type is not None:
+                break
+        self._types_by_id.put(schema_id, message_type)
+        logger.info("Resolved schema_id=%d to %s", schema_id, message_type.__name__ if message_type else "no known type")
+        return message_type
@@ -7,14 +7,44 @@ a 5-byte header:
 
 This module provides encode/decode helpers that are wire-format correct
 regardless of which serializer (betterproto, standard protoc, or JSON) is used.
+
+``encode_with_schema_id`` and ``strip_schema_framing`` copy the payload. For
+large messages, ``encode_message_with_schema_id`` serializes a message directly
+behind the header in one buffer, ``write_schema_header`` fills a reserved
+header slot in a caller-owned buffer, and ``strip_schema_framing_view`` returns
+the payload as a ``memoryview`` over the consumer record.
+
+Whole poll batches are handled by ``strip_schema_framing_batch`` (a list of
+records) and ``strip_schema_framing_buffer`` (one concatenated buffer plus
+record offsets). They parse every header in one call and flag malformed records
+in a mask instead of raising. NumPy is used when installed
+(``pip install aumos-proto[numpy]``); otherwise the results are ``array.array``
+columns filled by a plain loop.
 """
 from __future__ import annotations
 
 import struct
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from aumos_proto.codec import ProtoMessage
+
+try:
+    import numpy as np
+
+    _HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _HAVE_NUMPY = False
+
+Buffer = bytes | bytearray | memoryview
 
 MAGIC_BYTE: int = 0x00
+HEADER_SIZE: int = 5
 _HEADER_FORMAT: str = ">bI"  # big-endian: 1 signed byte + 4-byte unsigned int
-_HEADER_SIZE: int = 5
+_HEADER = struct.Struct(_HEADER_FORMAT)
 
 
 def encode_with_schema_id(schema_id: int, payload: bytes) -> bytes:
@@ -33,7 +63,61 @@ def encode_with_schema_id(schema_id: int, payload: bytes) -> bytes:
     return header + payload
 
 
-def decode_schema_id(framed: bytes) -> int:
+def write_schema_header(schema_id: int, buffer: bytearray | memoryview, offset: int = 0) -> int:
+    """Write the 5-byte Confluent framing header into an existing buffer.
+
+    Lets producers reserve ``HEADER_SIZE`` bytes at the front of a buffer,
+    serialize the message behind them and fill in the header without ever
+    concatenating header and payload.
+
+    Args:
+        schema_id: The integer schema ID returned by the schema registry.
+        buffer:    Writable buffer with at least ``offset + HEADER_SIZE`` bytes.
+        offset:    Position of the header within ``buffer``.
+
+    Returns:
+        The offset just past the header, where the payload starts.
+
+    Raises:
+        ValueError: If ``buffer`` is too small to hold the header at ``offset``.
+    """
+    if offset < 0 or len(buffer) - offset < HEADER_SIZE:
+        raise ValueError(
+            f"Buffer of {len(buffer)} bytes cannot hold a framing header at offset {offset}"
+        )
+    _HEADER.pack_into(buffer, offset, MAGIC_BYTE, schema_id)
+    return offset + HEADER_SIZE
+
+
+def encode_message_with_schema_id(
+    schema_id: int,
+    message: ProtoMessage,
+    out: bytearray | None = None,
+) -> bytearray:
+    """Serialize a message straight behind its framing header in one buffer.
+
+    Unlike ``encode_with_schema_id(schema_id, message.SerializeToString())``,
+    the encoded body is never materialized as separate ``bytes``, so the
+    payload is written once instead of being copied twice.
+
+    Args:
+        schema_id: The integer schema ID returned by the schema registry.
+        message:   Any ``aumos_proto`` stub message.
+        out:       Buffer to append the framed message to. A new one is
+                   created when omitted; pass a cleared buffer to reuse its
+                   allocation across records.
+
+    Returns:
+        The buffer holding the framed message, ready for publication to Kafka.
+    """
+    if out is None:
+        out = bytearray()
+    out += _HEADER.pack(MAGIC_BYTE, schema_id)
+    message._proto_encode(out)
+    return out
+
+
+def decode_schema_id(framed: bytes | bytearray | memoryview) -> int:
     """Extract the schema ID from a Confluent-framed message.
 
     Args:
@@ -45,11 +129,11 @@ def decode_schema_id(framed: bytes) -> int:
     Raises:
         ValueError: If the magic byte is missing (message is not schema-registry framed).
     """
-    if len(framed) < _HEADER_SIZE:
+    if len(framed) < HEADER_SIZE:
         raise ValueError(
             f"Message is too short to be schema-registry framed: {len(framed)} bytes"
         )
-    magic, schema_id = struct.unpack_from(_HEADER_FORMAT, framed, 0)
+    magic, schema_id = _HEADER.unpack_from(framed, 0)
     if magic != MAGIC_BYTE:
         raise ValueError(
             f"Expected Confluent magic byte 0x00, got 0x{magic:02x}. "
@@ -72,5 +156,187 @@ def strip_schema_framing(framed: bytes) -> tuple[int, bytes]:
         ValueError: If the magic byte is incorrect.
     """
     schema_id = decode_schema_id(framed)
-    payload = framed[_HEADER_SIZE:]
+    payload = framed[HEADER_SIZE:]
     return schema_id, payload
+
+
+def strip_schema_framing_view(framed: bytes | bytearray | memoryview) -> tuple[int, memoryview]:
+    """Split a framed message into its schema ID and a zero-copy payload view.
+
+    The returned ``memoryview`` shares memory with ``framed`` and can be passed
+    directly to any stub's ``FromString``.
+
+    Args:
+        framed: Raw bytes from a Kafka consumer record.
+
+    Returns:
+        A tuple of (schema_id, payload_view).
+
+    Raises:
+        ValueError: If the message is too short or the magic byte is incorrect.
+    """
+    schema_id = decode_schema_id(framed)
+    return schema_id, memoryview(framed)[HEADER_SIZE:]
+
+
+def encode_batch_with_schema_id(schema_id: int, payloads: Sequence[Buffer]) -> list[bytes]:
+    """Frame a batch of payloads that share one schema ID.
+
+    The header is packed once for the whole batch.
+
+    Args:
+        schema_id: The integer schema ID returned by the schema registry.
+        payloads:  Serialized Protobuf payloads, e.g. from ``serialize_many``.
+
+    Returns:
+        One framed record per payload, in order.
+    """
+    header = _HEADER.pack(MAGIC_BYTE, schema_id)
+    return [header + payload for payload in payloads]
+
+
+@dataclass(frozen=True)
+class FramedBatch:
+    """Schema IDs and payload spans for a batch of framed records.
+
+    Columns are ``numpy.ndarray`` when NumPy is installed and ``array.array``
+    otherwise; both index and iterate like sequences of ints.
+
+    Attributes:
+        schema_ids:     Schema ID per record (0 for malformed records).
+        payload_starts: Offset of each payload within its record (list input)
+                        or within the shared buffer (buffer input).
+        payload_ends:   Offset one past the end of each payload. Malformed
+                        records get an empty span.
+        malformed:      True where a record is shorter than the header or its
+                        magic byte is not 0x00.
+    """
+
+    schema_ids: Any
+    payload_starts: Any
+    payload_ends: Any
+    malformed: Any
+    _records: Sequence[Buffer] | None = None
+    _buffer: Buffer | None = None
+
+    def __len__(self) -> int:
+        return len(self.schema_ids)
+
+    def payload(self, index: int) -> memoryview:
+        """Return record ``index``'s payload as a zero-copy ``memoryview``."""
+        source = self._buffer if self._records is None else self._records[index]
+        start = int(self.payload_starts[index])
+        end = int(self.payload_ends[index])
+        return memoryview(source)[start:end]  # type: ignore[arg-type]
+
+    def bucket_by_schema_id(self) -> dict[int, list[int]]:
+        """Group the indices of well-formed records by schema ID, preserving order."""
+        if _HAVE_NUMPY and isinstance(self.schema_ids, np.ndarray):
+            valid = np.flatnonzero(~self.malformed)
+            if valid.size == 0:
+                return {}
+            ids = self.schema_ids[valid]
+            order = np.argsort(ids, kind="stable")
+            unique_ids, first = np.unique(ids[order], return_index=True)
+            groups = np.split(valid[order], first[1:])
+            return {int(schema_id): group.tolist() for schema_id, group in zip(unique_ids, groups, strict=True)}
+        buckets: dict[int, list[int]] = {}
+        for index, (schema_id, bad) in enumerate(zip(self.schema_ids, self.malformed, strict=True)):
+            if not bad:
+                buckets.setdefault(schema_id, []).append(index)
+        return buckets
+
+
+def strip_schema_framing_batch(records: Sequence[Buffer]) -> FramedBatch:
+    """Parse the framing headers of a list of records in one call.
+
+    Payloads are not copied: use ``FramedBatch.payload(i)`` for a view of
+    record ``i``'s payload.
+
+    Args:
+        records: Raw values from a Kafka poll, one framed message each.
+
+    Returns:
+        A ``FramedBatch`` whose payload offsets are relative to each record.
+    """
+    if _HAVE_NUMPY:
+        lengths = np.fromiter(map(len, records), dtype=np.int64, count=len(records))
+        heads = b"".join([record[:HEADER_SIZE] for record in records])
+        head_ends = np.cumsum(np.minimum(lengths, HEADER_SIZE))
+        head_starts = head_ends - np.minimum(lengths, HEADER_SIZE)
+        schema_ids, malformed = _parse_headers_numpy(heads, head_starts, head_ends)
+        starts = np.where(malformed, lengths, HEADER_SIZE)
+        return FramedBatch(schema_ids, starts, lengths, malformed, _records=records)
+
+    schema_ids_a, starts_a, ends_a, malformed_a = _empty_columns()
+    for record in records:
+        _append_record(record, 0, len(record), schema_ids_a, starts_a, ends_a, malformed_a)
+    return FramedBatch(schema_ids_a, starts_a, ends_a, malformed_a, _records=records)
+
+
+def strip_schema_framing_buffer(buffer: Buffer, offsets: Sequence[int]) -> FramedBatch:
+    """Parse the framing headers of records packed back to back in one buffer.
+
+    Args:
+        buffer:  Concatenated framed records.
+        offsets: Start offset of each record in ``buffer``, ascending. Record
+                 ``i`` ends where record ``i + 1`` starts; the last record
+                 ends at ``len(buffer)``.
+
+    Returns:
+        A ``FramedBatch`` whose payload offsets index into ``buffer``.
+    """
+    if _HAVE_NUMPY:
+        starts = np.asarray(offsets, dtype=np.int64)
+        ends = np.append(starts[1:], len(buffer)) if len(starts) else starts
+        schema_ids, malformed = _parse_headers_numpy(buffer, starts, ends)
+        payload_starts = np.where(malformed, ends, starts + HEADER_SIZE)
+        return FramedBatch(schema_ids, payload_starts, ends, malformed, _buffer=buffer)
+
+    schema_ids_a, starts_a, ends_a, malformed_a = _empty_columns()
+    bounds = [*offsets, len(buffer)]
+    for index in range(len(offsets)):
+        _append_record(buffer, bounds[index], bounds[index + 1], schema_ids_a, starts_a, ends_a, malformed_a)
+    return FramedBatch(schema_ids_a, starts_a, ends_a, malformed_a, _buffer=buffer)
+
+
+def _parse_headers_numpy(buffer: Buffer, starts: Any, ends: Any) -> tuple[Any, Any]:
+    """Vectorized header parse of the records spanning ``starts[i]:ends[i]`` in ``buffer``."""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    malformed = (ends - starts < HEADER_SIZE) | (starts < 0) | (ends > len(data))
+    if len(data) < HEADER_SIZE:
+        return np.zeros(len(starts), dtype=np.uint32), np.ones(len(starts), dtype=bool)
+    # Malformed rows read the first header slot instead; their results are masked below.
+    positions = np.where(malformed, 0, starts)[:, None] + np.arange(HEADER_SIZE)
+    headers = data[positions].astype(np.uint32)
+    malformed |= headers[:, 0] != MAGIC_BYTE
+    schema_ids = (headers[:, 1] << 24) | (headers[:, 2] << 16) | (headers[:, 3] << 8) | headers[:, 4]
+    schema_ids[malformed] = 0
+    return schema_ids, malformed
+
+
+def _empty_columns() -> tuple[array[int], array[int], array[int], array[int]]:
+    return array("I"), array("q"), array("q"), array("b")
+
+
+def _append_record(
+    source: Buffer,
+    start: int,
+    end: int,
+    schema_ids: array[int],
+    starts: array[int],
+    ends: array[int],
+    malformed: array[int],
+) -> None:
+    if end - start >= HEADER_SIZE and start >= 0 and end <= len(source):
+        magic, schema_id = _HEADER.unpack_from(source, start)
+        if magic == MAGIC_BYTE:
+            schema_ids.append(schema_id)
+            starts.append(start + HEADER_SIZE)
+            ends.append(end)
+            malformed.append(False)
+            return
+    schema_ids.append(0)
+    starts.append(end)
+    ends.append(end)
+    malformed.append(True)
@@ -0,0 +1,201 @@
+"""Instrumentation hooks for the schema registry clients.
+
+Both clients report what they do to a :class:`RegistryObserver`: every HTTP
+request with its endpoint, status and latency, cache hits, misses and
+evictions, and the duration of startup registration. The base class ignores
+everything, so an uninstrumented client pays one empty method call per event.
+Subclass it to forward events to a metrics library, or pass an
+:class:`InMemoryMetrics` and scrape its :meth:`~InMemoryMetrics.snapshot`::
+
+    metrics = InMemoryMetrics()
+    client = SchemaRegistryClient(config, observer=metrics)
+    client.register_all_aumos_schemas()
+    metrics.snapshot()["requests"]["POST /subjects/{subject}/versions"]["p95_seconds"]
+
+Endpoints are reported as path templates (``/schemas/ids/{schema_id}``), so
+label cardinality stays fixed however many subjects and IDs are resolved.
+Observers are called from whichever thread or task did the work and must be
+thread-safe.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any
+
+# Cache names passed to the cache_* hooks.
+SCHEMA_ID_CACHE = "schema_id"
+SCHEMA_CACHE = "schema"
+PERSISTENT_CACHE = "persistent"
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class RegistryObserver:
+    """Receives instrumentation events from a registry client; every hook is a no-op."""
+
+    def request_finished(self, method: str, endpoint: str, status: int | None, seconds: float) -> None:
+        """Called after each HTTP request to the registry.
+
+        Args:
+            method:   HTTP method, e.g. ``"GET"``.
+            endpoint: Path template, e.g. ``"/subjects/{subject}/versions"``.
+            status:   HTTP status code, or None if the registry could not be reached.
+            seconds:  Wall time of the request, excluding time queued for a connection slot.
+        """
+
+    def cache_hit(self, cache: str) -> None:
+        """Called when a lookup is answered from ``cache`` (stale entries included)."""
+
+    def cache_miss(self, cache: str) -> None:
+        """Called when a lookup in ``cache`` falls through to the registry."""
+
+    def cache_eviction(self, cache: str) -> None:
+        """Called when ``cache`` drops an entry to stay within its size bound."""
+
+    def registration_finished(self, registered: int, total: int, seconds: float) -> None:
+        """Called when register_all_aumos_schemas() returns.
+
+        Args:
+            registered: Subjects registered before returning.
+            total:      Subjects attempted.
+            seconds:    Time spent in the call.
+        """
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with Prometheus-style cumulative export.
+
+    Not thread-safe on its own; :class:`InMemoryMetrics` serializes access.
+
+    Args:
+        buckets: Sorted bucket upper bounds in seconds. Larger values land in an
+                 implicit ``+Inf`` bucket.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency."""
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile as the upper bound of the bucket containing it.
+
+        Returns ``inf`` if it falls past the last bound, and 0.0 if nothing was recorded.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def cumulative(self) -> dict[str, int]:
+        """Return ``{upper_bound: count of observations <= bound}``, ending with ``"+Inf"``."""
+        buckets: dict[str, int] = {}
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            seen += count
+            buckets[repr(bound)] = seen
+        buckets["+Inf"] = self.count
+        return buckets
+
+
+class InMemoryMetrics(RegistryObserver):
+    """Thread-safe observer that aggregates events in memory for scraping.
+
+    Args:
+        buckets: Latency histogram bucket bounds in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._requests: dict[str, LatencyHistogram] = {}
+        self._errors: defaultdict[str, int] = defaultdict(int)
+        self._cache: defaultdict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "evictions": 0})
+        self._registration: dict[str, Any] | None = None
+
+    def request_finished(self, method: str, endpoint: str, status: int | None, seconds: float) -> None:
+        key = f"{method} {endpoint}"
+        with self._lock:
+            histogram = self._requests.get(key)
+            if histogram is None:
+                histogram = self._requests[key] = LatencyHistogram(self._buckets)
+            histogram.observe(seconds)
+            if status is None or status >= 400:
+                self._errors[key] += 1
+
+    def cache_hit(self, cache: str) -> None:
+        with self._lock:
+            self._cache[cache]["hits"] += 1
+
+    def cache_miss(self, cache: str) -> None:
+        with self._lock:
+            self._cache[cache]["misses"] += 1
+
+    def cache_eviction(self, cache: str) -> None:
+        with self._lock:
+            self._cache[cache]["evictions"] += 1
+
+    def registration_finished(self, registered: int, total: int, seconds: float) -> None:
+        with self._lock:
+            self._registration = {"registered": registered, "total": total, "seconds": seconds}
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable copy of everything recorded so far.
+
+        Returns:
+            ``{"requests": {...}, "cache": {...}, "registration": {...} | None}``.
+            Requests are keyed ``"METHOD /endpoint/template"`` and report
+            ``count``, ``errors`` (HTTP 4xx/5xx and unreachable registry),
+            ``sum_seconds``, ``p50_seconds``/``p95_seconds``/``p99_seconds``
+            (bucket upper bounds) and cumulative ``buckets``. Caches report
+            ``hits``, ``misses``, ``evictions`` and ``hit_ratio``.
+        """
+        with self._lock:
+            requests = {
+                key: {
+                    "count": histogram.count,
+                    "errors": self._errors.get(key, 0),
+                    "sum_seconds": histogram.total,
+                    "p50_seconds": histogram.quantile(0.50),
+                    "p95_seconds": histogram.quantile(0.95),
+                    "p99_seconds": histogram.quantile(0.99),
+                    "buckets": histogram.cumulative(),
+                }
+                for key, histogram in self._requests.items()
+            }
+            cache = {
+                name: {**counts, "hit_ratio": _ratio(counts["hits"], counts["hits"] + counts["misses"])}
+                for name, counts in self._cache.items()
+            }
+            registration = dict(self._registration) if self._registration is not None else None
+        return {"requests": requests, "cache": cache, "registration": registration}
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._requests.clear()
+            self._errors.clear()
+            self._cache.clear()
+            self._registration = None
+
+
+def _ratio(part: int, whole: int) -> float:
+    return part / whole if whole else 0.0
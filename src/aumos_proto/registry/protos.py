@@ -0,0 +1,152 @@
+"""Load the AumOS ``.proto`` sources for registration with the schema registry.
+
+The registry stores Protobuf schemas as ``.proto`` text plus a list of
+references, one per import, each naming the subject and version under which
+the imported file is registered. This module reads a proto tree (the
+``proto/`` directory of this repository, or wherever
+``SchemaRegistryConfig.proto_descriptor_dir`` points), indexes files by import
+path and by the messages they declare, and fingerprints a file together with
+everything it imports, so unchanged schemas can be recognised without
+contacting the registry.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+# Imports the registry resolves itself when their sources are not vendored.
+WELL_KNOWN_PREFIX = "google/protobuf/"
+
+_COMMENT = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_PACKAGE = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+_IMPORT = re.compile(r'^\s*import\s+(?:public\s+|weak\s+)?"([^"]+)"\s*;', re.MULTILINE)
+_TOP_LEVEL_MESSAGE = re.compile(r"^message\s+(\w+)", re.MULTILINE)
+# Comments and string literals, blanked out before matching braces.
+_NON_CODE = re.compile(r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'", re.DOTALL)
+_LEADING_COMMENTS = re.compile(r"(?:^[ \t]*//[^\n]*\n)*\Z", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class ProtoSource:
+    """One ``.proto`` file, identified by its import path relative to the proto root."""
+
+    path: str
+    content: str
+    package: str
+    imports: tuple[str, ...]
+    messages: tuple[str, ...]
+
+    def declares(self, message_fqn: str) -> bool:
+        """Return True if this file declares the fully qualified top-level message."""
+        package, _, name = message_fqn.rpartition(".")
+        return package == self.package and name in self.messages
+
+
+def parse_proto_source(path: str, content: str) -> ProtoSource:
+    """Extract the package, imports and top-level message names of a ``.proto`` file."""
+    code = _COMMENT.sub("", content)
+    package = _PACKAGE.search(code)
+    return ProtoSource(
+        path=path,
+        content=content,
+        package=package.group(1) if package else "",
+        imports=tuple(_IMPORT.findall(code)),
+        messages=tuple(_TOP_LEVEL_MESSAGE.findall(code)),
+    )
+
+
+def load_proto_sources(root: str | Path) -> dict[str, ProtoSource]:
+    """Read every ``.proto`` file under ``root``, keyed by import path (e.g. ``"aumos/events/v1/audit_event.proto"``)."""
+    root_path = Path(root)
+    sources: dict[str, ProtoSource] = {}
+    for file_path in sorted(root_path.rglob("*.proto")):
+        import_path = file_path.relative_to(root_path).as_posix()
+        sources[import_path] = parse_proto_source(import_path, file_path.read_text())
+    return sources
+
+
+def find_message_source(sources: dict[str, ProtoSource], message_fqn: str) -> ProtoSource | None:
+    """Return the file declaring ``message_fqn``, or None if no file does."""
+    for source in sources.values():
+        if source.declares(message_fqn):
+            return source
+    return None
+
+
+def local_dependencies(sources: dict[str, ProtoSource], path: str) -> list[str]:
+    """Return the imports of ``path`` available in ``sources``, transitively, dependencies first."""
+    ordered: list[str] = []
+
+    def visit(current: str) -> None:
+        for imported in sources[current].imports:
+            if imported in sources and imported not in ordered:
+                visit(imported)
+                ordered.append(imported)
+
+    visit(path)
+    return ordered
+
+
+def proto_fingerprint(sources: dict[str, ProtoSource], path: str, message_fqn: str | None = None) -> str:
+    """SHA-256 over the content of a file and of every local file it imports, transitively.
+
+    With ``message_fqn``, the fingerprint is that of the schema registered for
+    the message (see :func:`message_schema`) rather than of the file alone.
+    """
+    digest = hashlib.sha256()
+    for dependency in [*local_dependencies(sources, path), path]:
+        digest.update(dependency.encode())
+        digest.update(b"\0")
+        digest.update(sources[dependency].content.encode())
+        digest.update(b"\0")
+    if message_fqn is not None:
+        digest.update(message_fqn.encode())
+    return digest.hexdigest()
+
+
+def message_schema(source: ProtoSource, message_fqn: str) -> str:
+    """Return the text of ``source`` with the top-level message ``message_fqn`` declared first.
+
+    Framed records carry only a schema ID, without a Confluent message index,
+    so readers take the first message of the schema as the record type. Moving
+    each subject's message to the front also gives subjects declared in the
+    same file distinct schemas, and therefore distinct schema IDs. Messages in
+    the file may still refer to each other, as every declaration is kept.
+
+    Raises:
+        ValueError: If ``source`` does not declare ``message_fqn``.
+    """
+    if not source.declares(message_fqn):
+        raise ValueError(f"{source.path} does not declare {message_fqn}")
+    name = message_fqn.rpartition(".")[2]
+    content = source.content
+    code = _NON_CODE.sub(lambda match: re.sub(r"[^\n]", " ", match.group()), content)
+    spans = {match.group(1): _message_span(content, code, match.start()) for match in _TOP_LEVEL_MESSAGE.finditer(code)}
+    first_start = min(start for start, _ in spans.values())
+    start, end = spans[name]
+    if start == first_start:
+        return content
+    block = content[start:end].rstrip("\n") + "\n\n"
+    reordered = content[:first_start] + block + content[first_start:start] + content[end:]
+    return reordered.rstrip("\n") + "\n" if content.endswith("\n") else reordered
+
+
+def _message_span(content: str, code: str, position: int) -> tuple[int, int]:
+    """Span of the message declared at ``position``, with its leading comment lines and line break."""
+    depth = 0
+    end = code.index("{", position)
+    while True:
+        char = code[end]
+        end += 1
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                break
+    if content.startswith("\n", end):
+        end += 1
+    leading = _LEADING_COMMENTS.search(content, 0, position)
+    return (leading.start() if leading else position), end
@@ -0,0 +1,100 @@
+"""Request coalescing for registry lookups.
+
+When a consumer pool starts, every worker misses the schema caches at once
+and asks the registry for the same subjects and schema IDs. Routing cache
+misses through :class:`SingleFlight` (threads) or :class:`AsyncSingleFlight`
+(coroutines) collapses concurrent calls for one key into a single request
+whose result, or exception, is handed to every caller. Nothing is cached
+here: once the call finishes the key is forgotten, and the caller's own
+cache answers later lookups.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable, Coroutine, Hashable
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """Thread-safe coalescing of concurrent calls that share a key.
+
+    The first thread to call :meth:`do` for a key runs the function; threads
+    arriving while it runs wait for and share its outcome.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[K, Future[V]] = {}
+
+    def __len__(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._calls)
+
+    def do(self, key: K, fn: Callable[[], V]) -> V:
+        """Return ``fn()``, or the result of the call already in flight for ``key``.
+
+        Raises:
+            Exception: Whatever the shared call raised, re-raised in every waiting thread.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                leader = True
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result()
+        try:
+            result = fn()
+        except BaseException as error:
+            self._forget(key)
+            call.set_exception(error)
+            raise
+        self._forget(key)
+        call.set_result(result)
+        return result
+
+    def _forget(self, key: K) -> None:
+        with self._lock:
+            del self._calls[key]
+
+
+class AsyncSingleFlight(Generic[K, V]):
+    """Coalescing of concurrent coroutine calls that share a key, within one event loop.
+
+    The shared call runs as a task, so cancelling one waiting caller does not
+    cancel the request for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[K, asyncio.Task[V]] = {}
+
+    def __len__(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._calls)
+
+    async def do(self, key: K, fn: Callable[[], Coroutine[Any, Any, V]]) -> V:
+        """Return ``await fn()``, or the result of the call already in flight for ``key``.
+
+        Raises:
+            Exception: Whatever the shared call raised, re-raised in every waiting caller.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = asyncio.create_task(fn())
+            call.add_done_callback(partial(self._forget, key))
+        return await asyncio.shield(call)
+
+    def _forget(self, key: K, call: asyncio.Task[V]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the outcome as retrieved even if every caller was cancelled.
+        if not call.cancelled():
+            call.exception()
@@ -0,0 +1,320 @@
+"""Mergeable quantile sketches of inference latency.
+
+Latency dashboards need p50/p95/p99 per model and hardware tier over days of
+:class:`MeteringEvent` traffic, which is too much to keep sample by sample.
+:class:`DDSketch` summarizes a stream of non-negative values in a bounded
+number of logarithmic buckets. Every quantile it reports is within
+``relative_accuracy`` of the exact quantile (1% by default), whatever the value
+range or the number of samples, as long as no bucket has been collapsed.
+Sketches of the same accuracy merge exactly: the merge of per-partition
+sketches equals the sketch of the combined stream.
+
+:class:`LatencySketches` keeps one sketch per :class:`LatencyKey` from the
+``inference_usage`` of metering events::
+
+    sketches = LatencySketches()
+    for event in events:
+        sketches.add_event(event)
+    state = json.dumps(sketches.to_dict())          # ship to an aggregator
+
+    combined = LatencySketches.from_dict(json.loads(state_a))
+    combined.merge(LatencySketches.from_dict(json.loads(state_b)))
+    combined.quantiles((0.5, 0.95, 0.99))
+    # {LatencyKey("llama-3-70b", "gpu-a100"): {0.5: 41.8, 0.95: 120.3, 0.99: 310.7}, ...}
+
+Based on DDSketch (Masson, Rim and Lee, VLDB 2019).
+"""
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from aumos_proto.events.v1 import MeteringEvent
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+DEFAULT_QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+# Values at or below this go to the zero bucket instead of a logarithmic one.
+_MIN_INDEXABLE = 1e-9
+
+
+class DDSketch:
+    """Relative-error quantile sketch of non-negative values.
+
+    A value ``x`` is counted in bucket ``ceil(log(x) / log(gamma))`` with
+    ``gamma = (1 + a) / (1 - a)``, and each bucket reports its values as one
+    representative within relative error ``a`` of all of them. Memory is at
+    most ``max_bins`` buckets: when more are needed, the lowest buckets are
+    folded together, which keeps the upper quantiles accurate at the expense
+    of the lowest ones. Values at or below zero are counted as zero.
+
+    Args:
+        relative_accuracy: Relative error bound ``a`` of reported quantiles, in (0, 1).
+        max_bins:          Maximum number of buckets kept.
+
+    Raises:
+        ValueError: If ``relative_accuracy`` or ``max_bins`` is out of range.
+    """
+
+    __slots__ = (
+        "_bins", "_log_gamma", "count", "gamma", "max", "max_bins", "min", "relative_accuracy", "sum", "zero_count",
+    )
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_bins: int = DEFAULT_MAX_BINS) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if max_bins < 1:
+            raise ValueError("max_bins must be positive")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        """Number of buckets in use."""
+        return len(self._bins)
+
+    def __repr__(self) -> str:
+        return f"DDSketch(count={self.count}, relative_accuracy={self.relative_accuracy}, bins={len(self._bins)})"
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Count ``value`` ``count`` times.
+
+        Raises:
+            ValueError: If ``value`` is NaN or positive infinity, or ``count`` is not positive.
+        """
+        if count < 1:
+            raise ValueError(f"count must be positive, got {count}")
+        if value > _MIN_INDEXABLE:
+            if value == math.inf:
+                raise ValueError("Cannot add an infinite value to a sketch")
+            index = math.ceil(math.log(value) / self._log_gamma)
+            bins = self._bins
+            if index in bins:
+                bins[index] += count
+            else:
+                bins[index] = count
+                if len(bins) > self.max_bins:
+                    self._collapse()
+        elif value == value:
+            value = max(value, 0.0)
+            self.zero_count += count
+        else:
+            raise ValueError("Cannot add NaN to a sketch")
+        self.count += count
+        self.sum += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_many(self, values: Iterable[float]) -> None:
+        """Count each of ``values`` once.
+
+        Raises:
+            ValueError: If a value is NaN or positive infinity; the values before it stay counted.
+        """
+        for value in values:
+            self.add(value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0 <= q <= 1); NaN if the sketch is empty.
+
+        Raises:
+            ValueError: If ``q`` is outside [0, 1].
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return math.nan
+        if q == 0.0:
+            return self.min
+        if q == 1.0:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if seen > rank:
+                estimate = 2.0 * self.gamma**index / (self.gamma + 1.0)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> dict[float, float]:
+        """Return ``{q: quantile(q)}`` for each of ``qs``."""
+        return {q: self.quantile(q) for q in qs}
+
+    @property
+    def mean(self) -> float:
+        """Mean of the counted values; NaN if the sketch is empty."""
+        return self.sum / self.count if self.count else math.nan
+
+    def merge(self, other: DDSketch) -> None:
+        """Add the values counted by ``other`` into this sketch.
+
+        Raises:
+            ValueError: If the sketches use a different relative accuracy.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                f"Cannot merge sketches with relative accuracy {other.relative_accuracy} and {self.relative_accuracy}"
+            )
+        bins = self._bins
+        for index, count in other._bins.items():
+            bins[index] = bins.get(index, 0) + count
+        if len(bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> DDSketch:
+        """Return an independent copy."""
+        copied = DDSketch(self.relative_accuracy, self.max_bins)
+        copied.merge(self)
+        return copied
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable form of the sketch state."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "count": self.count,
+            "zero_count": self.zero_count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "bins": [[index, self._bins[index]] for index in sorted(self._bins)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DDSketch:
+        """Rebuild a sketch from :meth:`to_dict` output."""
+        sketch = cls(data["relative_accuracy"], data["max_bins"])
+        sketch._bins = {int(index): int(count) for index, count in data["bins"]}
+        sketch.count = data["count"]
+        sketch.zero_count = data["zero_count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets into one so that at most ``max_bins`` remain."""
+        indexes = sorted(self._bins)
+        excess = len(indexes) - self.max_bins
+        target = indexes[excess]
+        bins = self._bins
+        for index in indexes[:excess]:
+            bins[target] += bins.pop(index)
+
+
+class LatencyKey(NamedTuple):
+    """Dimensions latency sketches are kept for."""
+
+    model_id: str
+    hardware_tier: str
+
+
+class LatencySketches:
+    """One :class:`DDSketch` of ``InferenceUsage.latency_ms`` per model and hardware tier.
+
+    Args:
+        relative_accuracy: Relative error bound of every sketch.
+        max_bins:          Bucket bound of every sketch.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_bins: int = DEFAULT_MAX_BINS) -> None:
+        # Validates the parameters before any event is added.
+        DDSketch(relative_accuracy, max_bins)
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._sketches: dict[LatencyKey, DDSketch] = {}
+
+    def __len__(self) -> int:
+        return len(self._sketches)
+
+    def __iter__(self) -> Iterator[LatencyKey]:
+        return iter(self._sketches)
+
+    def __getitem__(self, key: LatencyKey) -> DDSketch:
+        return self._sketches[key]
+
+    def items(self) -> Iterator[tuple[LatencyKey, DDSketch]]:
+        """Yield ``(key, sketch)`` pairs."""
+        return iter(self._sketches.items())
+
+    def add(self, model_id: str, hardware_tier: str, latency_ms: float) -> None:
+        """Count one latency sample.
+
+        Raises:
+            ValueError: If ``latency_ms`` is NaN or positive infinity.
+        """
+        key = LatencyKey(model_id, hardware_tier)
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = DDSketch(self.relative_accuracy, self.max_bins)
+        sketch.add(latency_ms)
+
+    def add_event(self, event: MeteringEvent) -> None:
+        """Count the latency of a metering event; events without ``inference_usage`` are ignored."""
+        usage = event.inference_usage
+        if usage is not None:
+            self.add(usage.model_id, usage.hardware_tier, usage.latency_ms)
+
+    def add_many(self, events: Iterable[MeteringEvent]) -> None:
+        """Count the latency of each metering event."""
+        for event in events:
+            self.add_event(event)
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> dict[LatencyKey, dict[float, float]]:
+        """Return ``{key: {q: latency_ms}}`` for every key."""
+        return {key: sketch.quantiles(qs) for key, sketch in self._sketches.items()}
+
+    def merge(self, other: LatencySketches) -> None:
+        """Add the sketches of ``other``, e.g. from another partition or process.
+
+        Raises:
+            ValueError: If the sketches use a different relative accuracy.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                f"Cannot merge sketches with relative accuracy {other.relative_accuracy} and {self.relative_accuracy}"
+            )
+        for key, sketch in other._sketches.items():
+            existing = self._sketches.get(key)
+            if existing is None:
+                self._sketches[key] = sketch.copy()
+            else:
+                existing.merge(sketch)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable form, one entry per key."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "sketches": [{**key._asdict(), "sketch": sketch.to_dict()} for key, sketch in self._sketches.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LatencySketches:
+        """Rebuild the sketches from :meth:`to_dict` output."""
+        sketches = cls(data["relative_accuracy"], data["max_bins"])
+        for entry in data["sketches"]:
+            key = LatencyKey(entry["model_id"], entry["hardware_tier"])
+            sketches._sketches[key] = DDSketch.from_dict(entry["sketch"])
+        return sketches
@@ -0,0 +1,392 @@
+"""Tests for the proto3 binary wire codec behind SerializeToString / FromString."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import ClassVar
+
+import pytest
+
+from aumos_proto.codec import FieldKind, ProtoField, ProtoMessage
+from aumos_proto.models.v1.job_pb2 import Job
+
+# ---------------------------------------------------------------------------
+# Wire primitives
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    ("value", "encoded"),
+    [
+        (0, b"\x00"),
+        (1, b"\x01"),
+        (150, b"\x96\x01"),
+        (300, b"\xac\x02"),
+        (-1, b"\xff\xff\xff\xff\xff\xff\xff\xff\xff\x01"),
+    ],
+)
+def test_varint_encoding_matches_protobuf_spec(value: int, encoded: bytes) -> None:
+    from aumos_proto.codec.wire import decode_varint, encode_varint, to_signed64
+
+    out = bytearray()
+    encode_varint(value, out)
+    assert bytes(out) == encoded
+    raw, pos = decode_varint(encoded, 0)
+    assert to_signed64(raw) == value
+    assert pos == len(encoded)
+
+
+@pytest.mark.parametrize(("value", "zigzag"), [(0, 0), (-1, 1), (1, 2), (-2, 3), (2147483647, 4294967294)])
+def test_zigzag_roundtrip(value: int, zigzag: int) -> None:
+    from aumos_proto.codec.wire import zigzag_decode, zigzag_encode
+
+    assert zigzag_encode(value) == zigzag
+    assert zigzag_decode(zigzag) == value
+
+
+def test_truncated_varint_raises_decode_error() -> None:
+    from aumos_proto.codec import DecodeError
+    from aumos_proto.codec.wire import decode_varint
+
+    with pytest.raises(DecodeError, match="Truncated"):
+        decode_varint(b"\x96", 0)
+
+
+# ---------------------------------------------------------------------------
+# Message encoding
+# ---------------------------------------------------------------------------
+
+
+def test_serialize_produces_proto3_field_encoding() -> None:
+    from aumos_proto.api.v1.common_pb2 import PaginationRequest
+
+    request = PaginationRequest(page=1, page_size=150, sort_by="name")
+    # field 1 varint 1, field 2 varint 150, field 3 string "name"
+    assert request.SerializeToString() == b"\x08\x01\x10\x96\x01\x1a\x04name"
+
+
+def test_zero_values_are_omitted_and_read_back_as_defaults() -> None:
+    from aumos_proto.api.v1.common_pb2 import PaginationRequest
+
+    serialized = PaginationRequest(page=0, page_size=0).SerializeToString()
+    assert serialized == b""
+    restored = PaginationRequest.FromString(serialized)
+    assert restored.page == 0
+    assert restored.page_size == 0
+
+
+def test_timestamp_and_struct_roundtrip() -> None:
+    from aumos_proto.events.v1.audit_event_pb2 import AuditEvent
+
+    timestamp = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    original = AuditEvent(
+        tenant_id="tenant-1",
+        action="update",
+        details={"reason": "policy", "attempts": 3, "flags": [True, None], "nested": {"k": "v"}},
+        timestamp=timestamp,
+    )
+    restored = AuditEvent.FromString(original.SerializeToString())
+
+    assert restored.event_id == original.event_id
+    assert restored.timestamp == timestamp
+    # Struct numbers are doubles on the wire, as in every protobuf runtime.
+    assert restored.details == {"reason": "policy", "attempts": 3.0, "flags": [True, None], "nested": {"k": "v"}}
+
+
+def test_timestamps_outside_the_datetime_range_raise_decode_error() -> None:
+    from aumos_proto.codec import DecodeError, Timestamp
+    from aumos_proto.events.v1.audit_event_pb2 import AuditEvent
+
+    for boundary in (datetime.min.replace(tzinfo=timezone.utc), datetime.max.replace(tzinfo=timezone.utc)):
+        assert AuditEvent.FromString(AuditEvent(timestamp=boundary).SerializeToString()).timestamp == boundary
+
+    for seconds, nanos in ((253_402_300_800, 0), (-62_135_596_801, 0), (-(1 << 63), 0), (0, -1), (0, 1_000_000_000)):
+        payload = AuditEvent(timestamp=Timestamp(seconds, nanos)).SerializeToString()
+        with pytest.raises(DecodeError, match="Timestamp out of range"):
+            AuditEvent.FromString(payload)
+        with pytest.raises(DecodeError, match="Timestamp out of range"):
+            AuditEvent.parse_many([payload])
+        assert AuditEvent.FromString(payload, compact_timestamps=True).timestamp == Timestamp(seconds, nanos)
+
+
+def test_enum_repeated_and_negative_int_roundtrip() -> None:
+    from aumos_proto.events.v1.agent_envelope_pb2 import AgentEnvelope
+    from aumos_proto.events.v1.governance_decision_pb2 import GovernanceDecision, GovernanceDecisionEvent
+
+    decision = GovernanceDecisionEvent(decision=GovernanceDecision.ESCALATED, violations=["pii", "cost"])
+    restored = GovernanceDecisionEvent.FromString(decision.SerializeToString())
+    assert restored.decision is GovernanceDecision.ESCALATED
+    assert restored.violations == ["pii", "cost"]
+
+    envelope = AgentEnvelope(privilege_level=-2, metadata={"trace": "abc"})
+    restored_envelope = AgentEnvelope.FromString(envelope.SerializeToString())
+    assert restored_envelope.privilege_level == -2
+    assert restored_envelope.metadata == {"trace": "abc"}
+
+
+def test_metering_oneof_and_nested_message_roundtrip() -> None:
+    from aumos_proto.events.v1.metering_event_pb2 import MeteringEvent, TokenUsage
+
+    original = MeteringEvent(
+        tenant_id="t-1",
+        timestamp_ms=1_767_225_600_000,
+        token_usage=TokenUsage(model_id="claude", input_tokens=1200, output_tokens=300, estimated_cost_usd=0.0125),
+        labels={"region": "eu"},
+    )
+    restored = MeteringEvent.FromString(original.SerializeToString())
+
+    assert restored == original
+    assert restored.inference_usage is None
+
+
+def test_map_of_messages_and_optional_timestamps() -> None:
+    from aumos_proto.api.v1.health_pb2 import ComponentHealth, HealthResponse
+    from aumos_proto.models.v1.job_pb2 import Job
+
+    health = HealthResponse(service="api", components={"db": ComponentHealth(status="ok", latency_ms=2.5)})
+    assert HealthResponse.FromString(health.SerializeToString()) == health
+
+    job = Job(id="j-1", started_at=None)
+    restored_job = Job.FromString(job.SerializeToString())
+    assert restored_job.started_at is None
+    assert restored_job.completed_at is None
+
+
+def test_unknown_fields_are_skipped() -> None:
+    from aumos_proto.api.v1.common_pb2 import PaginationRequest
+
+    # field 1 = 5, then unknown field 99 (varint) and unknown field 100 (length-delimited)
+    payload = b"\x08\x05" + b"\x98\x06\x2a" + b"\xa2\x06\x03abc"
+    restored = PaginationRequest.FromString(payload)
+    assert restored.page == 5
+
+
+def test_binary_payload_is_smaller_than_json() -> None:
+    import dataclasses
+    import json
+
+    from aumos_proto.events.v1.usage_metrics_pb2 import UsageMetricsEvent
+
+    event = UsageMetricsEvent(tenant_id="tenant-abc", service_name="aumos-llm", metric_type="api_call", value=1.0)
+    as_json = json.dumps({**dataclasses.asdict(event), "timestamp": event.timestamp.isoformat()}).encode("utf-8")
+    assert len(event.SerializeToString()) * 2 < len(as_json)
+
+
+def test_truncated_payload_raises_decode_error() -> None:
+    from aumos_proto.codec import DecodeError
+    from aumos_proto.events.v1.audit_event_pb2 import AuditEvent
+
+    serialized = AuditEvent(tenant_id="tenant-1").SerializeToString()
+    with pytest.raises(DecodeError):
+        AuditEvent.FromString(serialized[:-3])
+
+
+def test_invalid_utf8_raises_decode_error() -> None:
+    from aumos_proto.codec import DecodeError
+    from aumos_proto.events.v1.audit_event_pb2 import AuditEvent
+    from aumos_proto.events.v1.metering_event_pb2 import MeteringEvent
+
+    with pytest.raises(DecodeError, match="UTF-8"):
+        MeteringEvent.FromString(b"\x0a\x02\xff\xfe")
+
+    # Replace a two-character "\u00e9\u00e9" (4 bytes of UTF-8) with 4 invalid bytes.
+    def corrupt(message: ProtoMessage) -> bytes:
+        return message.SerializeToString().replace("\u00e9\u00e9".encode(), b"\xff\xfe\xff\xfe")
+
+    for payload in (corrupt(AuditEvent(action="\u00e9\u00e9")), corrupt(AuditEvent(details={"k": "\u00e9\u00e9"}))):
+        with pytest.raises(DecodeError, match="UTF-8"):
+            AuditEvent.FromString(payload)
+        with pytest.raises(DecodeError, match="UTF-8"):
+            AuditEvent.parse_many([payload])
+    view = AuditEvent.FromString(corrupt(AuditEvent(action="\u00e9\u00e9")), lazy=True)
+    with pytest.raises(DecodeError, match="UTF-8"):
+        _ = view.action
+    labels = corrupt(MeteringEvent(labels={"\u00e9\u00e9": "v"}))
+    with pytest.raises(DecodeError, match="UTF-8"):
+        MeteringEvent.FromString(labels)
+
+
+# ---------------------------------------------------------------------------
+# Compiled encode/decode plans
+# ---------------------------------------------------------------------------
+
+
+def test_codec_functions_are_compiled_once_per_class() -> None:
+    from aumos_proto.events.v1.lock_event_pb2 import LockAcquiredEvent, LockReleasedEvent
+
+    LockAcquiredEvent(lock_name="a").SerializeToString()
+    encoder = LockAcquiredEvent.__dict__["_proto_encode"]
+    LockAcquiredEvent(lock_name="b").SerializeToString()
+
+    assert LockAcquiredEvent.__dict__["_proto_encode"] is encoder
+    assert "compile" not in encoder.__qualname__
+    assert LockReleasedEvent.__dict__["_proto_encode"] is not encoder
+
+
+@dataclass
+class _Samples(ProtoMessage):
+    """Message exercising packed repeated scalars, which no AumOS schema uses yet."""
+
+    values: list[int] = field(default_factory=list)
+    deltas: list[int] = field(default_factory=list)
+
+    _proto_name: ClassVar[str] = "test.Samples"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "values", FieldKind.INT32, repeated=True),
+        ProtoField(2, "deltas", FieldKind.SINT64, repeated=True),
+    )
+
+
+def test_packed_repeated_scalars_encode_packed_and_decode_either_form() -> None:
+    message = _Samples(values=[1, 150, -1], deltas=[-1, 2])
+    serialized = message.SerializeToString()
+    assert serialized.startswith(b"\x0a\x0d\x01\x96\x01")  # one packed field: tag, length 13, values...
+    assert _Samples.FromString(serialized) == message
+
+    unpacked = b"\x08\x03\x08\x04\x10\x03"  # values 3 and 4 unpacked, deltas -2 (ZigZag 3)
+    assert _Samples.FromString(unpacked) == _Samples(values=[3, 4], deltas=[-2])
+
+
+def test_unknown_enum_values_are_kept_as_ints() -> None:
+    from aumos_proto.events.v1.security_alert_pb2 import SecurityAlertEvent
+
+    restored = SecurityAlertEvent.FromString(b"\x18\x2a")  # severity = 42
+    assert restored.severity == 42
+
+
+def test_lazy_view_matches_full_decode() -> None:
+    from aumos_proto.codec import LazyMessage
+    from aumos_proto.events.v1.audit_event_pb2 import AuditEvent
+    from aumos_proto.models.v1.model_pb2 import Model
+
+    for original in (
+        AuditEvent(event_id="e-1", tenant_id="t-1", source_service="gateway", details={"rule": "r-9", "score": 0.5}),
+        Model(id="m-1", tags=["a", "b"], metrics={"f1": 0.9}),
+    ):
+        data = original.SerializeToString()
+        view = type(original).FromString(data, lazy=True)
+
+        assert isinstance(view, LazyMessage)
+        for spec in original._proto_fields:
+            assert getattr(view, spec.name) == getattr(original, spec.name)
+        assert view.to_message() == original
+        assert view.SerializeToString() == data
+
+
+def test_lazy_view_decodes_only_the_fields_read() -> None:
+    from aumos_proto.codec import DecodeError
+    from aumos_proto.events.v1.audit_event_pb2 import AuditEvent
+
+    # tenant_id = "t-1", then a `details` Struct whose inner entry is truncated.
+    data = b"\x12\x03t-1" + b"\x42\x02\x0a\x05"
+    with pytest.raises(DecodeError):
+        AuditEvent.FromString(data)
+
+    view = AuditEvent.FromString(data, lazy=True)
+    assert view.tenant_id == "t-1"
+    assert view.event_id == ""
+    with pytest.raises(DecodeError):
+        _ = view.details
+
+
+def test_lazy_view_oneof_last_member_wins() -> None:
+    from aumos_proto.events.v1.metering_event_pb2 import InferenceUsage, MeteringEvent, TokenUsage
+
+    data = (
+        MeteringEvent(token_usage=TokenUsage(model_id="m", input_tokens=5)).SerializeToString()
+        + MeteringEvent(inference_usage=InferenceUsage(model_id="m", latency_ms=12.5)).SerializeToString()
+    )
+    view = MeteringEvent.FromString(data, lazy=True)
+
+    assert view.token_usage is None
+    assert view.inference_usage == MeteringEvent.FromString(data).inference_usage
+
+
+def test_lazy_view_is_read_only() -> None:
+    from aumos_proto.events.v1.audit_event_pb2 import AuditEvent
+
+    view = AuditEvent.FromString(AuditEvent(tenant_id="t-1").SerializeToString(), lazy=True)
+    with pytest.raises(AttributeError):
+        view.tenant_id = "t-2"
+    with pytest.raises(AttributeError):
+        _ = view.not_a_field
+    assert view.to_message().tenant_id == "t-1"
+
+
+def test_serialize_many_and_parse_many_match_single_message_calls() -> None:
+    from aumos_proto.events.v1.metering_event_pb2 import MeteringEvent, TokenUsage
+    from aumos_proto.events.v1.usage_metrics_pb2 import UsageMetricsEvent
+
+    metering = [
+        MeteringEvent(tenant_id="t-1", timestamp_ms=i, token_usage=TokenUsage(model_id="m", input_tokens=i), labels={"i": str(i)})
+        for i in range(50)
+    ]
+    usage = [UsageMetricsEvent(tenant_id="t-1", metric_type="tokens", value=float(i)) for i in range(50)]
+
+    # Reversed, each payload is shorter than the one before it in the reused scratch buffer.
+    for cls, batch in ((MeteringEvent, metering), (MeteringEvent, metering[::-1]), (UsageMetricsEvent, usage)):
+        payloads = cls.serialize_many(iter(batch))
+        assert payloads == [message.SerializeToString() for message in batch]
+        assert cls.parse_many(payloads) == batch
+        assert cls.serialize_many([]) == []
+        assert cls.parse_many([]) == []
+
+
+def test_parse_many_raises_on_malformed_payload() -> None:
+    from aumos_proto.codec import DecodeError
+    from aumos_proto.events.v1.usage_metrics_pb2 import UsageMetricsEvent
+
+    good = UsageMetricsEvent(tenant_id="t-1").SerializeToString()
+    with pytest.raises(DecodeError):
+        UsageMetricsEvent.parse_many([good, good[:-2]])
+
+
+@dataclass
+class _Span(ProtoMessage):
+    """Message nesting a Timestamp one level down, which no AumOS schema does yet."""
+
+    job: Job | None = None
+    closed_at: datetime | None = None
+
+    _proto_name: ClassVar[str] = "test.Span"
+    _proto_fields: ClassVar[tuple[ProtoField, ...]] = (
+        ProtoField(1, "job", FieldKind.MESSAGE, message_type=Job),
+        ProtoField(2, "closed_at", FieldKind.TIMESTAMP),
+    )
+
+
+def test_timestamp_compares_with_datetime_and_converts_lazily() -> None:
+    from aumos_proto.codec import Timestamp
+
+    moment = datetime(2026, 1, 1, 12, 0, 0, 250_000, tzinfo=timezone.utc)
+    stamp = Timestamp.from_datetime(moment)
+
+    assert (stamp.seconds, stamp.nanos) == (1_767_268_800, 250_000_000)
+    assert stamp == moment
+    assert hash(stamp) == hash(moment)
+    assert Timestamp(stamp.seconds, stamp.nanos + 999) == moment  # sub-microsecond digits are dropped
+    assert stamp < Timestamp(stamp.seconds + 1)
+    assert stamp.to_datetime() is stamp.to_datetime()
+    assert stamp.to_nanos() == 1_767_268_800_250_000_000
+    assert Timestamp(-1, 500_000_000).to_datetime() == datetime(1969, 12, 31, 23, 59, 59, 500_000, tzinfo=timezone.utc)
+
+
+def test_compact_timestamps_roundtrip_through_every_decode_path() -> None:
+    from aumos_proto.codec import Timestamp
+
+    started = datetime(2026, 3, 1, 8, 30, tzinfo=timezone.utc)
+    span = _Span(job=Job(id="j-1", created_at=started, started_at=started), closed_at=started)
+    data = span.SerializeToString()
+
+    compact = _Span.FromString(data, compact_timestamps=True)
+    assert compact == span
+    assert isinstance(compact.closed_at, Timestamp)
+    assert isinstance(compact.job.started_at, Timestamp)
+    assert compact.job.completed_at is None
+    assert isinstance(_Span.FromString(data).job.started_at, datetime)
+
+    assert compact.SerializeToString() == data
+    assert isinstance(_Span.parse_many([data], compact_timestamps=True)[0].closed_at, Timestamp)
+    view = _Span.FromString(data, lazy=True, compact_timestamps=True)
+    assert isinstance(view.closed_at, Timestamp)
+    assert isinstance(view.to_message().job.created_at, Timestamp)
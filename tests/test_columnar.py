@@ -0,0 +1,183 @@
+"""Tests for columnar batches of metering and usage events."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from aumos_proto.events.v1 import MeteringEvent
+
+
+def _metering_events() -> list[MeteringEvent]:
+    from aumos_proto.events.v1 import InferenceUsage, MeteringEvent, StorageUsage, SyntheticDataUsage, TokenUsage
+
+    return [
+        MeteringEvent(
+            tenant_id="t-1", project_id="p-1", service_name="llm", timestamp_ms=1_000,
+            token_usage=TokenUsage(model_id="gpt-4o", provider="openai", input_tokens=100, output_tokens=20,
+                                   estimated_cost_usd=0.5),
+        ),
+        MeteringEvent(
+            tenant_id="t-2", project_id="p-2", service_name="llm", timestamp_ms=2_000,
+            token_usage=TokenUsage(model_id="llama-3", provider="local", input_tokens=40, output_tokens=4),
+        ),
+        MeteringEvent(
+            tenant_id="t-1", project_id="p-1", service_name="serving", timestamp_ms=3_000,
+            inference_usage=InferenceUsage(model_id="llama-3", latency_ms=12.5, compute_ms=30, hardware_tier="gpu"),
+        ),
+        MeteringEvent(
+            tenant_id="t-1", project_id="p-3", service_name="llm", timestamp_ms=4_000,
+            token_usage=TokenUsage(model_id="gpt-4o", provider="openai", input_tokens=7, output_tokens=1,
+                                   estimated_cost_usd=0.25),
+            labels={"region": "eu"},
+        ),
+        MeteringEvent(
+            tenant_id="t-2", service_name="storage",
+            storage_usage=StorageUsage(bytes_read=10, bytes_written=5, storage_tier="hot"),
+        ),
+        MeteringEvent(
+            tenant_id="t-3", service_name="synth",
+            synthetic_usage=SyntheticDataUsage(records_generated=1_000, data_modality="tabular",
+                                               generation_duration_ms=2.5),
+        ),
+        MeteringEvent(tenant_id="t-3", service_name="noop"),
+    ]
+
+
+def test_metering_batch_flattens_the_resource_oneof() -> None:
+    from aumos_proto.columnar import MeteringBatch
+
+    events = _metering_events()
+    batch = MeteringBatch.from_events(iter(events))
+
+    assert len(batch) == 7
+    assert batch.event_id.tolist() == [event.event_id for event in events]
+    assert batch.tenant_id.tolist() == ["t-1", "t-2", "t-1", "t-1", "t-2", "t-3", "t-3"]
+    assert batch.tenant_id.categories == ("t-1", "t-2", "t-3")
+    assert batch.resource.tolist() == [
+        "token_usage", "token_usage", "inference_usage", "token_usage", "storage_usage", "synthetic_usage", "",
+    ]
+    assert batch.model_id.tolist() == ["gpt-4o", "llama-3", "llama-3", "gpt-4o", "", "", ""]
+    assert batch.provider.tolist() == ["openai", "local", "", "openai", "", "", ""]
+    assert batch.input_tokens.tolist() == [100, 40, 0, 7, 0, 0, 0]
+    assert batch.estimated_cost_usd.tolist() == [0.5, 0.0, 0.0, 0.25, 0.0, 0.0, 0.0]
+    assert batch.latency_ms.tolist() == [0.0, 0.0, 12.5, 0.0, 0.0, 0.0, 0.0]
+    assert batch.compute_ms.tolist() == [0, 0, 30, 0, 0, 0, 0]
+    assert batch.hardware_tier.tolist() == ["", "", "gpu", "", "", "", ""]
+    assert batch.bytes_read.tolist() == [0, 0, 0, 0, 10, 0, 0]
+    assert batch.storage_tier.tolist() == ["", "", "", "", "hot", "", ""]
+    assert batch.records_generated.tolist() == [0, 0, 0, 0, 0, 1_000, 0]
+    assert batch.data_modality.tolist() == ["", "", "", "", "", "tabular", ""]
+    assert batch.timestamp_ms.dtype.name == "int64"
+    assert batch.labels[3] == {"region": "eu"}
+    assert repr(batch) == "MeteringBatch(7 rows)"
+
+
+def test_metering_batch_uses_the_last_oneof_field_like_the_decoder() -> None:
+    from aumos_proto.columnar import MeteringBatch
+    from aumos_proto.events.v1 import InferenceUsage, MeteringEvent, TokenUsage
+
+    event = MeteringEvent(
+        token_usage=TokenUsage(model_id="a", input_tokens=5),
+        inference_usage=InferenceUsage(model_id="b", compute_ms=9),
+    )
+    decoded = MeteringEvent.FromString(event.SerializeToString())
+    batch = MeteringBatch.from_events([event])
+
+    assert decoded.token_usage is None
+    assert batch.resource.tolist() == ["inference_usage"]
+    assert batch.model_id.tolist() == ["b"]
+    assert batch.input_tokens.tolist() == [0]
+
+
+def test_filters_and_group_sums_run_on_columns() -> None:
+    from aumos_proto.columnar import MeteringBatch
+
+    batch = MeteringBatch.from_events(_metering_events())
+
+    tenant_one = batch.filter(batch.tenant_id.equals("t-1"))
+    assert tenant_one.input_tokens.sum() == 107
+    assert tenant_one.tenant_id.categories == batch.tenant_id.categories
+    assert batch.filter(batch.tenant_id.isin(["t-2", "t-9"])).service_name.tolist() == ["llm", "storage"]
+    assert not batch.tenant_id.equals("t-9").any()
+    assert batch.filter(batch.input_tokens > 50).model_id.tolist() == ["gpt-4o"]
+    assert len(batch.filter(slice(0, 2))) == 2
+
+    tokens = batch.filter(batch.resource.equals("token_usage"))
+    assert tokens.group_sum("model_id", "input_tokens") == {"gpt-4o": 107, "llama-3": 40}
+    assert tokens.group_sum(["tenant_id", "model_id"], "output_tokens") == {
+        ("t-1", "gpt-4o"): 21,
+        ("t-2", "llama-3"): 4,
+    }
+    assert tokens.group_sum("tenant_id", "estimated_cost_usd") == {"t-1": 0.75, "t-2": 0.0}
+    assert batch.group_sum("resource", "compute_ms")["inference_usage"] == 30
+    assert batch.filter(batch.input_tokens > 1_000).group_sum("tenant_id", "input_tokens") == {}
+
+
+def test_group_sum_rejects_unknown_and_mistyped_columns() -> None:
+    from aumos_proto.columnar import MeteringBatch
+
+    batch = MeteringBatch.from_events(_metering_events())
+    with pytest.raises(KeyError, match="no column 'tenant'"):
+        batch.group_sum("tenant", "input_tokens")
+    with pytest.raises(TypeError, match="non-string column 'input_tokens'"):
+        batch.group_sum("input_tokens", "output_tokens")
+    with pytest.raises(TypeError, match="non-numeric column 'event_id'"):
+        batch.group_sum("tenant_id", "event_id")
+
+
+def test_group_sum_compacts_wide_composite_keys() -> None:
+    import numpy as np
+
+    from aumos_proto import columnar
+    from aumos_proto.columnar import MeteringBatch
+
+    batch = MeteringBatch.from_events(_metering_events())
+    expected = batch.group_sum(["tenant_id", "project_id", "service_name"], "input_tokens")
+    original = columnar._MAX_GROUP_RADIX
+    columnar._MAX_GROUP_RADIX = 2
+    try:
+        assert batch.group_sum(["tenant_id", "project_id", "service_name"], "input_tokens") == expected
+    finally:
+        columnar._MAX_GROUP_RADIX = original
+    assert sum(expected.values()) == int(np.sum(batch.input_tokens))
+
+
+def test_iter_batches_bounds_rows_per_batch() -> None:
+    from aumos_proto.columnar import MeteringBatch
+
+    events = _metering_events()
+    batches = list(MeteringBatch.iter_batches(iter(events), batch_size=3))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert sum(int(batch.input_tokens.sum()) for batch in batches) == 147
+    assert list(MeteringBatch.iter_batches([])) == []
+    assert len(MeteringBatch.from_events([])) == 0
+
+
+def test_usage_metrics_batch_columns() -> None:
+    from aumos_proto.codec import Timestamp
+    from aumos_proto.columnar import DictionaryColumn, UsageMetricsBatch
+    from aumos_proto.events.v1 import UsageMetricsEvent
+
+    at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    events = [
+        UsageMetricsEvent(tenant_id="t-1", service_name="api", metric_type="api_call", value=3.0, unit="calls",
+                          timestamp=at),
+        UsageMetricsEvent(tenant_id="t-2", service_name="gpu", metric_type="gpu_seconds", value=1.5, unit="s",
+                          timestamp=Timestamp(int(at.timestamp()), 500)),
+        UsageMetricsEvent(tenant_id="t-1", service_name="api", metric_type="api_call", value=2.0, unit="calls",
+                          labels={"route": "/v1"}, timestamp=at),
+    ]
+    batch = UsageMetricsBatch.from_events(events)
+
+    assert batch.metric_type.categories == ("api_call", "gpu_seconds")
+    assert isinstance(batch.unit, DictionaryColumn)
+    assert batch.timestamp_ns.tolist() == [1_767_225_600_000_000_000, 1_767_225_600_000_000_500, 1_767_225_600_000_000_000]
+    assert batch.group_sum(["tenant_id", "metric_type"], "value") == {
+        ("t-1", "api_call"): 5.0,
+        ("t-2", "gpu_seconds"): 1.5,
+    }
+    assert batch.labels[2] == {"route": "/v1"}
+    assert UsageMetricsBatch.column_names()[-1] == "timestamp_ns"
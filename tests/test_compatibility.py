@@ -0,0 +1,148 @@
+"""Tests for the offline BACKWARD compatibility checker."""
+from __future__ import annotations
+
+import shutil
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+_PROTO_ROOT = Path(__file__).resolve().parents[1] / "proto"
+_METERING = "aumos/events/v1/metering_event.proto"
+
+_BASE = """
+syntax = "proto3";
+package aumos.test.v1;
+
+import "google/protobuf/timestamp.proto";
+
+// Comments { with braces } are ignored.
+message Event {
+  reserved 20, 30 to 32;
+  string event_id = 1;
+  Status status = 2;
+  repeated string tags = 3 [packed = false];
+  google.protobuf.Timestamp created_at = 4;
+  oneof payload {
+    Detail detail = 5;
+    string note = 6;
+  }
+  map<string, int64> counters = 7;
+
+  message Detail {
+    int32 code = 1;
+  }
+}
+
+enum Status {
+  STATUS_UNSPECIFIED = 0;
+  ACTIVE = 1;
+  RETIRED = 2;
+}
+"""
+
+
+def _check(old: str, new: str) -> list[tuple[str, str]]:
+    from aumos_proto.registry.compatibility import check_backward_compatibility
+    from aumos_proto.registry.protos import parse_proto_source
+
+    violations = check_backward_compatibility(
+        {"event.proto": parse_proto_source("event.proto", old)},
+        {"event.proto": parse_proto_source("event.proto", new)},
+    )
+    return [(violation.element, violation.rule) for violation in violations]
+
+
+def test_parse_proto_schema_reads_fields_oneofs_maps_and_enums() -> None:
+    from aumos_proto.registry.compatibility import FieldSchema, parse_proto_schema
+    from aumos_proto.registry.protos import parse_proto_source
+
+    schema = parse_proto_schema(parse_proto_source("event.proto", _BASE))
+    event = schema.messages["Event"]
+    assert event.fields[3] == FieldSchema("tags", 3, "string", "repeated")
+    assert event.fields[5] == FieldSchema("detail", 5, "Detail", oneof="payload")
+    assert event.fields[7] == FieldSchema("counters", 7, "map<string,int64>", "map")
+    assert schema.messages["Event.Detail"].fields[1].type == "int32"
+    assert schema.enums["Status"] == {0: "STATUS_UNSPECIFIED", 1: "ACTIVE", 2: "RETIRED"}
+    assert event.is_reserved(31) and not event.is_reserved(33)
+
+
+def test_additions_are_compatible() -> None:
+    new = _BASE.replace("map<string, int64> counters = 7;", "map<string, int64> counters = 7;\n  string added = 8;")
+    new = new.replace("RETIRED = 2;", "RETIRED = 2;\n  PAUSED = 3;")
+    new += "\nmessage Extra {\n  string id = 1;\n}\n"
+    assert _check(_BASE, new) == []
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "expected"),
+    [
+        ("  Status status = 2;\n", "", ("Event.status", "FIELD_NO_DELETE")),
+        ("string event_id = 1;", "string event_id = 9;", ("Event.event_id", "FIELD_SAME_NUMBER")),
+        ("string event_id = 1;", "string id = 1;", ("Event.event_id", "FIELD_SAME_NAME")),
+        ("int32 code = 1;", "int64 code = 1;", ("Event.Detail.code", "FIELD_SAME_TYPE")),
+        ("map<string, int64>", "map<string, string>", ("Event.counters", "FIELD_SAME_TYPE")),
+        ("repeated string tags", "string tags", ("Event.tags", "FIELD_SAME_LABEL")),
+        ("    string note = 6;\n  }", "  }\n  string note = 6;", ("Event.note", "FIELD_SAME_ONEOF")),
+        ("  RETIRED = 2;\n", "", ("Status.RETIRED", "ENUM_VALUE_NO_DELETE")),
+        ("ACTIVE = 1;", "ACTIVE = 5;", ("Status.ACTIVE", "ENUM_VALUE_SAME_NUMBER")),
+        ("ACTIVE = 1;", "ENABLED = 1;", ("Status.ACTIVE", "ENUM_VALUE_SAME_NAME")),
+        ("  message Detail {\n    int32 code = 1;\n  }\n", "", ("Event.Detail", "MESSAGE_NO_DELETE")),
+        ("reserved 20, 30 to 32;", "string legacy = 31;", ("Event.legacy", "FIELD_RESERVED_NUMBER")),
+    ],
+)
+def test_breaking_changes_are_reported(old: str, new: str, expected: tuple[str, str]) -> None:
+    assert old in _BASE
+    assert expected in _check(_BASE, _BASE.replace(old, new))
+
+
+def test_qualified_and_relative_type_names_compare_equal() -> None:
+    new = _BASE.replace("Status status = 2;", "aumos.test.v1.Status status = 2;")
+    assert _check(_BASE, new) == []
+
+
+def test_real_proto_tree_is_compatible_with_itself_well_under_a_second() -> None:
+    from aumos_proto.registry.compatibility import check_backward_compatibility, parse_proto_schema
+    from aumos_proto.registry.protos import load_proto_sources
+
+    sources = load_proto_sources(_PROTO_ROOT)
+    assert len(sources) == 16
+    started = time.perf_counter()
+    for source in sources.values():
+        parse_proto_schema(source)
+    edited = {path: replace(source, content=source.content + "\n") for path, source in sources.items()}
+    assert check_backward_compatibility(sources, edited) == []
+    assert time.perf_counter() - started < 0.5
+
+
+def test_check_proto_dirs_and_cli_report_deleted_files_and_fields(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    from aumos_proto.registry.compatibility import check_proto_dirs, main
+
+    new_root = tmp_path / "proto"
+    shutil.copytree(_PROTO_ROOT, new_root)
+    assert check_proto_dirs(_PROTO_ROOT, new_root) == []
+    assert main([str(_PROTO_ROOT), str(new_root)]) == 0
+
+    (new_root / "aumos/models/v1/job.proto").unlink()
+    metering = new_root / _METERING
+    metering.write_text(metering.read_text().replace("  float latency_ms = 2;\n", ""))
+    violations = check_proto_dirs(_PROTO_ROOT, new_root)
+    assert [(v.path, v.element, v.rule) for v in violations] == [
+        (_METERING, "InferenceUsage.latency_ms", "FIELD_NO_DELETE"),
+        ("aumos/models/v1/job.proto", "aumos/models/v1/job.proto", "FILE_NO_DELETE"),
+    ]
+
+    assert main([str(_PROTO_ROOT), str(new_root)]) == 1
+    output = capsys.readouterr()
+    assert "InferenceUsage.latency_ms: field 2 was deleted [FIELD_NO_DELETE]" in output.out
+    assert "2 BACKWARD compatibility violation(s)" in output.err
+
+
+def test_unbalanced_braces_raise_proto_syntax_error() -> None:
+    from aumos_proto.registry.compatibility import ProtoSyntaxError
+
+    with pytest.raises(ProtoSyntaxError, match=r"event\.proto"):
+        _check(_BASE, _BASE.replace("enum Status {", "enum Status {{"))
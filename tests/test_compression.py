@@ -0,0 +1,156 @@
+"""Tests for dictionary-compressed event batches."""
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from aumos_proto.compression import CompressionDictionary
+
+
+def _records(count: int, seed: int) -> list[bytes]:
+    from aumos_proto.events.v1 import AuditEvent
+    from aumos_proto.registry.framing import encode_with_schema_id
+
+    rng = random.Random(seed)
+    return [
+        encode_with_schema_id(7, AuditEvent(
+            event_id=f"evt-{rng.getrandbits(64):016x}",
+            tenant_id=f"tenant-{rng.randrange(20):03d}",
+            user_id=f"user-{rng.randrange(500)}",
+            action=rng.choice(["model.deploy", "model.predict", "dataset.read", "policy.update"]),
+            resource_type=rng.choice(["model", "dataset", "policy"]),
+            outcome=rng.choice(["success", "denied"]),
+            source_service=rng.choice(["aumos-gateway", "aumos-governance", "aumos-auth"]),
+        ).SerializeToString())
+        for _ in range(count)
+    ]
+
+
+def _dictionary(version: int = 1) -> CompressionDictionary:
+    from aumos_proto.compression import CompressionDictionary, train_dictionary
+
+    return CompressionDictionary(version, train_dictionary(_records(2_000, seed=1), size=8_192))
+
+
+def test_batches_round_trip_with_and_without_a_dictionary() -> None:
+    from aumos_proto.compression import BatchCompressor, BatchDecompressor, compress_batch, decompress_batch
+
+    dictionary = _dictionary()
+    records = [*_records(50, seed=2), b"", b"\x00" * 300]
+    compressor = BatchCompressor(dictionary)
+    decompressor = BatchDecompressor([dictionary])
+
+    assert decompressor.decompress(compressor.compress(records)) == records
+    assert decompressor.decompress(compressor.compress(records[:3])) == records[:3]
+    assert decompressor.decompress(compressor.compress([])) == []
+    assert decompress_batch(compress_batch(records)) == records
+    assert decompress_batch(compress_batch(records, dictionary), [dictionary]) == records
+
+
+def test_dictionary_shrinks_small_batches() -> None:
+    from aumos_proto.compression import BatchCompressor
+
+    dictionary = _dictionary()
+    records = _records(200, seed=3)
+    plain, primed = BatchCompressor(None), BatchCompressor(dictionary)
+    for batch_size, bound in ((1, 0.6), (10, 0.8)):
+        batches = [records[start:start + batch_size] for start in range(0, len(records), batch_size)]
+        plain_size = sum(len(plain.compress(batch)) for batch in batches)
+        primed_size = sum(len(primed.compress(batch)) for batch in batches)
+        assert primed_size < bound * plain_size
+
+
+def test_readers_reject_unknown_mismatched_and_damaged_batches() -> None:
+    from aumos_proto.compression import (
+        BatchCompressor,
+        BatchDecompressor,
+        CompressionDictionary,
+        CorruptBatchError,
+        UnknownDictionaryError,
+    )
+
+    dictionary = _dictionary()
+    batch = BatchCompressor(dictionary).compress(_records(20, seed=4))
+
+    with pytest.raises(UnknownDictionaryError, match="v1"):
+        BatchDecompressor().decompress(batch)
+    impostor = CompressionDictionary(1, b"not the dictionary the batch was written with")
+    with pytest.raises(CorruptBatchError, match="damaged"):
+        BatchDecompressor([impostor]).decompress(batch)
+
+    decompressor = BatchDecompressor([dictionary])
+    with pytest.raises(CorruptBatchError, match="Not an AumOS"):
+        decompressor.decompress(b"XXXX" + batch[4:])
+    with pytest.raises(CorruptBatchError, match="format version"):
+        decompressor.decompress(batch[:4] + b"\x09" + batch[5:])
+    with pytest.raises(CorruptBatchError):
+        decompressor.decompress(batch[:-10])
+    with pytest.raises(CorruptBatchError, match="Too short"):
+        decompressor.decompress(batch[:8])
+    with pytest.raises(CorruptBatchError, match="trailing bytes after its body"):
+        decompressor.decompress(batch + b"GARBAGE")
+    damaged = bytearray(batch)
+    damaged[len(batch) // 2] ^= 0xFF
+    with pytest.raises(CorruptBatchError):
+        decompressor.decompress(bytes(damaged))
+
+
+def test_dictionary_store_versions_are_immutable(tmp_path: Path) -> None:
+    from aumos_proto.compression import BatchCompressor, BatchDecompressor, DictionaryStore, UnknownDictionaryError
+
+    store = DictionaryStore(tmp_path / "dictionaries")
+    assert store.versions() == []
+    assert store.latest() is None
+
+    first = store.add(b"first dictionary")
+    old_batch = BatchCompressor(first).compress([b"payload"])
+    second = store.add(b"second dictionary")
+    assert (first.version, second.version) == (1, 2)
+    assert store.versions() == [1, 2]
+    assert store.latest() == second
+    assert store.get(1).data == b"first dictionary"
+    assert sorted(path.name for path in (tmp_path / "dictionaries").iterdir()) == ["v1.zdict", "v2.zdict"]
+    assert BatchDecompressor(store.load_all()).decompress(old_batch) == [b"payload"]
+    with pytest.raises(UnknownDictionaryError):
+        store.get(3)
+
+
+def test_train_dictionary_validates_its_input() -> None:
+    from aumos_proto.compression import CompressionDictionary, train_dictionary
+
+    dictionary = train_dictionary(_records(500, seed=5), size=1_024)
+    assert 0 < len(dictionary) <= 1_024
+    with pytest.raises(ValueError, match="share no content"):
+        train_dictionary([bytes(range(256)), bytes(range(255, -1, -1))])
+    with pytest.raises(ValueError, match="size"):
+        train_dictionary([b"abc"], size=64 * 1024)
+    with pytest.raises(ValueError, match="1 to 32768 bytes"):
+        CompressionDictionary(1, b"x" * (32 * 1024 + 1))
+    with pytest.raises(ValueError, match="positive"):
+        CompressionDictionary(0, b"x")
+
+
+def test_command_line_trains_and_evaluates_from_event_logs(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    from aumos_proto.compression import DictionaryStore, main
+    from aumos_proto.eventlog import EventLogWriter
+
+    log = tmp_path / "capture.aelog"
+    with EventLogWriter(log) as writer:
+        writer.append_many(_records(1_000, seed=6))
+    store_dir = tmp_path / "dictionaries"
+
+    assert main(["train", "--size", "4096", str(store_dir), str(log)]) == 0
+    assert "Stored dictionary v1" in capsys.readouterr().out
+    assert len(DictionaryStore(store_dir).get(1).data) <= 4096
+
+    assert main(["evaluate", "--batch-size", "10", str(store_dir), str(log)]) == 0
+    report = capsys.readouterr().out
+    assert "1000 records in batches of 10" in report
+    assert "with dictionary v1" in report
+
+    assert main(["evaluate", str(tmp_path / "empty"), str(log)]) == 2
+    assert "No dictionaries" in capsys.readouterr().err
@@ -0,0 +1,182 @@
+"""Tests for the length-delimited event log file format."""
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from aumos_proto.codec import ProtoMessage
+
+
+def _events() -> list[ProtoMessage]:
+    from aumos_proto.events.v1 import AuditEvent, MeteringEvent, TokenUsage
+
+    return [
+        AuditEvent(tenant_id="t-1", action="login", source_service="auth"),
+        MeteringEvent(tenant_id="t-1", operation="infer", token_usage=TokenUsage(model_id="m", input_tokens=12)),
+        AuditEvent(tenant_id="t-2", action="logout", source_service="auth"),
+    ]
+
+
+def test_writer_and_reader_round_trip_framed_records(tmp_path: Path) -> None:
+    from aumos_proto.eventlog import EventLogReader, EventLogWriter, read_event_log
+    from aumos_proto.registry.framing import encode_with_schema_id, strip_schema_framing
+
+    path = tmp_path / "capture.aelog"
+    framed = [encode_with_schema_id(7, event.SerializeToString()) for event in _events()]
+    with EventLogWriter(path, buffer_size=64) as writer:
+        writer.append(framed[0])
+        writer.append_many(framed[1:])
+        assert writer.records_written == 3
+
+    with EventLogReader(path) as reader:
+        assert [bytes(record) for record in reader] == framed
+    assert list(read_event_log(path)) == framed
+    assert strip_schema_framing(next(read_event_log(path)))[0] == 7
+
+
+def test_messages_decode_through_framed_decoder(tmp_path: Path) -> None:
+    from aumos_proto.eventlog import EventLogReader, EventLogWriter
+    from aumos_proto.registry import FramedDecoder, SchemaRegistryClient
+
+    client = SchemaRegistryClient()
+    client._schema_id_cache["aumos.events.audit-value"] = 7
+    client._schema_id_cache["aumos.events.metering-value"] = 42
+    decoder = FramedDecoder(client, subjects=[
+        ("aumos.events.audit-value", "aumos.events.v1.AuditEvent"),
+        ("aumos.events.metering-value", "aumos.events.v1.MeteringEvent"),
+    ])
+    assert decoder.warm_up() == 2
+
+    path = tmp_path / "capture.aelog"
+    events = _events()
+    with EventLogWriter(path) as writer:
+        for event in events:
+            writer.append_message(42 if type(event).__name__ == "MeteringEvent" else 7, event)
+
+    with EventLogReader(path) as reader:
+        assert list(reader.messages(decoder, batch_size=2)) == events
+
+
+def test_failed_append_message_leaves_no_partial_record(tmp_path: Path) -> None:
+    from aumos_proto.eventlog import EventLogWriter, read_event_log
+    from aumos_proto.events.v1 import AuditEvent
+
+    path = tmp_path / "capture.aelog"
+    with EventLogWriter(path) as writer:
+        writer.append_message(7, AuditEvent(action="before"))
+        with pytest.raises(TypeError, match="Cannot encode set"):
+            writer.append_message(7, AuditEvent(action="broken", details={"x": {1, 2}}))
+        writer.append_message(7, AuditEvent(action="after"))
+        assert writer.records_written == 2
+
+    assert [AuditEvent.FromString(record[5:]).action for record in read_event_log(path)] == ["before", "after"]
+
+
+def test_writer_appends_to_existing_log_and_rejects_other_files(tmp_path: Path) -> None:
+    from aumos_proto.eventlog import CorruptEventLogError, EventLogWriter, read_event_log
+
+    path = tmp_path / "capture.aelog"
+    for payload in (b"\x00\x00\x00\x00\x01a", b"\x00\x00\x00\x00\x01b"):
+        with EventLogWriter(path) as writer:
+            writer.append(payload)
+    assert list(read_event_log(path)) == [b"\x00\x00\x00\x00\x01a", b"\x00\x00\x00\x00\x01b"]
+
+    with EventLogWriter(path) as writer, pytest.raises(ValueError, match="not schema-registry framed"):
+        writer.append(b'{"json": true}')
+
+    other = tmp_path / "events.jsonl"
+    other.write_text('{"event_id": "1"}\n')
+    with pytest.raises(CorruptEventLogError, match="not an AumOS event log"):
+        EventLogWriter(other)
+    with pytest.raises(CorruptEventLogError):
+        list(read_event_log(other))
+
+
+def test_empty_log_has_no_records(tmp_path: Path) -> None:
+    from aumos_proto.eventlog import FILE_HEADER_SIZE, EventLogWriter, read_event_log
+
+    path = tmp_path / "empty.aelog"
+    EventLogWriter(path).close()
+    assert path.stat().st_size == FILE_HEADER_SIZE
+    assert list(read_event_log(path)) == []
+
+
+def test_torn_tail_is_skipped_and_recovered(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    from aumos_proto.eventlog import EventLogWriter, read_event_log, recover_event_log
+
+    path = tmp_path / "capture.aelog"
+    with EventLogWriter(path) as writer:
+        writer.append_many([b"\x00\x00\x00\x00\x01first", b"\x00\x00\x00\x00\x01second"])
+    intact = path.stat().st_size
+    with path.open("ab") as file:
+        file.write(b"\x00\x00\x01\x00\x00\x00\x00\x00\x00partial")
+
+    with caplog.at_level(logging.WARNING, logger="aumos_proto.eventlog"):
+        assert len(list(read_event_log(path))) == 2
+    assert "partial record" in caplog.text
+
+    assert recover_event_log(path) == 16
+    assert path.stat().st_size == intact
+    assert recover_event_log(path) == 0
+    with EventLogWriter(path) as writer:
+        writer.append(b"\x00\x00\x00\x00\x01third")
+    assert [record[5:] for record in read_event_log(path)] == [b"first", b"second", b"third"]
+
+
+def test_checksum_mismatch_raises_unless_verification_is_off(tmp_path: Path) -> None:
+    from aumos_proto.eventlog import CorruptEventLogError, EventLogWriter, read_event_log
+
+    path = tmp_path / "capture.aelog"
+    with EventLogWriter(path) as writer:
+        writer.append(b"\x00\x00\x00\x00\x01payload")
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(CorruptEventLogError, match="checksum mismatch"):
+        list(read_event_log(path))
+    assert list(read_event_log(path, verify_checksums=False)) == [b"\x00\x00\x00\x00\x01payloa" + bytes([data[-1]])]
+
+
+def test_reader_close_tolerates_records_still_referenced(tmp_path: Path) -> None:
+    from aumos_proto.eventlog import EventLogReader, EventLogWriter
+
+    path = tmp_path / "capture.aelog"
+    with EventLogWriter(path) as writer:
+        writer.append(b"\x00\x00\x00\x00\x01kept")
+    reader = EventLogReader(path)
+    records = list(reader)
+    reader.close()
+    assert bytes(records[0]) == b"\x00\x00\x00\x00\x01kept"
+    reader.close()
+
+
+def test_writer_finishes_short_writes(tmp_path: Path) -> None:
+    from aumos_proto.eventlog import EventLogWriter, read_event_log
+
+    class ShortWriteFile:
+        """Unbuffered file stand-in that accepts at most 7 bytes per write."""
+
+        def __init__(self, file: Any) -> None:
+            self._file = file
+            self.writes = 0
+
+        def write(self, data: Any) -> int:
+            self.writes += 1
+            return int(self._file.write(bytes(data[:7])))
+
+        def __getattr__(self, name: str) -> Any:
+            return getattr(self._file, name)
+
+    path = tmp_path / "capture.aelog"
+    framed = [b"\x00\x00\x00\x00\x01first", b"\x00\x00\x00\x00\x01second record"]
+    with EventLogWriter(path) as writer:
+        writer._file = ShortWriteFile(writer._file)
+        writer.append_many(framed)
+        writer.flush()
+        assert writer._file.writes > 1
+    assert list(read_event_log(path)) == framed
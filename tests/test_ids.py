@@ -0,0 +1,138 @@
+"""Tests for the event ID generator used by the stub defaults."""
+import os
+import select
+import signal
+import threading
+import uuid
+
+import pytest
+
+
+def test_ids_are_valid_uuid7() -> None:
+    from aumos_proto.ids import TimeOrderedIdGenerator
+
+    event_id = TimeOrderedIdGenerator()()
+    parsed = uuid.UUID(event_id)
+    assert str(parsed) == event_id
+    assert parsed.version == 7
+    assert parsed.variant == uuid.RFC_4122
+
+
+def test_ids_sort_by_generation_order() -> None:
+    from aumos_proto.ids import TimeOrderedIdGenerator
+
+    generate = TimeOrderedIdGenerator(pool_size=16)
+    ids = [generate() for _ in range(10_000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_ids_stay_ordered_when_clock_steps_back(monkeypatch: pytest.MonkeyPatch) -> None:
+    from aumos_proto import ids
+
+    generate = ids.TimeOrderedIdGenerator()
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 2_000_000_000_000_000)
+    first = generate()
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_000_000_000_000_000)
+    second = generate()
+    assert second > first
+    assert uuid.UUID(second).int >> 80 == 2_000_000_000
+
+
+def test_sequence_overflow_borrows_next_millisecond(monkeypatch: pytest.MonkeyPatch) -> None:
+    from aumos_proto import ids
+
+    generate = ids.TimeOrderedIdGenerator()
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 5_000_000)
+    batch = [generate() for _ in range(4097)]
+    assert batch == sorted(batch)
+    assert uuid.UUID(batch[-2]).int >> 80 == 5
+    assert uuid.UUID(batch[-1]).int >> 80 == 6
+
+
+def test_ids_unique_across_threads() -> None:
+    from aumos_proto.ids import TimeOrderedIdGenerator
+
+    generate = TimeOrderedIdGenerator(pool_size=64)
+    results: list[list[str]] = [[] for _ in range(8)]
+
+    def worker(out: list[str]) -> None:
+        out.extend(generate() for _ in range(2_000))
+
+    threads = [threading.Thread(target=worker, args=(out,)) for out in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    all_ids = [event_id for out in results for event_id in out]
+    assert len(set(all_ids)) == len(all_ids)
+    for out in results:
+        assert out == sorted(out)
+
+
+def test_invalid_pool_size_rejected() -> None:
+    from aumos_proto.ids import TimeOrderedIdGenerator
+
+    with pytest.raises(ValueError, match="pool_size"):
+        TimeOrderedIdGenerator(pool_size=0)
+
+
+def test_event_defaults_use_swappable_generator() -> None:
+    from aumos_proto.events.v1.agent_envelope_pb2 import AgentEnvelope
+    from aumos_proto.events.v1.audit_event_pb2 import AuditEvent
+    from aumos_proto.ids import get_id_generator, set_id_generator
+
+    assert uuid.UUID(AuditEvent().event_id).version == 7
+    counter = iter(range(100))
+    previous = set_id_generator(lambda: f"id-{next(counter)}")
+    try:
+        assert AuditEvent().event_id == "id-0"
+        assert AgentEnvelope().message_id == "id-1"
+    finally:
+        restored = set_id_generator(previous)
+    assert restored is not previous
+    assert get_id_generator() is previous
+
+
+def test_generators_are_not_kept_alive() -> None:
+    import gc
+    import weakref
+
+    from aumos_proto.ids import TimeOrderedIdGenerator
+
+    generator = TimeOrderedIdGenerator()
+    generator()
+    ref = weakref.ref(generator)
+    del generator
+    gc.collect()
+    assert ref() is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_gets_a_fresh_lock_and_pool() -> None:
+    from aumos_proto.ids import TimeOrderedIdGenerator
+
+    generator = TimeOrderedIdGenerator()
+    generator()
+    read_fd, write_fd = os.pipe()
+    # Holding the lock across fork stands in for another thread generating an ID.
+    with generator._lock:
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, generator().encode())
+            os._exit(0)
+    os.close(write_fd)
+    try:
+        ready, _, _ = select.select([read_fd], [], [], 10)
+        if not ready:
+            os.kill(pid, signal.SIGKILL)
+        child_id = os.read(read_fd, 64).decode() if ready else ""
+    finally:
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+    assert child_id, "forked child deadlocked on the generator lock"
+    assert uuid.UUID(child_id).version == 7
+    # The child drew a new pool instead of replaying the parent's next random tail.
+    assert child_id[-17:] != generator()[-17:]
@@ -0,0 +1,183 @@
+"""Tests for the streaming windowed metering aggregator."""
+from __future__ import annotations
+
+import json
+import random
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from aumos_proto.events.v1 import MeteringEvent
+    from aumos_proto.metering import WindowResult
+
+
+def _event(time_ms: int, tenant: str = "t-1", **resource: Any) -> MeteringEvent:
+    from aumos_proto.events.v1 import InferenceUsage, MeteringEvent, StorageUsage, SyntheticDataUsage, TokenUsage
+
+    types = {
+        "token_usage": TokenUsage,
+        "inference_usage": InferenceUsage,
+        "storage_usage": StorageUsage,
+        "synthetic_usage": SyntheticDataUsage,
+    }
+    usage = {name: types[name](**values) for name, values in resource.items()}
+    return MeteringEvent(tenant_id=tenant, project_id="p", team_id="team", service_name="svc", timestamp_ms=time_ms,
+                         **usage)
+
+
+def _random_events(count: int, seed: int = 7) -> list[MeteringEvent]:
+    rng = random.Random(seed)
+    events = []
+    for index in range(count):
+        time_ms = index * 3 + rng.randrange(10)
+        tenant = rng.choice(["t-1", "t-2", "t-3"])
+        kind = rng.randrange(4)
+        if kind == 0:
+            events.append(_event(time_ms, tenant, token_usage={"model_id": rng.choice(["a", "b"]),
+                                                              "input_tokens": rng.randrange(100),
+                                                              "output_tokens": rng.randrange(10)}))
+        elif kind == 1:
+            events.append(_event(time_ms, tenant, inference_usage={"model_id": "a", "compute_ms": rng.randrange(50)}))
+        elif kind == 2:
+            events.append(_event(time_ms, tenant, storage_usage={"bytes_read": 1, "bytes_written": rng.randrange(9)}))
+        else:
+            events.append(_event(time_ms, tenant, synthetic_usage={"records_generated": rng.randrange(1000)}))
+    return events
+
+
+def _expected(events: list[MeteringEvent], window: int, slide: int) -> dict[tuple[int, Any], tuple[int, ...]]:
+    expected: dict[tuple[int, Any], list[int]] = {}
+    for event in events:
+        first = event.timestamp_ms - event.timestamp_ms % slide - window + slide
+        for start in range(first, event.timestamp_ms + 1, slide):
+            usage = event.token_usage or event.inference_usage
+            key = (start, (event.tenant_id, "p", "team", "svc", usage.model_id if usage else ""))
+            totals = expected.setdefault(key, [0, 0, 0, 0, 0])
+            totals[0] += 1
+            totals[1] += event.token_usage.input_tokens + event.token_usage.output_tokens if event.token_usage else 0
+            totals[2] += event.inference_usage.compute_ms if event.inference_usage else 0
+            totals[3] += event.storage_usage.bytes_written if event.storage_usage else 0
+            totals[4] += event.synthetic_usage.records_generated if event.synthetic_usage else 0
+    return {key: tuple(values) for key, values in expected.items()}
+
+
+def _flatten(results: list[WindowResult]) -> dict[tuple[int, Any], tuple[int, ...]]:
+    flat = {}
+    for result in results:
+        for key, totals in result.totals.items():
+            assert (result.start_ms, key) not in flat
+            flat[(result.start_ms, tuple(key))] = (
+                totals.events, totals.total_tokens, totals.compute_ms, totals.bytes_written, totals.synthetic_records,
+            )
+    return flat
+
+
+@pytest.mark.parametrize(("window", "slide"), [(100, 100), (100, 25), (60, 60), (90, 30)])
+def test_windows_match_a_brute_force_rollup(window: int, slide: int) -> None:
+    from aumos_proto.metering import MeteringAggregator
+
+    events = _random_events(2_000)
+    aggregator = MeteringAggregator(window_ms=window, slide_ms=slide, allowed_lateness_ms=10)
+    closed = aggregator.add_many(events)
+    assert all(result.end_ms <= aggregator.watermark for result in closed)
+    assert [result.start_ms for result in closed] == sorted(result.start_ms for result in closed)
+    closed += aggregator.flush()
+
+    assert aggregator.late_events == 0
+    assert len(aggregator) == 0
+    assert all(result.end_ms - result.start_ms == window for result in closed)
+    assert _flatten(closed) == _expected(events, window, slide)
+
+
+def test_memory_is_bounded_by_the_open_windows() -> None:
+    from aumos_proto.metering import MeteringAggregator
+
+    aggregator = MeteringAggregator(window_ms=100, slide_ms=20)
+    peak = 0
+    for event in _random_events(5_000):
+        aggregator.add(event)
+        peak = max(peak, len(aggregator._panes))
+    assert peak <= 100 // 20 + 1
+
+
+def test_late_events_are_counted_and_dropped() -> None:
+    from aumos_proto.metering import MeteringAggregator
+
+    aggregator = MeteringAggregator(window_ms=10, allowed_lateness_ms=5)
+    assert aggregator.add(_event(3, token_usage={"input_tokens": 1})) == []
+    assert aggregator.add(_event(14, token_usage={"input_tokens": 2})) == []
+    # Within the allowed lateness: the watermark (9) has not passed the first window yet.
+    assert aggregator.add(_event(8, token_usage={"input_tokens": 4})) == []
+    closed = aggregator.add(_event(15, token_usage={"input_tokens": 8}))
+    assert [(result.start_ms, result.end_ms) for result in closed] == [(0, 10)]
+    assert next(iter(closed[0].totals.values())).input_tokens == 5
+
+    assert aggregator.add(_event(9, token_usage={"input_tokens": 16})) == []
+    assert aggregator.late_events == 1
+    assert [sum(t.input_tokens for t in result.totals.values()) for result in aggregator.flush()] == [10]
+
+
+def test_advance_watermark_closes_idle_windows() -> None:
+    from aumos_proto.metering import MeteringAggregator, RollupKey
+
+    aggregator = MeteringAggregator(window_ms=60_000)
+    aggregator.add(_event(61_000, "t-9", inference_usage={"model_id": "m", "compute_ms": 40}))
+    assert aggregator.advance_watermark(119_999) == []
+    [result] = aggregator.advance_watermark(120_000)
+    assert (result.start_ms, result.end_ms) == (60_000, 120_000)
+    assert result.totals[RollupKey("t-9", "p", "team", "svc", "m")].compute_ms == 40
+    assert aggregator.advance_watermark(0) == []
+    assert aggregator.watermark == 120_000
+
+
+def test_partial_results_merge_across_consumers() -> None:
+    from aumos_proto.metering import MeteringAggregator, WindowResult, merge_window_results
+
+    events = _random_events(1_000, seed=3)
+    consumers = [MeteringAggregator(window_ms=50, slide_ms=10, allowed_lateness_ms=10) for _ in range(3)]
+    shipped = []
+    for index, event in enumerate(events):
+        shipped += consumers[index % 3].add(event)
+    for consumer in consumers:
+        shipped += consumer.flush()
+
+    received = [WindowResult.from_dict(json.loads(json.dumps(result.to_dict()))) for result in shipped]
+    merged = merge_window_results(received)
+    assert len({(result.start_ms, result.end_ms) for result in merged}) == len(merged)
+    assert _flatten(merged) == _expected(events, 50, 10)
+
+    with pytest.raises(ValueError, match="Cannot merge window"):
+        merged[0].merge(merged[1])
+
+
+def test_aggregators_merge_open_panes() -> None:
+    from aumos_proto.metering import MeteringAggregator
+
+    left = MeteringAggregator(window_ms=100, slide_ms=50)
+    right = MeteringAggregator(window_ms=100, slide_ms=50)
+    left.add(_event(10, token_usage={"model_id": "a", "input_tokens": 1}))
+    right.add(_event(20, token_usage={"model_id": "a", "input_tokens": 2}))
+
+    assert left.merge(right) == []
+    assert left.watermark == 20
+    closed = left.add(_event(160, storage_usage={"bytes_read": 7}))
+    assert [(result.start_ms, sum(t.input_tokens for t in result.totals.values())) for result in closed] == [
+        (-50, 3), (0, 3),
+    ]
+    assert [sum(t.bytes_read for t in result.totals.values()) for result in left.flush()] == [7, 7]
+    assert [sum(t.input_tokens for t in result.totals.values()) for result in right.flush()] == [2, 2]
+
+    with pytest.raises(ValueError, match="different window_ms"):
+        left.merge(MeteringAggregator(window_ms=100))
+
+
+def test_window_parameters_are_validated() -> None:
+    from aumos_proto.metering import MeteringAggregator
+
+    with pytest.raises(ValueError, match="must divide"):
+        MeteringAggregator(window_ms=100, slide_ms=30)
+    with pytest.raises(ValueError, match="positive"):
+        MeteringAggregator(window_ms=0)
+    with pytest.raises(ValueError, match="negative"):
+        MeteringAggregator(window_ms=10, allowed_lateness_ms=-1)
@@ -84,3 +84,23 @@ def test_serialization_roundtrip() -> None:
     deserialized = AgentEnvelope.FromString(serialized)
     assert deserialized.tenant_id == "tenant-1"
     assert deserialized.privilege_level == 3
+
+
+def test_all_message_stubs_are_slotted() -> None:
+    import dataclasses
+
+    import pytest
+
+    from aumos_proto.api import v1 as api_v1
+    from aumos_proto.events import v1 as events_v1
+    from aumos_proto.models import v1 as models_v1
+
+    for module in (api_v1, events_v1, models_v1):
+        for name in module.__all__:
+            cls = getattr(module, name)
+            if not dataclasses.is_dataclass(cls):
+                continue
+            instance = cls()
+            assert not hasattr(instance, "__dict__"), f"{name} instances still carry a __dict__"
+            with pytest.raises(AttributeError):
+                instance.not_a_field = 1
@@ -2,13 +2,31 @@
 
 Tests cover:
 - Wire format framing (encode/decode)
-- SchemaRegistryClient (mocked HTTP calls)
+- SchemaRegistryClient (mocked HTTP calls, pooled connection lifecycle)
+- AsyncSchemaRegistryClient concurrent registration
+- Schema lookup by ID through the LRU cache
+- On-disk schema ID cache for warm restarts
+- Schema ID TTL, stale-while-revalidate and invalidation
+- Registration of the real .proto files with references
+- Startup registration deadline with background completion
+- Single-flight coalescing of concurrent cache misses
+- Instrumentation hooks and the in-memory metrics collector
+- Offline BACKWARD compatibility gate before registration
 - AUMOS_PROTO_SUBJECTS completeness
+- FramedDecoder schema-ID dispatch
 """
 from __future__ import annotations
 
 import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
 import pytest
+import respx
+
+if TYPE_CHECKING:
+    from aumos_proto.registry.decoder import FramedDecoder
 
 
 # ---------------------------------------------------------------------------
@@ -79,6 +97,118 @@ def test_encode_decode_roundtrip_for_large_schema_id() -> None:
     assert extracted_payload == payload
 
 
+def test_encode_message_with_schema_id_matches_copying_framing() -> None:
+    from aumos_proto.events.v1.agent_envelope_pb2 import AgentEnvelope
+    from aumos_proto.registry.framing import encode_message_with_schema_id, encode_with_schema_id
+
+    envelope = AgentEnvelope(tenant_id="tenant-abc", payload={"blob": "x" * 4096})
+    expected = encode_with_schema_id(7, envelope.SerializeToString())
+
+    assert encode_message_with_schema_id(7, envelope) == expected
+
+    reused = bytearray(b"stale")
+    reused.clear()
+    assert encode_message_with_schema_id(7, envelope, reused) is reused
+    assert reused == expected
+
+
+def test_write_schema_header_fills_reserved_slot() -> None:
+    from aumos_proto.registry.framing import HEADER_SIZE, decode_schema_id, write_schema_header
+
+    buffer = bytearray(HEADER_SIZE + 3)
+    buffer[HEADER_SIZE:] = b"abc"
+    assert write_schema_header(300, memoryview(buffer)) == HEADER_SIZE
+    assert decode_schema_id(buffer) == 300
+    assert buffer[HEADER_SIZE:] == b"abc"
+
+    with pytest.raises(ValueError, match="cannot hold"):
+        write_schema_header(1, bytearray(8), offset=4)
+
+
+def test_strip_schema_framing_view_shares_memory_with_record() -> None:
+    from aumos_proto.models.v1.job_pb2 import Job
+    from aumos_proto.registry.framing import encode_message_with_schema_id, strip_schema_framing_view
+
+    job = Job(id="j-1", tenant_id="t-1", output={"rows": 10.0})
+    framed = bytes(encode_message_with_schema_id(11, job))
+
+    schema_id, payload = strip_schema_framing_view(framed)
+    assert schema_id == 11
+    assert isinstance(payload, memoryview)
+    assert payload.obj is framed
+    assert Job.FromString(payload) == job
+
+    with pytest.raises(ValueError, match="magic byte"):
+        strip_schema_framing_view(b"\x01" + framed[1:])
+
+
+def _framed_poll() -> list[bytes]:
+    from aumos_proto.registry.framing import encode_batch_with_schema_id, encode_with_schema_id
+
+    records = encode_batch_with_schema_id(3, [b"a0", b"a1"])
+    records.insert(1, encode_with_schema_id(8, b"b0"))
+    records.append(b"\x01\x00\x00\x00\x03xx")  # wrong magic byte
+    records.append(b"\x00\x00")  # shorter than the header
+    return records
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_strip_schema_framing_batch_flags_malformed_records(use_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    from aumos_proto.registry import framing
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(framing, "_HAVE_NUMPY", use_numpy)
+
+    batch = framing.strip_schema_framing_batch(_framed_poll())
+
+    assert len(batch) == 5
+    assert [int(v) for v in batch.schema_ids] == [3, 8, 3, 0, 0]
+    assert [bool(v) for v in batch.malformed] == [False, False, False, True, True]
+    assert bytes(batch.payload(2)) == b"a1"
+    assert bytes(batch.payload(3)) == b""
+    assert batch.bucket_by_schema_id() == {3: [0, 2], 8: [1]}
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_empty_and_all_malformed_batches_have_no_buckets(use_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    from aumos_proto.registry import framing
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(framing, "_HAVE_NUMPY", use_numpy)
+
+    assert framing.strip_schema_framing_batch([]).bucket_by_schema_id() == {}
+    malformed = framing.strip_schema_framing_batch([b"\x01xx", b"\x00\x00"])
+    assert [bool(v) for v in malformed.malformed] == [True, True]
+    assert malformed.bucket_by_schema_id() == {}
+    assert framing.strip_schema_framing_buffer(b"\x01xx", [0]).bucket_by_schema_id() == {}
+
+    decoder = _seeded_decoder()
+    assert decoder.decode_many([]) == []
+    assert decoder.decode_many([b"\x01xx"]) == [None]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_strip_schema_framing_buffer_returns_offsets_into_buffer(use_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    from aumos_proto.registry import framing
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(framing, "_HAVE_NUMPY", use_numpy)
+
+    records = _framed_poll()
+    offsets = [sum(len(record) for record in records[:index]) for index in range(len(records))]
+    batch = framing.strip_schema_framing_buffer(b"".join(records), offsets)
+
+    assert [int(v) for v in batch.schema_ids] == [3, 8, 3, 0, 0]
+    assert [bool(v) for v in batch.malformed] == [False, False, False, True, True]
+    assert [int(v) for v in batch.payload_starts[:3]] == [5, 12, 19]
+    assert bytes(batch.payload(1)) == b"b0"
+    assert batch.bucket_by_schema_id() == {3: [0, 2], 8: [1]}
+    assert len(framing.strip_schema_framing_buffer(b"", [])) == 0
+
+
 # ---------------------------------------------------------------------------
 # SchemaRegistryConfig defaults
 # ---------------------------------------------------------------------------
@@ -92,6 +222,8 @@ def test_schema_registry_config_defaults() -> None:
     assert config.compatibility_mode == "BACKWARD"
     assert config.cache_schema_ids is True
     assert config.username is None
+    assert config.max_connections == 10
+    assert config.max_keepalive_connections == 5
 
 
 # ---------------------------------------------------------------------------
@@ -171,3 +303,843 @@ def test_schema_registry_client_get_schema_id_returns_from_cache() -> None:
 
     result = client.get_schema_id("aumos.events.metering-value")
     assert result == 42
+
+
+@respx.mock
+def test_schema_registry_client_reuses_one_pooled_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig
+
+    opened: list[httpx.Client] = []
+    real_client = httpx.Client
+
+    def recording_client(**kwargs: Any) -> httpx.Client:
+        opened.append(real_client(**kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(httpx, "Client", recording_client)
+    respx.post(url__regex=r".*/subjects/.*/versions").mock(return_value=httpx.Response(200, json={"id": 3}))
+    respx.put(url__regex=r".*/config/.*").mock(return_value=httpx.Response(200, json={"compatibility": "BACKWARD"}))
+    config = SchemaRegistryConfig(username="svc", password="secret", max_connections=4)
+
+    with SchemaRegistryClient(config=config) as client:
+        assert len(client.register_all_aumos_schemas()) == 15
+        client.set_compatibility("aumos.events.audit-value", "BACKWARD")
+        assert len(opened) == 1
+        assert not opened[0].is_closed
+    assert opened[0].is_closed
+    assert respx.calls.last.request.headers["Authorization"].startswith("Basic ")
+
+    client.get_schema_id("aumos.events.audit-value")  # served from cache
+    client.set_compatibility("aumos.events.audit-value", "FULL")
+    assert len(opened) == 2
+    client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_registers_all_subjects_with_bounded_concurrency() -> None:
+    import asyncio
+
+    from aumos_proto.registry import AsyncSchemaRegistryClient
+    from aumos_proto.registry.client import AUMOS_PROTO_SUBJECTS, SchemaRegistryConfig
+
+    in_flight = peak = 0
+
+    async def slow_register(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "metering" in request.url.path:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"id": 11})
+
+    route = respx.post(url__regex=r".*/subjects/.*/versions").mock(side_effect=slow_register)
+
+    async with AsyncSchemaRegistryClient(config=SchemaRegistryConfig(max_concurrent_requests=4)) as client:
+        schema_ids = await client.register_all_aumos_schemas()
+        assert await client.get_schema_id("aumos.events.audit-value") == 11
+
+    assert route.call_count == len(AUMOS_PROTO_SUBJECTS)
+    assert peak == 4
+    assert len(schema_ids) == len(AUMOS_PROTO_SUBJECTS) - 1
+    assert "aumos.events.metering-value" not in schema_ids
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_without_deadline_tracks_no_pending_registrations() -> None:
+    from aumos_proto.registry import AsyncSchemaRegistryClient
+
+    client = AsyncSchemaRegistryClient()
+    seen_pending: list[frozenset[str]] = []
+
+    def register(request: httpx.Request) -> httpx.Response:
+        seen_pending.append(client.pending_registrations())
+        return httpx.Response(200, json={"id": 11})
+
+    respx.post(url__regex=r".*/subjects/.*/versions").mock(side_effect=register)
+    async with client:
+        await client.register_all_aumos_schemas()
+    assert seen_pending
+    assert all(pending == frozenset() for pending in seen_pending)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_shares_cache_with_sync_client() -> None:
+    from aumos_proto.registry import AsyncSchemaRegistryClient, SchemaRegistryClient
+    from aumos_proto.registry.client import SchemaRegistryError
+
+    sync_client = SchemaRegistryClient()
+    sync_client._schema_id_cache["aumos.events.audit-value"] = 7
+    respx.get("http://localhost:8081/subjects/aumos.events.metering-value/versions/latest").mock(
+        return_value=httpx.Response(200, json={"id": 42})
+    )
+    respx.get("http://localhost:8081/subjects/missing-value/versions/latest").mock(return_value=httpx.Response(404))
+
+    async with AsyncSchemaRegistryClient.sharing_cache_with(sync_client) as client:
+        assert await client.get_schema_id("aumos.events.audit-value") == 7
+        assert await client.get_schema_id("aumos.events.metering-value") == 42
+        with pytest.raises(SchemaRegistryError, match="HTTP 404"):
+            await client.get_schema_id("missing-value")
+
+    assert sync_client.get_schema_id("aumos.events.metering-value") == 42
+
+
+def test_lru_cache_evicts_least_recently_used_and_counts() -> None:
+    from aumos_proto.registry.cache import CacheInfo, LruCache
+
+    cache: LruCache[int, str] = LruCache(maxsize=2)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    assert cache.get(1) == "a"  # 2 is now least recently used
+    cache.put(3, "c")
+    assert 2 not in cache
+    assert cache.get(2) is None
+    assert cache.cache_info() == CacheInfo(hits=1, misses=1, maxsize=2, currsize=2)
+
+    with pytest.raises(ValueError, match="maxsize"):
+        LruCache(maxsize=0)
+
+
+@respx.mock
+def test_get_schema_by_id_calls_registry_once_per_id() -> None:
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig, SchemaRegistryError
+
+    route = respx.get("http://localhost:8081/schemas/ids/7").mock(
+        return_value=httpx.Response(200, json={"schemaType": "PROTOBUF", "schema": 'syntax = "proto3";'})
+    )
+    respx.get("http://localhost:8081/schemas/ids/8").mock(return_value=httpx.Response(200, json={"schema": "{}"}))
+    respx.get("http://localhost:8081/schemas/ids/404").mock(return_value=httpx.Response(404))
+
+    with SchemaRegistryClient(config=SchemaRegistryConfig(schema_cache_size=1)) as client:
+        for _ in range(3):
+            schema = client.get_schema_by_id(7)
+        assert route.call_count == 1
+        assert (schema.schema_id, schema.schema_type, schema.references) == (7, "PROTOBUF", ())
+        assert client.get_schema_by_id(8).schema_type == "AVRO"
+        client.get_schema_by_id(7)  # evicted by 8 when maxsize is 1
+        assert route.call_count == 2
+        with pytest.raises(SchemaRegistryError, match="HTTP 404"):
+            client.get_schema_by_id(404)
+        info = client.schema_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 4, 1)
+
+
+def test_schema_id_cache_ttl_stale_window_and_invalidation() -> None:
+    from aumos_proto.registry.cache import CachedSchemaId, SchemaIdCache
+
+    now = [0.0]
+    cache = SchemaIdCache(ttl_seconds=10, max_stale_seconds=20, clock=lambda: now[0])
+    cache["orders-value"] = 1  # mapping writes land on the "latest" entry
+    cache.store("orders-value", 5, version=3)
+
+    now[0] = 10
+    assert cache.lookup("orders-value") == CachedSchemaId(1, stale=False)
+    now[0] = 11
+    assert cache.lookup("orders-value") == CachedSchemaId(1, stale=True)
+    assert cache.claim_refresh("orders-value")
+    assert not cache.claim_refresh("orders-value")
+    now[0] = 31
+    assert cache.lookup("orders-value") is None
+    assert cache.lookup("orders-value", version=3) == CachedSchemaId(5, stale=False)
+    assert cache["orders-value"] == 1 and len(cache) == 1
+
+    cache.store("orders-value", 2)
+    assert cache.claim_refresh("orders-value")  # storing clears the in-flight marker
+    assert cache.invalidate("orders-value", version=3) == 1
+    assert cache.invalidate() == 1
+    assert "orders-value" not in cache
+
+
+@respx.mock
+def test_get_schema_id_serves_stale_id_while_refreshing_in_background() -> None:
+    from aumos_proto.registry.cache import SchemaIdCache
+    from aumos_proto.registry.client import SchemaRegistryClient
+
+    route = respx.get("http://localhost:8081/subjects/aumos.events.audit-value/versions/latest").mock(
+        return_value=httpx.Response(200, json={"id": 8})
+    )
+    now = [0.0]
+    client = SchemaRegistryClient()
+    client._schema_id_cache = SchemaIdCache(ttl_seconds=60, clock=lambda: now[0])
+    client._schema_id_cache["aumos.events.audit-value"] = 7
+
+    assert client.get_schema_id("aumos.events.audit-value") == 7
+    assert route.call_count == 0
+    now[0] = 61
+    assert client.get_schema_id("aumos.events.audit-value") == 7
+    assert client.get_schema_id("aumos.events.audit-value") == 7
+    client.close()  # waits for the background refresh
+    assert route.call_count == 1
+    assert client.get_schema_id("aumos.events.audit-value") == 8
+
+    assert client.invalidate_schema_id("aumos.events.audit-value") == 1
+    assert client.get_schema_id("aumos.events.audit-value") == 8
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_failed_background_refresh_releases_its_claim() -> None:
+    from aumos_proto.registry.cache import SchemaIdCache
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig
+
+    route = respx.get("http://localhost:8081/subjects/aumos.events.audit-value/versions/latest").mock(
+        side_effect=[httpx.Response(200, json={"unexpected": True}), httpx.Response(200, json={"id": 8})]
+    )
+    now = [0.0]
+    client = SchemaRegistryClient(config=SchemaRegistryConfig(max_concurrent_requests=1))
+    client._schema_id_cache = SchemaIdCache(ttl_seconds=60, clock=lambda: now[0])
+    client._schema_id_cache["aumos.events.audit-value"] = 7
+    now[0] = 61
+
+    assert client.get_schema_id("aumos.events.audit-value") == 7
+    client._background_executor().submit(lambda: None).result()  # one worker: the failed refresh is done
+    assert client.get_schema_id("aumos.events.audit-value") == 7
+    client.close()
+    assert route.call_count == 2
+    assert client.get_schema_id("aumos.events.audit-value") == 8
+
+
+@respx.mock
+def test_get_schema_id_by_version_and_without_cache() -> None:
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig
+
+    pinned = respx.get("http://localhost:8081/subjects/aumos.events.audit-value/versions/2").mock(
+        return_value=httpx.Response(200, json={"id": 4})
+    )
+    latest = respx.get("http://localhost:8081/subjects/aumos.events.audit-value/versions/latest").mock(
+        return_value=httpx.Response(200, json={"id": 9})
+    )
+
+    with SchemaRegistryClient() as client:
+        assert client.get_schema_id("aumos.events.audit-value", version=2) == 4
+        assert client.get_schema_id("aumos.events.audit-value", version=2) == 4
+    assert pinned.call_count == 1
+
+    with SchemaRegistryClient(config=SchemaRegistryConfig(cache_schema_ids=False)) as client:
+        client._schema_id_cache["aumos.events.audit-value"] = 7
+        assert client.get_schema_id("aumos.events.audit-value") == 9
+        assert client.get_schema_id("aumos.events.audit-value") == 9
+    assert latest.call_count == 2
+
+
+@respx.mock
+def test_persistent_cache_serves_restart_without_registry_round_trips(tmp_path: Path) -> None:
+    import json
+    import threading
+
+    from aumos_proto.registry.client import AUMOS_PROTO_SUBJECTS, SchemaRegistryClient, SchemaRegistryConfig
+
+    registry_ids = {subject: index for index, (subject, _) in enumerate(AUMOS_PROTO_SUBJECTS, start=1)}
+    registry_open = threading.Event()
+    registry_open.set()
+
+    def register(request: httpx.Request) -> httpx.Response:
+        assert registry_open.wait(timeout=5)
+        subject = request.url.path.split("/")[2]
+        return httpx.Response(200, json={"id": registry_ids[subject]})
+
+    route = respx.post(url__regex=r".*/subjects/.*/versions").mock(side_effect=register)
+    config = SchemaRegistryConfig(schema_cache_path=str(tmp_path / "cache" / "schema-ids.json"))
+
+    with SchemaRegistryClient(config=config) as first_pod:
+        assert first_pod.register_all_aumos_schemas() == registry_ids
+    assert route.call_count == len(AUMOS_PROTO_SUBJECTS)
+
+    # Hold every registry response: a restarted pod must not wait on any of them.
+    registry_open.clear()
+    registry_ids["aumos.events.audit-value"] = 99
+    restarted = SchemaRegistryClient(config=config)
+    startup_ids = restarted.register_all_aumos_schemas()
+    assert startup_ids["aumos.events.audit-value"] == 1
+    assert route.call_count == len(AUMOS_PROTO_SUBJECTS)
+
+    registry_open.set()
+    restarted.close()  # waits for the background revalidation
+    assert route.call_count == 2 * len(AUMOS_PROTO_SUBJECTS)
+    assert restarted.get_schema_id("aumos.events.audit-value") == 99
+    stored = json.loads((tmp_path / "cache" / "schema-ids.json").read_text())
+    assert stored["entries"]["aumos.events.audit-value"]["schema_id"] == 99
+
+
+@respx.mock
+def test_persistent_cache_ignores_changed_schema_and_corrupt_file(tmp_path: Path) -> None:
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig
+
+    cache_file = tmp_path / "schema-ids.json"
+    cache_file.write_text("{not json")
+    route = respx.post("http://localhost:8081/subjects/aumos.events.audit-value/versions").mock(
+        side_effect=[httpx.Response(200, json={"id": 1}), httpx.Response(200, json={"id": 2})]
+    )
+    config = SchemaRegistryConfig(schema_cache_path=str(cache_file), cache_schema_ids=False)
+
+    with SchemaRegistryClient(config=config) as client:
+        assert client.register_schema("aumos.events.audit-value", "PROTOBUF", "message A {}") == 1
+        assert client.register_schema("aumos.events.audit-value", "PROTOBUF", "message A { string x = 1; }") == 2
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_uses_persistent_cache(tmp_path: Path) -> None:
+    from aumos_proto.registry import AsyncSchemaRegistryClient
+    from aumos_proto.registry.client import SchemaRegistryConfig
+
+    route = respx.post("http://localhost:8081/subjects/aumos.events.audit-value/versions").mock(
+        return_value=httpx.Response(200, json={"id": 5})
+    )
+    config = SchemaRegistryConfig(schema_cache_path=str(tmp_path / "schema-ids.json"))
+
+    async with AsyncSchemaRegistryClient(config=config) as client:
+        assert await client.register_schema("aumos.events.audit-value", "PROTOBUF", "message A {}") == 5
+    async with AsyncSchemaRegistryClient(config=config) as client:
+        assert await client.register_schema("aumos.events.audit-value", "PROTOBUF", "message A {}") == 5
+        assert route.call_count == 1
+    assert route.call_count == 2  # background revalidation finished before aclose() returned
+
+
+_PROTO_ROOT = Path(__file__).resolve().parents[1] / "proto"
+
+
+def test_load_proto_sources_indexes_messages_and_imports() -> None:
+    from aumos_proto.registry.client import AUMOS_PROTO_SUBJECTS
+    from aumos_proto.registry.protos import find_message_source, load_proto_sources, proto_fingerprint
+
+    sources = load_proto_sources(_PROTO_ROOT)
+    lock_events = find_message_source(sources, "aumos.events.v1.LockReleasedEvent")
+    assert lock_events is not None
+    assert lock_events.path == "aumos/events/v1/lock_event.proto"
+    assert lock_events.imports == ("google/protobuf/timestamp.proto",)
+    assert find_message_source(sources, "aumos.events.v1.TokenUsage") is not None
+    assert find_message_source(sources, "aumos.events.v2.AuditEvent") is None
+    assert all(find_message_source(sources, fqn) for _, fqn in AUMOS_PROTO_SUBJECTS)
+    assert proto_fingerprint(sources, lock_events.path) == proto_fingerprint(load_proto_sources(_PROTO_ROOT), lock_events.path)
+
+
+def test_message_schema_moves_the_message_first_and_keeps_every_declaration() -> None:
+    from aumos_proto.registry.protos import message_schema, parse_proto_source
+
+    content = (
+        'syntax = "proto3";\npackage p;\n\n'
+        "// First { has a brace in a comment\n"
+        'message First {\n  message Inner { string s = 1; }\n  string label = 1 [json_name = "a}b"];\n}\n\n'
+        "enum Kind { KIND_UNSPECIFIED = 0; }\n\n"
+        "/* Second */\n"
+        "// Refers to First.\n"
+        "message Second {\n  First first = 1;\n}\n"
+    )
+    source = parse_proto_source("p.proto", content)
+
+    assert message_schema(source, "p.First") == content
+    reordered = message_schema(source, "p.Second")
+    assert parse_proto_source("p.proto", reordered).messages == ("Second", "First")
+    assert reordered.index("// Refers to First.\nmessage Second") < reordered.index("// First {")
+    assert sorted(filter(None, reordered.splitlines())) == sorted(filter(None, content.splitlines()))
+    with pytest.raises(ValueError, match=r"does not declare p\.Third"):
+        message_schema(source, "p.Third")
+
+
+def _write_proto_tree(root: Path, meta_field: str = "string source = 1;") -> None:
+    (root / "aumos/common/v1").mkdir(parents=True, exist_ok=True)
+    (root / "aumos/events/v1").mkdir(parents=True, exist_ok=True)
+    (root / "aumos/common/v1/meta.proto").write_text(
+        f'syntax = "proto3";\npackage aumos.common.v1;\nmessage Meta {{ {meta_field} }}\n'
+    )
+    (root / "aumos/events/v1/audit_event.proto").write_text(
+        'syntax = "proto3";\npackage aumos.events.v1;\n'
+        'import "google/protobuf/timestamp.proto";\nimport "aumos/common/v1/meta.proto";\n'
+        "message AuditEvent { aumos.common.v1.Meta meta = 1; google.protobuf.Timestamp at = 2; }\n"
+    )
+
+
+@respx.mock
+def test_register_all_uses_proto_files_with_references_and_skips_unchanged(tmp_path: Path) -> None:
+    import json
+
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig
+
+    proto_root = tmp_path / "proto"
+    _write_proto_tree(proto_root)
+    register_meta = respx.post("http://localhost:8081/subjects/aumos%2Fcommon%2Fv1%2Fmeta.proto/versions").mock(
+        return_value=httpx.Response(200, json={"id": 20})
+    )
+    lookup_meta = respx.post("http://localhost:8081/subjects/aumos%2Fcommon%2Fv1%2Fmeta.proto").mock(
+        return_value=httpx.Response(200, json={"id": 20, "version": 3})
+    )
+    register_audit = respx.post("http://localhost:8081/subjects/aumos.events.audit-value/versions").mock(
+        return_value=httpx.Response(200, json={"id": 21})
+    )
+    config = SchemaRegistryConfig(
+        proto_descriptor_dir=str(proto_root), schema_cache_path=str(tmp_path / "schema-ids.json")
+    )
+
+    with SchemaRegistryClient(config=config) as client:
+        assert client.register_all_aumos_schemas() == {"aumos.events.audit-value": 21}
+    body = json.loads(register_audit.calls.last.request.content)
+    assert body["schema"] == (proto_root / "aumos/events/v1/audit_event.proto").read_text()
+    assert body["references"] == [{"name": "aumos/common/v1/meta.proto", "subject": "aumos/common/v1/meta.proto", "version": 3}]
+    assert (register_meta.call_count, lookup_meta.call_count, register_audit.call_count) == (1, 1, 1)
+    assert register_meta.calls.last.request.url.raw_path == b"/subjects/aumos%2Fcommon%2Fv1%2Fmeta.proto/versions"
+
+    with SchemaRegistryClient(config=config) as client:
+        assert client.register_all_aumos_schemas() == {"aumos.events.audit-value": 21}
+    assert register_audit.call_count == 1  # unchanged: no registry traffic
+
+    _write_proto_tree(proto_root, meta_field="string source = 1; string region = 2;")
+    with SchemaRegistryClient(config=config) as client:
+        client.register_all_aumos_schemas()
+    assert (register_meta.call_count, register_audit.call_count) == (2, 2)
+
+
+@respx.mock
+def test_register_all_refuses_schemas_incompatible_with_baseline(tmp_path: Path) -> None:
+    from aumos_proto.registry.client import SchemaCompatibilityError, SchemaRegistryClient, SchemaRegistryConfig
+
+    baseline, proto_root = tmp_path / "baseline", tmp_path / "proto"
+    _write_proto_tree(baseline, meta_field="string source = 1; int64 region = 2;")
+    _write_proto_tree(proto_root, meta_field="string source = 1; string region = 2;")
+    route = respx.post(url__regex=r".*/subjects/.*").mock(
+        return_value=httpx.Response(200, json={"id": 1, "version": 1})
+    )
+    config = SchemaRegistryConfig(proto_descriptor_dir=str(proto_root), compatibility_baseline_dir=str(baseline))
+
+    with SchemaRegistryClient(config=config) as client, pytest.raises(SchemaCompatibilityError) as excinfo:
+        client.register_all_aumos_schemas()
+    assert [(v.element, v.rule) for v in excinfo.value.violations] == [("Meta.region", "FIELD_SAME_TYPE")]
+    assert "aumos/common/v1/meta.proto: Meta.region" in str(excinfo.value)
+    assert route.call_count == 0
+
+    _write_proto_tree(baseline)
+    with SchemaRegistryClient(config=config) as client:
+        assert client.register_all_aumos_schemas() == {"aumos.events.audit-value": 1}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_register_all_registers_real_proto_files() -> None:
+    import json
+
+    from aumos_proto.registry import AsyncSchemaRegistryClient
+    from aumos_proto.registry.client import AUMOS_PROTO_SUBJECTS, SchemaRegistryConfig
+
+    route = respx.post(url__regex=r".*/subjects/.*/versions").mock(return_value=httpx.Response(200, json={"id": 1}))
+
+    async with AsyncSchemaRegistryClient(config=SchemaRegistryConfig(proto_descriptor_dir=str(_PROTO_ROOT))) as client:
+        assert len(await client.register_all_aumos_schemas()) == len(AUMOS_PROTO_SUBJECTS)
+    schemas = {json.loads(call.request.content)["schema"] for call in route.calls}
+    assert (_PROTO_ROOT / "aumos/events/v1/lock_event.proto").read_text() in schemas
+    assert all("references" not in json.loads(call.request.content) for call in route.calls)
+
+
+@respx.mock
+def test_register_all_with_deadline_finishes_slow_subjects_in_background() -> None:
+    import threading
+    import time
+
+    from aumos_proto.registry import SchemaNotReadyError
+    from aumos_proto.registry.client import AUMOS_PROTO_SUBJECTS, SchemaRegistryClient
+
+    slow_subject = "aumos.events.audit-value"
+    release = threading.Event()
+
+    def register(request: httpx.Request) -> httpx.Response:
+        if slow_subject in request.url.path:
+            assert release.wait(timeout=5)
+        return httpx.Response(200, json={"id": 3})
+
+    respx.post(url__regex=r".*/subjects/.*/versions").mock(side_effect=register)
+    lookup = respx.get(url__regex=r".*/versions/latest").mock(return_value=httpx.Response(200, json={"id": 3}))
+    client = SchemaRegistryClient()
+
+    started = time.monotonic()
+    schema_ids = client.register_all_aumos_schemas(deadline_seconds=0.2)
+    assert time.monotonic() - started < 2
+    assert len(schema_ids) == len(AUMOS_PROTO_SUBJECTS) - 1
+    assert client.pending_registrations() == {slow_subject}
+    with pytest.raises(SchemaNotReadyError):
+        client.get_schema_id(slow_subject)
+    assert lookup.call_count == 0
+
+    release.set()
+    client.close()
+    assert client.pending_registrations() == frozenset()
+    assert client.get_schema_id(slow_subject) == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_register_all_with_deadline_continues_in_background() -> None:
+    import asyncio
+
+    from aumos_proto.registry import AsyncSchemaRegistryClient, SchemaNotReadyError
+    from aumos_proto.registry.client import AUMOS_PROTO_SUBJECTS
+
+    slow_subject = "aumos.events.metering-value"
+    release = asyncio.Event()
+
+    async def register(request: httpx.Request) -> httpx.Response:
+        if slow_subject in request.url.path:
+            await release.wait()
+        return httpx.Response(200, json={"id": 4})
+
+    respx.post(url__regex=r".*/subjects/.*/versions").mock(side_effect=register)
+
+    async with AsyncSchemaRegistryClient() as client:
+        schema_ids = await client.register_all_aumos_schemas(deadline_seconds=0.1)
+        assert len(schema_ids) == len(AUMOS_PROTO_SUBJECTS) - 1
+        with pytest.raises(SchemaNotReadyError):
+            await client.get_schema_id(slow_subject)
+        release.set()
+    assert client.pending_registrations() == frozenset()
+    assert await client.get_schema_id(slow_subject) == 4
+
+
+@respx.mock
+def test_concurrent_schema_id_misses_share_one_request() -> None:
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aumos_proto.registry import SchemaRegistryError
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig
+
+    release = threading.Event()
+
+    def lookup(request: httpx.Request) -> httpx.Response:
+        assert release.wait(timeout=5)
+        if "broken" in request.url.path:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"id": 9})
+
+    route = respx.get(url__regex=r".*/versions/latest").mock(side_effect=lookup)
+    # Without the cache, only coalescing keeps the herd from reaching the registry.
+    client = SchemaRegistryClient(config=SchemaRegistryConfig(cache_schema_ids=False))
+
+    def get(subject: str) -> int | str:
+        try:
+            return client.get_schema_id(subject)
+        except SchemaRegistryError:
+            return "error"
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        ok = [pool.submit(get, "aumos.events.audit-value") for _ in range(16)]
+        failed = [pool.submit(get, "broken-value") for _ in range(16)]
+        time.sleep(0.2)
+        release.set()
+    assert [future.result() for future in ok] == [9] * 16
+    assert [future.result() for future in failed] == ["error"] * 16
+    assert route.call_count == 2
+    assert len(client._schema_id_flights) == 0
+
+    assert client.get_schema_id("aumos.events.audit-value") == 9
+    assert route.call_count == 3  # finished flights are not cached
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_concurrent_misses_share_one_request() -> None:
+    import asyncio
+
+    from aumos_proto.registry import AsyncSchemaRegistryClient
+
+    async def slow(response: httpx.Response) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return response
+
+    ids = respx.get(url__regex=r".*/versions/latest").mock(
+        side_effect=lambda request: slow(httpx.Response(200, json={"id": 5}))
+    )
+    schemas = respx.get("http://localhost:8081/schemas/ids/5").mock(
+        side_effect=lambda request: slow(httpx.Response(200, json={"schema": "syntax = \"proto3\";"}))
+    )
+
+    async with AsyncSchemaRegistryClient() as client:
+        waiters = [asyncio.create_task(client.get_schema_id("aumos.events.audit-value")) for _ in range(20)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()  # one impatient caller does not cancel the shared request
+        results = await asyncio.gather(*waiters[1:])
+        fetched = await asyncio.gather(*(client.get_schema_by_id(5) for _ in range(20)))
+    assert results == [5] * 19
+    assert len({id(schema) for schema in fetched}) == 1
+    assert (ids.call_count, schemas.call_count) == (1, 1)
+
+
+@respx.mock
+def test_in_memory_metrics_record_requests_caches_and_registration() -> None:
+    import json
+
+    from aumos_proto.registry import InMemoryMetrics, SchemaRegistryError
+    from aumos_proto.registry.client import AUMOS_PROTO_SUBJECTS, SchemaRegistryClient, SchemaRegistryConfig
+
+    respx.post(url__regex=r".*/subjects/.*/versions").mock(return_value=httpx.Response(200, json={"id": 1}))
+    respx.get("http://localhost:8081/subjects/missing-value/versions/latest").mock(return_value=httpx.Response(404))
+    respx.get(url__regex=r".*/schemas/ids/\d+$").mock(
+        side_effect=lambda request: httpx.Response(200, json={"schema": request.url.path})
+    )
+    respx.get("http://localhost:8081/schemas/ids/9/versions").mock(side_effect=httpx.ConnectError("refused"))
+    metrics = InMemoryMetrics()
+
+    with SchemaRegistryClient(SchemaRegistryConfig(schema_cache_size=2), observer=metrics) as client:
+        client.register_all_aumos_schemas()
+        client.get_schema_id("aumos.events.audit-value")
+        with pytest.raises(SchemaRegistryError):
+            client.get_schema_id("missing-value")
+        for schema_id in (1, 2, 1, 3):
+            client.get_schema_by_id(schema_id)
+        with pytest.raises(SchemaRegistryError):
+            client.get_subjects_by_schema_id(9)
+
+    snapshot = metrics.snapshot()
+    json.dumps(snapshot)
+    requests = snapshot["requests"]
+    register = requests["POST /subjects/{subject}/versions"]
+    assert (register["count"], register["errors"]) == (len(AUMOS_PROTO_SUBJECTS), 0)
+    assert register["buckets"]["+Inf"] == register["count"]
+    assert register["p50_seconds"] <= register["p99_seconds"]
+    assert requests["GET /subjects/{subject}/versions/{version}"]["errors"] == 1
+    assert requests["GET /schemas/ids/{schema_id}"]["count"] == 3
+    assert requests["GET /schemas/ids/{schema_id}/versions"]["errors"] == 1
+    assert snapshot["cache"]["schema_id"] == {"hits": 1, "misses": 1, "evictions": 0, "hit_ratio": 0.5}
+    assert snapshot["cache"]["schema"] == {"hits": 1, "misses": 3, "evictions": 1, "hit_ratio": 0.25}
+    registration = snapshot["registration"]
+    assert (registration["registered"], registration["total"]) == (len(AUMOS_PROTO_SUBJECTS),) * 2
+    assert registration["seconds"] >= register["sum_seconds"]
+
+    metrics.reset()
+    assert metrics.snapshot() == {"requests": {}, "cache": {}, "registration": None}
+
+
+def test_latency_histogram_quantiles_use_bucket_bounds() -> None:
+    from aumos_proto.registry.metrics import LatencyHistogram
+
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    assert histogram.quantile(0.5) == 0.0
+    for seconds in [0.005] * 90 + [0.05] * 9 + [5.0]:
+        histogram.observe(seconds)
+    assert (histogram.quantile(0.5), histogram.quantile(0.95), histogram.quantile(0.995)) == (0.01, 0.1, float("inf"))
+    assert histogram.cumulative() == {"0.01": 90, "0.1": 99, "1.0": 99, "+Inf": 100}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_reports_to_observer() -> None:
+    from aumos_proto.registry import AsyncSchemaRegistryClient, RegistryObserver
+
+    events: list[tuple[str, str, int | None]] = []
+
+    class Recorder(RegistryObserver):
+        def request_finished(self, method: str, endpoint: str, status: int | None, seconds: float) -> None:
+            events.append((method, endpoint, status))
+
+        def cache_hit(self, cache: str) -> None:
+            events.append(("hit", cache, None))
+
+    respx.get(url__regex=r".*/versions/latest").mock(return_value=httpx.Response(200, json={"id": 2}))
+
+    async with AsyncSchemaRegistryClient(observer=Recorder()) as client:
+        await client.get_schema_id("aumos.events.audit-value")
+        await client.get_schema_id("aumos.events.audit-value")
+    assert events == [("GET", "/subjects/{subject}/versions/{version}", 200), ("hit", "schema_id", None)]
+
+
+# ---------------------------------------------------------------------------
+# FramedDecoder
+# ---------------------------------------------------------------------------
+
+
+def _seeded_decoder() -> FramedDecoder:
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig
+    from aumos_proto.registry.decoder import FramedDecoder
+
+    client = SchemaRegistryClient(config=SchemaRegistryConfig())
+    client._schema_id_cache["aumos.events.audit-value"] = 7
+    client._schema_id_cache["aumos.events.metering-value"] = 42
+    return FramedDecoder(client, subjects=[
+        ("aumos.events.audit-value", "aumos.events.v1.AuditEvent"),
+        ("aumos.events.metering-value", "aumos.events.v1.MeteringEvent"),
+    ])
+
+
+def test_framed_decoder_dispatches_on_schema_id_after_warm_up() -> None:
+    from aumos_proto.codec import LazyMessage
+    from aumos_proto.events.v1 import AuditEvent, MeteringEvent
+    from aumos_proto.registry.framing import encode_message_with_schema_id
+
+    decoder = _seeded_decoder()
+    assert decoder.warm_up() == 2
+
+    audit = AuditEvent(tenant_id="t-1", action="read")
+    metering = MeteringEvent(tenant_id="t-1", timestamp_ms=5)
+
+    assert decoder.decode(bytes(encode_message_with_schema_id(7, audit))) == audit
+    assert decoder.decode(encode_message_with_schema_id(42, metering)) == metering
+    view = decoder.decode(bytes(encode_message_with_schema_id(7, audit)), lazy=True)
+    assert isinstance(view, LazyMessage)
+    assert view.tenant_id == "t-1"
+
+
+def test_framed_decoder_decode_many_keeps_order_and_skips_malformed() -> None:
+    from aumos_proto.events.v1 import AuditEvent, MeteringEvent
+    from aumos_proto.registry.framing import encode_message_with_schema_id
+
+    decoder = _seeded_decoder()
+    decoder.warm_up()
+    records = [
+        bytes(encode_message_with_schema_id(42, MeteringEvent(event_id="m-1"))),
+        bytes(encode_message_with_schema_id(7, AuditEvent(event_id="a-1"))),
+        b"\x01garbage",
+        bytes(encode_message_with_schema_id(42, MeteringEvent(event_id="m-2"))),
+    ]
+
+    decoded = decoder.decode_many(records)
+
+    assert [getattr(message, "event_id", None) for message in decoded] == ["m-1", "a-1", None, "m-2"]
+    assert isinstance(decoded[1], AuditEvent)
+
+
+@respx.mock
+def test_framed_decoder_resolves_unseen_schema_id_once() -> None:
+    from aumos_proto.events.v1 import AuditEvent
+    from aumos_proto.registry.decoder import UnknownSchemaError
+    from aumos_proto.registry.framing import encode_message_with_schema_id
+
+    decoder = _seeded_decoder()
+    decoder.warm_up()
+    new_version = respx.get("http://localhost:8081/schemas/ids/9/versions").mock(
+        return_value=httpx.Response(200, json=[{"subject": "aumos.events.audit-value", "version": 2}])
+    )
+    foreign = respx.get("http://localhost:8081/schemas/ids/99/versions").mock(
+        return_value=httpx.Response(200, json=[{"subject": "billing.invoices-value", "version": 1}])
+    )
+
+    framed = bytes(encode_message_with_schema_id(9, AuditEvent(event_id="a-2")))
+    assert decoder.decode(framed).event_id == "a-2"
+    assert decoder.decode(framed).event_id == "a-2"
+    assert new_version.call_count == 1
+
+    for _ in range(2):
+        with pytest.raises(UnknownSchemaError):
+            decoder.message_type_for(99)
+    assert foreign.call_count == 1
+
+
+@respx.mock
+def test_framed_decoder_caches_schema_ids_unknown_to_the_registry() -> None:
+    from aumos_proto.registry.client import SchemaRegistryError
+    from aumos_proto.registry.decoder import UnknownSchemaError
+
+    decoder = _seeded_decoder()
+    decoder.warm_up()
+    missing = respx.get("http://localhost:8081/schemas/ids/12345/versions").mock(return_value=httpx.Response(404))
+    failing = respx.get("http://localhost:8081/schemas/ids/8/versions").mock(return_value=httpx.Response(500))
+
+    for _ in range(3):
+        with pytest.raises(UnknownSchemaError):
+            decoder.message_type_for(12345)
+    assert missing.call_count == 1
+
+    # Other registry errors may be transient, so the ID is asked about again.
+    for _ in range(2):
+        with pytest.raises(SchemaRegistryError, match="HTTP 500"):
+            decoder.message_type_for(8)
+    assert failing.call_count == 2
+
+
+@respx.mock
+def test_framed_decoder_schema_id_table_is_bounded() -> None:
+    from aumos_proto.registry.client import SchemaRegistryClient
+    from aumos_proto.registry.decoder import FramedDecoder, UnknownSchemaError
+
+    client = SchemaRegistryClient()
+    client._schema_id_cache["aumos.events.audit-value"] = 7
+    decoder = FramedDecoder(client, subjects=[("aumos.events.audit-value", "aumos.events.v1.AuditEvent")], cache_size=4)
+    decoder.warm_up()
+    route = respx.get(url__regex=r".*/schemas/ids/\d+/versions").mock(return_value=httpx.Response(404))
+
+    for schema_id in range(100, 110):
+        with pytest.raises(UnknownSchemaError):
+            decoder.message_type_for(schema_id)
+    assert len(decoder._types_by_id) == 4
+    assert route.call_count == 10
+
+    # Evicted IDs, including the warmed-up one, are resolved again on their next use.
+    with pytest.raises(UnknownSchemaError):
+        decoder.message_type_for(7)
+    assert route.call_count == 11
+
+
+@respx.mock
+def test_subjects_declared_in_one_proto_file_get_distinct_schema_ids() -> None:
+    import json
+
+    from aumos_proto.events.v1 import LockAcquiredEvent, LockContentionEvent
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryConfig
+    from aumos_proto.registry.decoder import FramedDecoder
+    from aumos_proto.registry.framing import encode_message_with_schema_id
+    from aumos_proto.registry.protos import parse_proto_source
+
+    # Like the registry, hand out one ID per distinct schema text.
+    ids_by_schema: dict[str, int] = {}
+
+    def register(request: httpx.Request) -> httpx.Response:
+        schema = json.loads(request.content)["schema"]
+        return httpx.Response(200, json={"id": ids_by_schema.setdefault(schema, len(ids_by_schema) + 1)})
+
+    respx.post(url__regex=r".*/subjects/.*/versions").mock(side_effect=register)
+    subjects = [
+        ("aumos.events.lock-acquired-value", "aumos.events.v1.LockAcquiredEvent"),
+        ("aumos.events.lock-contention-value", "aumos.events.v1.LockContentionEvent"),
+    ]
+    with SchemaRegistryClient(config=SchemaRegistryConfig(proto_descriptor_dir=str(_PROTO_ROOT))) as client:
+        schema_ids = client.register_all_aumos_schemas()
+        acquired_id, contention_id = (schema_ids[subject] for subject, _ in subjects)
+        assert acquired_id != contention_id
+        for schema, schema_id in ids_by_schema.items():
+            if schema_id == contention_id:
+                assert parse_proto_source("lock_event.proto", schema).messages[0] == "LockContentionEvent"
+
+        decoder = FramedDecoder(client, subjects=subjects)
+        assert decoder.warm_up() == 2
+        acquired = LockAcquiredEvent(lock_name="jobs", lock_owner="worker-1")
+        contention = LockContentionEvent(lock_name="jobs", current_owner="worker-1")
+        assert decoder.decode(encode_message_with_schema_id(acquired_id, acquired)) == acquired
+        assert decoder.decode(encode_message_with_schema_id(contention_id, contention)) == contention
+
+
+def test_framed_decoder_warm_up_rejects_a_schema_id_shared_by_two_message_types() -> None:
+    from aumos_proto.registry.client import SchemaRegistryClient, SchemaRegistryError
+    from aumos_proto.registry.decoder import FramedDecoder
+
+    client = SchemaRegistryClient()
+    client._schema_id_cache["aumos.events.lock-acquired-value"] = 3
+    client._schema_id_cache["aumos.events.lock-contention-value"] = 3
+    decoder = FramedDecoder(client, subjects=[
+        ("aumos.events.lock-acquired-value", "aumos.events.v1.LockAcquiredEvent"),
+        ("aumos.events.lock-contention-value", "aumos.events.v1.LockContentionEvent"),
+    ])
+    with pytest.raises(SchemaRegistryError, match="share schema ID 3"):
+        decoder.warm_up()
+    assert len(decoder._types_by_id) == 0
@@ -0,0 +1,149 @@
+"""Tests for the mergeable latency quantile sketches."""
+from __future__ import annotations
+
+import json
+import math
+import random
+
+import pytest
+
+
+def _samples(count: int, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    return [rng.lognormvariate(3.0, 1.2) for _ in range(count)]
+
+
+def _exact(values: list[float], q: float) -> float:
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_quantiles_are_within_the_relative_accuracy(accuracy: float) -> None:
+    from aumos_proto.sketches import DDSketch
+
+    values = _samples(20_000, seed=1)
+    sketch = DDSketch(relative_accuracy=accuracy)
+    sketch.add_many(values)
+
+    assert sketch.count == len(values)
+    assert sketch.sum == pytest.approx(sum(values))
+    for q in (0.0, 0.1, 0.5, 0.9, 0.95, 0.99, 0.999, 1.0):
+        exact = _exact(values, q)
+        assert abs(sketch.quantile(q) - exact) <= accuracy * exact
+    assert sketch.quantile(0.0) == min(values)
+    assert sketch.quantile(1.0) == max(values)
+
+
+def test_merged_sketch_equals_the_sketch_of_the_combined_stream() -> None:
+    from aumos_proto.sketches import DDSketch
+
+    left_values, right_values = _samples(5_000, seed=2), _samples(7_000, seed=3)
+    left, right, combined = DDSketch(), DDSketch(), DDSketch()
+    left.add_many(left_values)
+    right.add_many(right_values)
+    combined.add_many(left_values + right_values)
+
+    left.merge(right)
+    assert left.to_dict()["bins"] == combined.to_dict()["bins"]
+    assert left.quantiles() == combined.quantiles()
+    assert (left.count, left.min, left.max) == (combined.count, combined.min, combined.max)
+
+    with pytest.raises(ValueError, match="relative accuracy"):
+        left.merge(DDSketch(relative_accuracy=0.02))
+
+
+def test_collapsing_bounds_memory_and_keeps_upper_quantiles() -> None:
+    from aumos_proto.sketches import DDSketch
+
+    values = [10.0 ** (exponent / 100) for exponent in range(-600, 600)]
+    sketch = DDSketch(max_bins=64)
+    sketch.add_many(values)
+
+    assert len(sketch) == 64
+    assert sketch.count == len(values)
+    exact = _exact(values, 0.99)
+    assert abs(sketch.quantile(0.99) - exact) <= 0.01 * exact
+
+
+def test_zero_negative_and_empty_sketches() -> None:
+    from aumos_proto.sketches import DDSketch
+
+    sketch = DDSketch()
+    assert math.isnan(sketch.quantile(0.5))
+    assert math.isnan(sketch.mean)
+
+    sketch.add(0.0, count=3)
+    sketch.add(-5.0)
+    sketch.add(100.0)
+    assert sketch.zero_count == 4
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == 100.0
+    assert sketch.mean == 20.0
+
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        sketch.quantile(1.5)
+    with pytest.raises(ValueError, match="relative_accuracy"):
+        DDSketch(relative_accuracy=1.0)
+
+
+def test_invalid_values_and_counts_are_rejected_without_changing_the_sketch() -> None:
+    from aumos_proto.sketches import DDSketch
+
+    sketch = DDSketch()
+    sketch.add(10.0)
+    before = sketch.to_dict()
+    with pytest.raises(ValueError, match="NaN"):
+        sketch.add(math.nan)
+    with pytest.raises(ValueError, match="infinite"):
+        sketch.add(math.inf)
+    for count in (0, -2):
+        with pytest.raises(ValueError, match="count must be positive"):
+            sketch.add(500.0, count=count)
+    assert sketch.to_dict() == before
+    assert sketch.mean == 10.0
+
+
+def test_sketch_state_round_trips_through_json() -> None:
+    from aumos_proto.sketches import DDSketch
+
+    sketch = DDSketch(relative_accuracy=0.02, max_bins=128)
+    sketch.add_many(_samples(1_000, seed=4))
+    sketch.add(0.0)
+    restored = DDSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+    assert restored.to_dict() == sketch.to_dict()
+    assert restored.quantiles((0.25, 0.5, 0.99)) == sketch.quantiles((0.25, 0.5, 0.99))
+    assert DDSketch.from_dict(DDSketch().to_dict()).count == 0
+
+
+def test_latency_sketches_key_by_model_and_hardware_tier() -> None:
+    from aumos_proto.events.v1 import InferenceUsage, MeteringEvent, TokenUsage
+    from aumos_proto.sketches import LatencyKey, LatencySketches
+
+    rng = random.Random(5)
+    events = [
+        MeteringEvent(inference_usage=InferenceUsage(model_id=model, hardware_tier=tier,
+                                                     latency_ms=rng.uniform(1.0, 100.0) * scale))
+        for model, tier, scale in [("llama", "gpu", 1.0), ("llama", "cpu", 10.0), ("bert", "gpu", 0.1)] * 500
+    ]
+    events.append(MeteringEvent(token_usage=TokenUsage(model_id="llama")))
+
+    first, second = LatencySketches(), LatencySketches()
+    first.add_many(events[:700])
+    second.add_many(events[700:])
+    shipped = [json.loads(json.dumps(sketches.to_dict())) for sketches in (first, second)]
+    combined = LatencySketches.from_dict(shipped[0])
+    combined.merge(LatencySketches.from_dict(shipped[1]))
+
+    assert set(combined) == {LatencyKey("llama", "gpu"), LatencyKey("llama", "cpu"), LatencyKey("bert", "gpu")}
+    assert combined[LatencyKey("llama", "cpu")].count == 500
+    quantiles = combined.quantiles((0.5, 0.99))
+    for key, sketch in combined.items():
+        samples = [e.inference_usage.latency_ms for e in events
+                   if e.inference_usage and (e.inference_usage.model_id, e.inference_usage.hardware_tier) == key]
+        assert sketch.count == len(samples)
+        for q in (0.5, 0.99):
+            assert abs(quantiles[key][q] - _exact(samples, q)) <= 0.01 * _exact(samples, q)
+
+    with pytest.raises(ValueError, match="relative accuracy"):
+        combined.merge(LatencySketches(relative_accuracy=0.05))